@@ -0,0 +1,54 @@
+"""Micro-benchmark: per-recipient message formatting.
+
+Compares the historical ``message.format_map(SafeDict(...))`` path used by
+``ProviderBase._prepare_`` against a compiled format (parsed once, reused
+for every recipient).
+
+Run with::
+
+    python benchmarks/bench_formatter.py -o formatter.json
+"""
+import pyperf
+from notify.models import Actor
+from notify.types import SafeDict
+from notify.utils.formatter import compile_format
+
+
+MESSAGE = (
+    "Dear {recipient.name}, your order {order} from {company} "
+    "has shipped to {recipient.account.address}."
+)
+PROVIDER_KWARGS = {"order": "A-1234", "company": "ACME"}
+RECIPIENTS = [
+    Actor(name=f"User {i}", account={"address": f"user{i}@example.com"})
+    for i in range(1000)
+]
+
+
+def safedict_path(loops: int) -> float:
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        for to in RECIPIENTS:
+            try:
+                MESSAGE.format_map(SafeDict(recipient=to, **PROVIDER_KWARGS))
+            except (AttributeError, ValueError):
+                pass
+    return pyperf.perf_counter() - t0
+
+
+def compiled_path(loops: int) -> float:
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        # provider-wide fields once per send(), recipient fields per recipient:
+        prepared = compile_format(
+            compile_format(MESSAGE).format_map(PROVIDER_KWARGS)
+        )
+        for to in RECIPIENTS:
+            prepared.format_map({"recipient": to})
+    return pyperf.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    runner = pyperf.Runner()
+    runner.bench_time_func("format_map(SafeDict) x1000 recipients", safedict_path)
+    runner.bench_time_func("compile_format x1000 recipients", compiled_path)
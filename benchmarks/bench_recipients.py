@@ -0,0 +1,72 @@
+"""Benchmark: recipient construction, Actor vs LiteRecipient vs RecipientBatch.
+
+Measures build time for 10,000 recipients with pyperf and prints the
+memory retained by each representation (``tracemalloc``).
+
+Run with::
+
+    python benchmarks/bench_recipients.py -o recipients.json
+"""
+import tracemalloc
+import pyperf
+from notify.models import Actor
+from notify.recipients import LiteRecipient, RecipientBatch
+
+
+COUNT = 10_000
+ROWS = [
+    {"name": f"User {i}", "account": {"address": f"user{i}@example.com"}}
+    for i in range(COUNT)
+]
+
+
+def build_actors(loops: int) -> float:
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        [Actor(**row) for row in ROWS]
+    return pyperf.perf_counter() - t0
+
+
+def build_batch(loops: int) -> float:
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        RecipientBatch(ROWS)
+    return pyperf.perf_counter() - t0
+
+
+def build_lite(loops: int) -> float:
+    t0 = pyperf.perf_counter()
+    for _ in range(loops):
+        [LiteRecipient.from_dict(row) for row in ROWS]
+    return pyperf.perf_counter() - t0
+
+
+def retained_memory(factory) -> int:
+    tracemalloc.start()
+    recipients = [factory(row) for row in ROWS]  # noqa: F841
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def print_memory() -> None:
+    for label, factory in (
+        ("Actor", lambda row: Actor(**row)),
+        ("LiteRecipient", LiteRecipient.from_dict),
+    ):
+        size = retained_memory(factory)
+        print(f"{label}: {size / COUNT:.0f} bytes/recipient ({size / 2**20:.1f} MiB)")
+    tracemalloc.start()
+    batch = RecipientBatch(ROWS)  # noqa: F841
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"RecipientBatch: {size / COUNT:.0f} bytes/recipient ({size / 2**20:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    runner = pyperf.Runner()
+    if not runner.args.worker:
+        print_memory()
+    runner.bench_time_func(f"Actor x{COUNT}", build_actors)
+    runner.bench_time_func(f"LiteRecipient x{COUNT}", build_lite)
+    runner.bench_time_func(f"RecipientBatch x{COUNT}", build_batch)
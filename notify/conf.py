@@ -8,6 +8,9 @@ if not (template_dir := config.get('TEMPLATE_DIR')):
     TEMPLATE_DIR = BASE_DIR.joinpath("templates")
 else:
     TEMPLATE_DIR = Path(template_dir).resolve()
+# render templates on a process pool (0 renders on the event loop):
+TEMPLATE_RENDER_WORKERS = config.getint('TEMPLATE_RENDER_WORKERS', fallback=0)
+TEMPLATE_RENDER_BATCH = config.getint('TEMPLATE_RENDER_BATCH', fallback=32)
 
 
 # Notify Worker (Consumer)
@@ -19,6 +22,33 @@ NOTIFY_DEFAULT_HOST = config.get('NOTIFY_DEFAULT_HOST', fallback='0.0.0.0')
 NOTIFY_DEFAULT_PORT = config.get('NOTIFY_DEFAULT_PORT', fallback=8991)
 NOTIFY_USE_DISCOVERY = config.getboolean('NOTIFY_USE_DISCOVERY', fallback=False)
 
+# country calling code assumed for phone numbers without international prefix
+# (unset: such numbers are passed on unchanged)
+NOTIFY_DEFAULT_COUNTRY_CODE = config.get('NOTIFY_DEFAULT_COUNTRY_CODE', fallback=None)
+
+# recipients materialized per fan-out round (RecipientBatch)
+NOTIFY_SEND_CHUNK_SIZE = config.getint('NOTIFY_SEND_CHUNK_SIZE', fallback=1000)
+# sends in flight per send() call (asyncio providers)
+NOTIFY_SEND_CONCURRENCY = config.getint('NOTIFY_SEND_CONCURRENCY', fallback=100)
+
+# shared HTTP transport (aiohttp) for HTTP-based providers
+HTTP_POOL_LIMIT = config.getint('HTTP_POOL_LIMIT', fallback=100)
+HTTP_LIMIT_PER_HOST = config.getint('HTTP_LIMIT_PER_HOST', fallback=20)
+HTTP_DNS_TTL = config.getint('HTTP_DNS_TTL', fallback=300)
+HTTP_KEEPALIVE_TIMEOUT = config.getint('HTTP_KEEPALIVE_TIMEOUT', fallback=30)
+HTTP_TIMEOUT = config.getint('HTTP_TIMEOUT', fallback=60)
+
+# shared executor for blocking provider calls, and event-loop lag (ms)
+# over which the worker logs a warning (0 disables the monitor)
+NOTIFY_BLOCKING_WORKERS = config.getint('NOTIFY_BLOCKING_WORKERS', fallback=16)
+NOTIFY_LOOP_LAG_THRESHOLD = config.getint('NOTIFY_LOOP_LAG_THRESHOLD', fallback=200)
+
+# Redis URL of the caches shared by the worker processes (OAuth tokens,
+# resolved IDs); empty keeps the caches in memory only.
+NOTIFY_CACHE_REDIS = config.get('NOTIFY_CACHE_REDIS', fallback=None)
+# seconds before expiration an OAuth token is refreshed
+NOTIFY_TOKEN_REFRESH_MARGIN = config.getint('NOTIFY_TOKEN_REFRESH_MARGIN', fallback=300)
+
 NOTIFY_QUEUE_SIZE = config.getint('NOTIFY_QUEUE_SIZE', fallback=8)
 ## Queue Consumed Callback
 NOTIFY_QUEUE_CALLBACK = config.get(
@@ -40,11 +70,30 @@ EMAIL_SMTP_USERNAME = config.get("stmp_host_user")
 EMAIL_SMTP_PASSWORD = config.get("stmp_host_password")
 EMAIL_SMTP_PORT = config.get("smtp_port", fallback=587)
 EMAIL_SMTP_HOST = config.get("stmp_host")
+# attachments bigger than this (in bytes) are streamed from disk while sending.
+EMAIL_ATTACHMENT_STREAM_SIZE = config.getint(
+    "EMAIL_ATTACHMENT_STREAM_SIZE", fallback=10 * 1024 * 1024
+)
 
 ## Telegram:
 # Telegram credentials
 TELEGRAM_BOT_TOKEN = config.get("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = config.get("TELEGRAM_CHAT_ID")
+# file_id of uploaded media (by content hash), reused by later sends
+TELEGRAM_MEDIA_CACHE_SIZE = config.getint("TELEGRAM_MEDIA_CACHE_SIZE", fallback=1024)
+TELEGRAM_MEDIA_CACHE_TTL = config.getint("TELEGRAM_MEDIA_CACHE_TTL", fallback=604800)
+# webm -> mp4 conversion: pool processes, conversions queued or running
+# and directory of the converted files (default: <tmp>/notify-transcode,
+# files unused for TELEGRAM_MEDIA_CACHE_TTL seconds are deleted)
+TELEGRAM_TRANSCODE_WORKERS = config.getint("TELEGRAM_TRANSCODE_WORKERS", fallback=2)
+TELEGRAM_TRANSCODE_QUEUE = config.getint("TELEGRAM_TRANSCODE_QUEUE", fallback=8)
+TELEGRAM_TRANSCODE_DIR = config.get("TELEGRAM_TRANSCODE_DIR", fallback=None)
+# pacing: messages/s per bot, messages/s per chat, messages/min per group,
+# and retries of a message after a TelegramRetryAfter (flood control)
+TELEGRAM_RATE_LIMIT = config.getint("TELEGRAM_RATE_LIMIT", fallback=30)
+TELEGRAM_CHAT_RATE = config.getint("TELEGRAM_CHAT_RATE", fallback=1)
+TELEGRAM_GROUP_RATE = config.getint("TELEGRAM_GROUP_RATE", fallback=20)
+TELEGRAM_MAX_RETRIES = config.getint("TELEGRAM_MAX_RETRIES", fallback=3)
 
 ## Slack
 SLACK_APP_ID = config.get("SLACK_APP_ID")
@@ -55,10 +104,20 @@ SLACK_SIGNING_SECRET = config.get("SLACK_SIGNING_SECRET")
 SLACK_BOT_TOKEN = config.get("SLACK_BOT_TOKEN")
 SLACK_DEFAULT_CHANNEL = config.get("SLACK_DEFAULT_CHANNEL")
 SLACK_TEAM_ID = config.get("SLACK_TEAM_ID")
+# channel name -> ID cache (seconds), DM channels cache, sends in flight
+SLACK_CHANNEL_CACHE_TTL = config.getint("SLACK_CHANNEL_CACHE_TTL", fallback=3600)
+SLACK_DM_CACHE_TTL = config.getint("SLACK_DM_CACHE_TTL", fallback=86400)
+SLACK_MAX_CONCURRENCY = config.getint("SLACK_MAX_CONCURRENCY", fallback=10)
+SLACK_MAX_RETRIES = config.getint("SLACK_MAX_RETRIES", fallback=3)
 
 # Jabber Service
 JABBER_JID = config.get("JABBER_JID")
 JABBER_PASSWORD = config.get("JABBER_PASSWORD")
+# messages queued or unacked, ack timeout and reconnection backoff (seconds)
+JABBER_QUEUE_SIZE = config.getint("JABBER_QUEUE_SIZE", fallback=1000)
+JABBER_ACK_TIMEOUT = config.getint("JABBER_ACK_TIMEOUT", fallback=30)
+JABBER_RECONNECT_DELAY = config.getint("JABBER_RECONNECT_DELAY", fallback=1)
+JABBER_RECONNECT_MAX = config.getint("JABBER_RECONNECT_MAX", fallback=300)
 
 # Gmail
 GMAIL_USERNAME = config.get("GMAIL_USERNAME")
@@ -78,6 +137,13 @@ MS_TEAMS_CLIENT_SECRET = config.get("MS_TEAMS_CLIENT_SECRET")
 MS_TEAMS_DEFAULT_TEAMS_ID = config.get("MS_TEAMS_DEFAULT_TEAMS_ID")
 MS_TEAMS_DEFAULT_CHANNEL_ID = config.get("MS_TEAMS_DEFAULT_CHANNEL_ID")
 MS_TEAMS_DEFAULT_WEBHOOK = config.get("MS_TEAMS_DEFAULT_WEBHOOK")
+# cache of resolved user (email) and chat (members) IDs
+MS_TEAMS_CACHE_SIZE = config.getint("MS_TEAMS_CACHE_SIZE", fallback=10000)
+MS_TEAMS_CACHE_TTL = config.getint("MS_TEAMS_CACHE_TTL", fallback=86400)
+# coalesce chat/channel posts into Graph $batch calls (window in ms)
+MS_TEAMS_BATCH = config.getboolean("MS_TEAMS_BATCH", fallback=False)
+MS_TEAMS_BATCH_WINDOW = config.getint("MS_TEAMS_BATCH_WINDOW", fallback=20)
+MS_TEAMS_BATCH_RETRIES = config.getint("MS_TEAMS_BATCH_RETRIES", fallback=3)
 
 # Sendgrid
 SENDGRID_USER = config.get("SENDGRID_USER")
@@ -97,16 +163,35 @@ AWS_ACCESS_KEY_ID = config.get("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = config.get("AWS_SECRET_ACCESS_KEY")
 AWS_REGION_NAME = config.get("AWS_REGION_NAME")
 AWS_SENDER_EMAIL = config.get("AWS_SENDER_EMAIL")
+# SES bulk (templated) sending: destinations per SendBulkEmail call (max 50),
+# concurrent calls and send rate (0: read MaxSendRate from the account).
+SES_BULK_CHUNK_SIZE = min(config.getint("SES_BULK_CHUNK_SIZE", fallback=50), 50)
+SES_BULK_CONCURRENCY = config.getint("SES_BULK_CONCURRENCY", fallback=4)
+SES_MAX_SEND_RATE = config.getint("SES_MAX_SEND_RATE", fallback=0)
+# send rate when the account quota can't be read (ie. no ses:GetAccount):
+# 14/s is the starting SES production quota.
+SES_FALLBACK_SEND_RATE = config.getint("SES_FALLBACK_SEND_RATE", fallback=14)
+# seconds the account send quota (GetAccount) is cached
+SES_QUOTA_TTL = config.getint("SES_QUOTA_TTL", fallback=300)
+# shared SES clients: HTTP pool size and keep-alive (seconds)
+SES_MAX_POOL_CONNECTIONS = config.getint("SES_MAX_POOL_CONNECTIONS", fallback=50)
+SES_KEEPALIVE_TIMEOUT = config.getint("SES_KEEPALIVE_TIMEOUT", fallback=60)
 
 # OneSignail
 ONESIGNAL_PLAYER_ID = config.get("ONESIGNAL_PLAYER_ID")
 ONESIGNAL_OS_APP_ID = config.get("ONESIGNAL_OS_APP_ID")
 ONESIGNAL_OS_API_KEY = config.get("ONESIGNAL_OS_API_KEY")
+# player IDs per notification (API max. 2000) and notifications in flight
+ONESIGNAL_MAX_PLAYERS = min(config.getint("ONESIGNAL_MAX_PLAYERS", fallback=2000), 2000)
+ONESIGNAL_MAX_CONCURRENCY = config.getint("ONESIGNAL_MAX_CONCURRENCY", fallback=8)
 
 # Twilio credentials
 TWILIO_ACCOUNT_SID = config.get("TWILIO_ACCOUNT_SID")
 TWILIO_AUTH_TOKEN = config.get("TWILIO_AUTH_TOKEN")
 TWILIO_PHONE = config.get("TWILIO_PHONE")
+# requests in flight and (optional) delivery status webhook
+TWILIO_MAX_CONCURRENCY = config.getint("TWILIO_MAX_CONCURRENCY", fallback=20)
+TWILIO_STATUS_CALLBACK = config.get("TWILIO_STATUS_CALLBACK")
 
 # Twitter Tweets:
 TWITTER_ACCESS_TOKEN = config.get("TWITTER_ACCESS_TOKEN")
@@ -117,6 +202,8 @@ TWITTER_CONSUMER_SECRET = config.get("TWITTER_CONSUMER_SECRET")
 # Dialpad Credentials:
 DIALPAD_APIKEY = config.get("DIALPAD_APIKEY")
 DIALPAD_FROM_NUMBER = config.get("DIALPAD_FROM_NUMBER")
+# numbers per multi-recipient SMS request
+DIALPAD_MAX_RECIPIENTS = config.getint("DIALPAD_MAX_RECIPIENTS", fallback=10)
 
 # Zoom Phone (SMS):
 ZOOM_SMS_ACCOUNT_ID = config.get("ZOOM_SMS_ACCOUNT_ID")
@@ -1,4 +1,5 @@
 import os
+import json
 import uuid
 from typing import Any, List, Union, Optional, Literal
 from pathlib import Path
@@ -220,6 +221,9 @@ class TeamsSection(BaseModel):
 
     def addFacts(self, facts: list):
         self.facts = facts
+        # the card holding the section (TeamsCard.addSection) re-serializes.
+        if (card := self.__dict__.get("_card")) is not None:
+            card.invalidate()
 
     def to_adaptative(self):
         items = []
@@ -287,10 +291,13 @@ class TeamsCard(BaseModel):
         }
 
         self.actions.append(CardAction(**action_data))
+        self.invalidate()
 
     def addSection(self, **kwargs):
         section = TeamsSection(**kwargs)
+        object.__setattr__(section, "_card", self)
         self.sections.append(section)
+        self.invalidate()
         return section
 
     def addInput(self, id: str, label: str, is_required: bool = False, errorMessage: str = None, style: str = None):
@@ -308,6 +315,45 @@ class TeamsCard(BaseModel):
             self.body_objects.append(
                 element
             )
+        self.invalidate()
+
+    def _memo_(self) -> dict:
+        # memoized JSON forms: a private attribute, not a model field.
+        try:
+            return object.__getattribute__(self, "_serialized")
+        except AttributeError:
+            memo = {}
+            object.__setattr__(self, "_serialized", memo)
+            return memo
+
+    def invalidate(self):
+        """Forget the memoized JSON forms.
+
+        Called by the add* methods; call it after changing the card (or
+        its sections) in place.
+        """
+        self._memo_().clear()
+
+    def to_json(self, kind: str = "adaptive") -> str:
+        """JSON of the Adaptive Card (``adaptive``) or of the
+        MessageCard (``message``), built once per card version."""
+        memo = self._memo_()
+        try:
+            return memo[kind]
+        except KeyError:
+            data = self.to_adaptative() if kind == "adaptive" else self.to_dict()
+            value = memo[kind] = json.dumps(data)
+            return value
+
+    def to_bytes(self, kind: str = "adaptive") -> bytes:
+        """UTF-8 encoded :meth:`to_json`, ready to be sent."""
+        memo = self._memo_()
+        key = f"{kind}:bytes"
+        try:
+            return memo[key]
+        except KeyError:
+            value = memo[key] = self.to_json(kind).encode("utf-8")
+            return value
 
     def to_dict(self):
         data = super(TeamsCard, self).to_dict()
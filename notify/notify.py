@@ -2,12 +2,17 @@ import importlib
 from navconfig.logging import logger
 from .providers.base import ProviderBase
 from .exceptions import ProviderError, NotifyException
-from .conf import TEMPLATE_DIR
-from .templates import TemplateParser
+from .conf import (
+    TEMPLATE_DIR,
+    TEMPLATE_RENDER_WORKERS,
+    TEMPLATE_RENDER_BATCH
+)
+from .templates import TemplateParser, RenderExecutor
 
 
 PROVIDERS = {}
 TemplateEnv = None
+RenderPool = None
 
 class Notify:
     """Notify
@@ -85,3 +90,11 @@ if __name__ == "notify.notify":
     TemplateEnv = TemplateParser(
         directory=TEMPLATE_DIR
     )
+    if TEMPLATE_RENDER_WORKERS > 0:
+        # CPU-heavy templates are rendered out of the event loop:
+        RenderPool = RenderExecutor(
+            directory=TEMPLATE_DIR,
+            max_workers=TEMPLATE_RENDER_WORKERS,
+            batch_size=TEMPLATE_RENDER_BATCH,
+            filters=TemplateEnv.filters
+        )
@@ -5,18 +5,35 @@ This module is intentionally:
   - synchronous (callers await template rendering themselves)
   - private (leading underscore; not exported from ``__init__.py``)
 """
+import copy
 import os
+import re
+import mmap
+import uuid
+import base64
 import mimetypes
+from collections.abc import Iterator
 from email import encoders
 from email.header import Header
 from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from email.utils import formataddr, formatdate, parseaddr
+from email.policy import compat32
+from email.utils import formataddr, formatdate, getaddresses, parseaddr
 from pathlib import Path
 from typing import Optional, Union
 
 
+# 57 raw bytes encode to exactly one 76-character base64 line (RFC 2045),
+# so reading in multiples of 57 keeps every chunk line-aligned.
+B64_LINE_BYTES = 57
+STREAM_CHUNK_SIZE = B64_LINE_BYTES * 1024
+
+# Serialisation policy for the SMTP wire format (CRLF line endings).
+_WIRE_POLICY = compat32.clone(linesep="\r\n")
+# RFC 5321 §4.5.2 transparency: lines starting with "." get an extra ".".
+_DOT_LINE = re.compile(rb"^\.", re.MULTILINE)
+
 def parse_actor(actor: str) -> tuple[str, str]:
     """Split an actor string into (display_name, address).
 
@@ -135,6 +152,7 @@ def attach_file(
     msg: MIMEMultipart,
     path: Union[str, "os.PathLike[str]"],
     mimetype: Optional[str] = None,
+    stream: bool = False,
 ) -> None:
     """Attach a file with RFC 2231 filename encoding.
 
@@ -143,6 +161,12 @@ def attach_file(
     using the ``(charset, language, value)`` tuple form so non-ASCII
     filenames round-trip correctly per RFC 2231.
 
+    When *stream* is ``True`` the file is **not** read here: the part
+    only carries a placeholder and the file is base64-encoded chunk by
+    chunk by :func:`iter_message_bytes` while the message is written to
+    the transport.  Messages holding streamed parts must be serialised
+    with :func:`iter_message_bytes` (see :func:`has_streaming_parts`).
+
     Args:
         msg: The ``MIMEMultipart`` envelope to attach the file to.
         path: Filesystem path to the file.  May be a :class:`str` or
@@ -150,13 +174,19 @@ def attach_file(
         mimetype: Explicit MIME type string, e.g. ``'application/pdf'``.
             When ``None`` the type is auto-detected from the file
             extension; falls back to ``'application/octet-stream'``.
+        stream: Defer reading and encoding of the file until the message
+            is serialised, keeping memory overhead constant.
 
     Raises:
         FileNotFoundError: If the file at *path* does not exist.
     """
     p = Path(path)
-    with open(p, "rb") as fp:
-        content = fp.read()
+    if stream:
+        if not p.is_file():
+            raise FileNotFoundError(f"No such file: '{p}'")
+    else:
+        with open(p, "rb") as fp:
+            content = fp.read()
 
     if mimetype is None:
         guessed, _ = mimetypes.guess_type(str(p))
@@ -167,8 +197,15 @@ def attach_file(
         maintype, subtype = "application", "octet-stream"
 
     part = MIMEBase(maintype, subtype)
-    part.set_payload(content)
-    encoders.encode_base64(part)
+    if stream:
+        # The placeholder is replaced by the encoded file on serialisation.
+        marker = f"--async-notify-stream-{uuid.uuid4().hex}--"
+        part["Content-Transfer-Encoding"] = "base64"
+        part.set_payload(marker)
+        part.stream_source = (marker.encode("ascii"), p)
+    else:
+        part.set_payload(content)
+        encoders.encode_base64(part)
     # RFC 2231: filename=('charset', 'language', 'name') triggers percent-encoding
     part.add_header(
         "Content-Disposition",
@@ -176,3 +213,105 @@ def attach_file(
         filename=("utf-8", "", p.name),
     )
     msg.attach(part)
+
+
+def has_streaming_parts(msg: MIMEMultipart) -> bool:
+    """Return ``True`` when *msg* holds parts attached with ``stream=True``."""
+    return any(
+        getattr(part, "stream_source", None) is not None
+        for part in msg.walk()
+    )
+
+
+def envelope_addresses(msg: MIMEMultipart) -> tuple[str, list[str]]:
+    """Extract the SMTP envelope (``MAIL FROM``, ``RCPT TO``) from headers.
+
+    Mirrors what :meth:`smtplib.SMTP.send_message` derives from the
+    ``Sender``/``From`` and ``To``/``Cc``/``Bcc`` headers, for transports
+    that drive the SMTP dialogue themselves.
+
+    Returns:
+        A ``(sender, recipients)`` tuple of bare addresses.
+    """
+    sender = msg["Sender"] or msg["From"] or ""
+    _, sender = parseaddr(str(sender))
+    fields = [
+        str(value)
+        for header in ("To", "Cc", "Bcc")
+        for value in (msg.get_all(header) or [])
+    ]
+    recipients = [addr for _, addr in getaddresses(fields) if addr]
+    return sender, recipients
+
+
+def _iter_base64(path: Path, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield the base64 encoding of *path* as CRLF-terminated 76-char lines.
+
+    The file is memory-mapped and encoded slice by slice; empty files and
+    files that can't be mapped fall back to plain chunked reads.
+    """
+    chunk_size -= chunk_size % B64_LINE_BYTES
+    with open(path, "rb") as fp:
+        try:
+            source = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # zero-length or non-regular file: can't be memory-mapped.
+            source = None
+        if source is None:
+            while chunk := fp.read(chunk_size):
+                yield base64.encodebytes(chunk).replace(b"\n", b"\r\n")
+            return
+        with source:
+            for offset in range(0, len(source), chunk_size):
+                chunk = source[offset:offset + chunk_size]
+                yield base64.encodebytes(chunk).replace(b"\n", b"\r\n")
+
+
+def iter_message_bytes(
+    msg: MIMEMultipart,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Serialise *msg* as SMTP ``DATA`` content, streaming file attachments.
+
+    Headers and text parts are flattened once (they are small); every
+    part attached with ``stream=True`` is base64-encoded incrementally
+    from disk, so peak memory stays around *chunk_size* regardless of
+    the attachment size.
+
+    The yielded bytes use CRLF line endings and are already dot-stuffed
+    (RFC 5321 §4.5.2), but do **not** include the terminating
+    ``.\r\n`` sequence: the caller writes it after the last chunk.
+
+    Args:
+        msg: The message to serialise.
+        chunk_size: Raw bytes read per step (rounded down to a multiple
+            of 57, one base64 line).
+
+    Yields:
+        Consecutive chunks of the wire representation of *msg*.
+    """
+    sources = {
+        part.stream_source[0]: part.stream_source[1]
+        for part in msg.walk()
+        if getattr(part, "stream_source", None) is not None
+    }
+    # like smtplib.send_message: Bcc is in the envelope, never in DATA.
+    msg = copy.copy(msg)
+    del msg["Bcc"]
+    del msg["Resent-Bcc"]
+    raw = msg.as_bytes(policy=_WIRE_POLICY)
+    if not sources:
+        segments = [raw]
+    else:
+        pattern = re.compile(
+            b"(" + b"|".join(re.escape(marker) for marker in sources) + b")"
+        )
+        segments = pattern.split(raw)
+    for segment in segments:
+        if segment in sources:
+            yield from _iter_base64(sources[segment], chunk_size)
+            continue
+        if segment:
+            yield _DOT_LINE.sub(b"..", segment)
+    if not raw.endswith(b"\r\n"):
+        yield b"\r\n"
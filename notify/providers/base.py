@@ -3,22 +3,52 @@
 Base Factory classes for all kind of Providers.
 """
 import asyncio
+import contextvars
 from abc import ABC, abstractmethod
 from typing import Any, Union, Optional
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterator
 from enum import Enum
-from functools import partial
+from functools import partial, wraps
 from concurrent.futures import ThreadPoolExecutor
 from navconfig import DEBUG
 from navconfig.logging import logging
-from notify.types import SafeDict
+from notify.utils.formatter import compile_format
 from notify.exceptions import (
     ProviderError
 )
 from notify.models import Actor
+from notify.conf import NOTIFY_SEND_CHUNK_SIZE, NOTIFY_SEND_CONCURRENCY
+from notify.recipients.lite import as_actor, as_recipient, aiter_recipients
+from notify.recipients.batch import RecipientBatch
 from .message import ThreadMessage
 
 
+# per-call render state, as ``(provider, value)``: every send() (and the
+# tasks it fans out) sees its own template, so one instance can run
+# concurrent sends.  Module-level on purpose: a ContextVar per instance
+# would leave one entry per provider in long-lived task contexts.
+_template_var: contextvars.ContextVar = contextvars.ContextVar(
+    "notify_template", default=(None, None)
+)
+_formatter_var: contextvars.ContextVar = contextvars.ContextVar(
+    "notify_formatter", default=(None, None)
+)
+
+
+def render_scope(fn: Callable) -> Callable:
+    """Run a ``send()`` with its own render state, reset when it returns."""
+    @wraps(fn)
+    async def wrapper(*args, **kwargs):
+        template = _template_var.set((None, None))
+        formatter = _formatter_var.set((None, None))
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            _template_var.reset(template)
+            _formatter_var.reset(formatter)
+    return wrapper
+
+
 class ProviderType(Enum):
     NOTIFY = "notify"  # generic notification
     SMS = "sms"  # SMS messages
@@ -37,6 +67,11 @@ class ProviderBase(ABC):
     provider_type: ProviderType = ProviderType.NOTIFY
     blocking: bool = True
     sent: Optional[Union[Callable, Awaitable]] = None
+    # providers that need full Actor models (ie. type checks) set it False,
+    # so LiteRecipient objects are promoted before _send_.
+    lite_recipients: bool = True
+    # asyncio sends in flight (per send() call).
+    concurrency: int = NOTIFY_SEND_CONCURRENCY
 
     def __init__(self, *args, **kwargs):
         self.__name__ = str(self.__class__.__name__)
@@ -63,9 +98,10 @@ class ProviderBase(ABC):
             self._debug = DEBUG
         # add the Jinja Template Parser
         try:
-            from notify.notify import TemplateEnv  # pylint: disable=C0415
+            from notify.notify import TemplateEnv, RenderPool  # pylint: disable=C0415
             self._tpl = TemplateEnv
-            self._template = None
+            # optional process-pool renderer (see RenderExecutor)
+            self._renderer = kwargs.pop('render_executor', RenderPool)
         except Exception as err:
             raise RuntimeError(
                 f"Notify: Can't load the Jinja2 Template Parser: {err}"
@@ -103,6 +139,26 @@ class ProviderBase(ABC):
     def name(cls):
         return cls.__name__
 
+    @property
+    def _template(self):
+        """Template selected by ``_prepare_`` for the current send() call."""
+        owner, template = _template_var.get()
+        return template if owner is self else None
+
+    @_template.setter
+    def _template(self, template):
+        _template_var.set((self, template))
+
+    @property
+    def _formatter(self):
+        """Compiled message with ``{recipient}`` fields for the current send() call."""
+        owner, formatter = _formatter_var.get()
+        return formatter if owner is self else None
+
+    @_formatter.setter
+    def _formatter(self, formatter):
+        _formatter_var.set((self, formatter))
+
     def get_loop(self):
         return self._loop
 
@@ -124,19 +180,19 @@ class ProviderBase(ABC):
         _prepare.
 
         Prepare a Message for Sending.
+        Provider-wide fields (provider kwargs) are formatted once here,
+        ``{recipient...}`` fields are kept for :meth:`_personalize_`.
         """
-        if self._kwargs:
-            try:
-                msg = message.format_map(
-                    SafeDict(
-                        recipient=recipient,
-                        **self._kwargs
-                    )
-                )
-            except (AttributeError, ValueError):
-                msg = message
-        else:
-            msg = message
+        msg = message
+        formatter = None
+        if isinstance(message, str) and (compiled := compile_format(message)):
+            if self._kwargs:
+                msg = compiled.format_map(self._kwargs)
+                if "recipient" in compiled.fields:
+                    compiled = compile_format(msg)
+            if compiled is not None and "recipient" in compiled.fields:
+                formatter = compiled
+        self._formatter = formatter
         if template:
             # Getting Template from Template Parser.
             self._template = self._tpl.get_template(template)
@@ -144,6 +200,19 @@ class ProviderBase(ABC):
             self._template = None
         return msg
 
+    async def _render_template_(self, template: Any, params: dict) -> str:
+        """Render a Jinja2 template, on the render pool when configured."""
+        if self._renderer is not None:
+            return await self._renderer.render(template.name, params, template=template)
+        return await template.render_async(**params)
+
+    def _personalize_(self, message: Any, to: Actor) -> Any:
+        """Resolve the ``{recipient...}`` fields of a prepared message."""
+        formatter = self._formatter
+        if formatter is not None and message == formatter.template:
+            return formatter.format_map({"recipient": to})
+        return message
+
     def _render_sync_(
         self, to: Actor = None, message: str = None, subject: str = None, **kwargs
     ):  # pylint: disable=W0613
@@ -152,16 +221,16 @@ class ProviderBase(ABC):
 
         Returns the parseable version of Message template.
         """
-        msg = message
-        if self._template:
-            self._templateargs = {
+        msg = message = self._personalize_(message, to)
+        if template := self._template:
+            templateargs = {
                 "recipient": to,
                 "username": to,
                 "message": message,
                 "subject": subject,
                 **kwargs,
             }
-            msg = self._template.render(**self._templateargs)
+            msg = template.render(**templateargs)
         return msg
 
     async def _render_(
@@ -172,16 +241,16 @@ class ProviderBase(ABC):
 
         Returns the parseable version of Message template.
         """
-        msg = message
-        if self._template:
-            self._templateargs = {
+        msg = message = self._personalize_(message, to)
+        if template := self._template:
+            templateargs = {
                 "recipient": to,
                 "username": to,
                 "message": message,
                 "subject": subject,
                 **kwargs,
             }
-            msg = await self._template.render_async(**self._templateargs)
+            msg = await self._render_template_(template, templateargs)
         return msg
 
     @abstractmethod
@@ -239,17 +308,24 @@ class ProviderBase(ABC):
                 )
                 raise
 
+    @render_scope
     async def send(
         self,
-        recipient: list[Actor] = None,
+        recipient: Union[list[Actor], RecipientBatch] = None,
         message: Union[str, Any] = None,
         subject: str = None,
+        collect: bool = True,
         **kwargs,
     ):
         """
         send.
 
-        public method to send messages and notifications
+        public method to send messages and notifications.
+        A :class:`RecipientBatch` is sent in chunks of ``NOTIFY_SEND_CHUNK_SIZE``
+        recipients, materialized one chunk at a time; generators and async
+        iterators (ie. DB cursors) are consumed lazily (see :meth:`_stream_`).
+        With ``collect=False`` a streamed send keeps no results (they only
+        reach the *sent* callback) and returns the number of messages sent.
         """
         # template (or message) for preparation
         message = await self._prepare_(
@@ -257,40 +333,179 @@ class ProviderBase(ABC):
             message=message,
             **kwargs
         )
-        results = []
+        if isinstance(recipient, (AsyncIterable, Iterator)):
+            return await self._stream_(
+                recipient, message, subject, collect=collect, **kwargs
+            )
+        if isinstance(recipient, RecipientBatch):
+            results = []
+            for chunk in recipient.chunks(NOTIFY_SEND_CHUNK_SIZE):
+                results += await self._dispatch_(chunk, message, subject, **kwargs)
+            return results
         recipients = [recipient] if not isinstance(recipient, list) else recipient
+        return await self._dispatch_(recipients, message, subject, **kwargs)
+
+    async def _batches_(
+        self,
+        recipient: Any,
+        size: int = NOTIFY_SEND_CHUNK_SIZE
+    ) -> AsyncIterator[list]:
+        """Yield the recipients of a send() in lists of at most *size*.
+
+        Accepts what :meth:`send` accepts (one recipient, a list, a
+        :class:`RecipientBatch` or a (async) iterator, pulled lazily), so
+        providers with their own batched send() keep streaming support.
+        """
+        if isinstance(recipient, RecipientBatch):
+            for chunk in recipient.chunks(size):
+                yield chunk if self.lite_recipients else [as_actor(to) for to in chunk]
+            return
+        if isinstance(recipient, AsyncIterable):
+            recipients = recipient
+        elif isinstance(recipient, (list, Iterator)):
+            recipients = aiter_recipients(recipient)
+        else:
+            recipients = aiter_recipients([recipient])
+        chunk = []
+        async for to in recipients:
+            to = as_recipient(to)
+            chunk.append(to if self.lite_recipients else as_actor(to))
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    async def _deliver_(
+        self,
+        to: Actor,
+        message: Union[str, Any],
+        subject: str = None,
+        loop: asyncio.AbstractEventLoop = None,
+        **kwargs
+    ) -> tuple[bool, Any]:
+        """Send to one recipient and run the *sent* callback.
+
+        Returns:
+            tuple: ``(sent, result)``, errors are logged (not raised).
+        """
+        sent, result = False, None
+        try:
+            result = await self._send_(to, message, subject=subject, **kwargs)
+            sent = True
+        except Exception as e:
+            self.logger.exception(
+                f'Send for recipient {to} raised an exception: {e}',
+                stack_info=True
+            )
+        try:
+            await self.__sent__(to, message, result, loop=loop, **kwargs)
+        except Exception as e:
+            self.logger.exception(
+                f'Send for recipient {to} raised an exception: {e}',
+                stack_info=True
+            )
+        return sent, result
+
+    async def _stream_(
+        self,
+        recipients: Union[AsyncIterable, Iterator],
+        message: Union[str, Any],
+        subject: str = None,
+        collect: bool = True,
+        **kwargs
+    ) -> Union[list, int]:
+        """Fan-out to recipients pulled lazily from a (async) iterator.
+
+        Asyncio providers run ``concurrency`` workers fed by a bounded
+        queue: the next recipient is only pulled when there is room for it.
+        Blocking providers are fed in chunks of ``NOTIFY_SEND_CHUNK_SIZE``.
+        Rows (mappings, ie. DB records) are converted to LiteRecipient.
+
+        Returns:
+            the results of the sent messages or, without *collect*, how
+            many were sent (memory stays flat for any number of recipients).
+        """
+        if not isinstance(recipients, AsyncIterable):
+            recipients = aiter_recipients(recipients)
+        results = []
+        sent_count = 0
+
+        def collected(sent: list) -> None:
+            nonlocal sent_count
+            sent_count += len(sent)
+            if collect:
+                results.extend(sent)
+
+        if self.blocking != 'asyncio':
+            chunk = []
+            async for to in recipients:
+                chunk.append(as_recipient(to))
+                if len(chunk) >= NOTIFY_SEND_CHUNK_SIZE:
+                    collected(await self._dispatch_(chunk, message, subject, **kwargs))
+                    chunk = []
+            if chunk:
+                collected(await self._dispatch_(chunk, message, subject, **kwargs))
+            return results if collect else sent_count
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+
+        async def worker():
+            while (to := await queue.get()) is not None:
+                sent, result = await self._deliver_(to, message, subject, loop, **kwargs)
+                if sent:
+                    collected([result])
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            async for to in recipients:
+                to = as_recipient(to)
+                if not self.lite_recipients:
+                    to = as_actor(to)
+                await queue.put(to)
+        finally:
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        return results if collect else sent_count
+
+    async def _dispatch_(
+        self,
+        recipients: list[Actor],
+        message: Union[str, Any],
+        subject: str = None,
+        **kwargs
+    ) -> list:
+        """Fan-out a prepared message to *recipients*."""
+        results = []
+        if not self.lite_recipients:
+            recipients = [as_actor(to) for to in recipients]
         try:
             loop = asyncio.get_running_loop()
         except RuntimeError:
             loop = asyncio.get_event_loop()
         if self.blocking == 'asyncio':
-            # asyncio:
-            tasks = [self._send_(to, message, subject=subject, **kwargs) for to in recipients]
+            # asyncio, at most ``concurrency`` sends in flight:
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def deliver(to):
+                async with semaphore:
+                    return await self._deliver_(to, message, subject, loop, **kwargs)
+            tasks = [deliver(to) for to in recipients]
             # Using asyncio.as_completed to get results as they become available
-            for to, future in zip(recipients, asyncio.as_completed(tasks)):
-                result = None
-                try:
-                    result = await future
+            for future in asyncio.as_completed(tasks):
+                sent, result = await future
+                if sent:
                     results.append(result)
-                except Exception as e:
-                    self.logger.exception(
-                        f'Send for recipient {to} raised an exception: {e}',
-                        stack_info=True
-                    )
-                try:
-                    await self.__sent__(to, message, result, loop=loop, **kwargs)
-                except Exception as e:
-                    self.logger.exception(
-                        f'Send for recipient {to} raised an exception: {e}',
-                        stack_info=True
-                    )
         elif self.blocking == 'executor':
             results = []
             for to in recipients:
                 with ThreadPoolExecutor(max_workers=10) as executor:
+                    # executors don't propagate the context (render state):
+                    ctx = contextvars.copy_context()
                     result = await loop.run_in_executor(
                         executor,
-                        partial(self._send_, to, message, subject=subject, **kwargs)
+                        partial(ctx.run, self._send_, to, message, subject=subject, **kwargs)
                     )
                     self.__sent__(to, message, _task=result, **kwargs)
                     results.append(result)
@@ -341,6 +556,20 @@ class ProviderMessaging(ProviderBase):
 
     provider_type = ProviderType.SMS
 
+    @staticmethod
+    def _phone_(to: Any) -> Optional[str]:
+        """Phone number of a recipient: its account ``number`` (or ``phone``)."""
+        if isinstance(to, str):
+            return to
+        account = getattr(to, "account", None)
+        if isinstance(account, dict):
+            number = account.get("number") or account.get("phone")
+        else:
+            number = getattr(account, "number", None) or getattr(account, "phone", None)
+        if isinstance(number, (list, tuple)):
+            number = number[0] if number else None
+        return number or None
+
 
 class ProviderIM(ProviderBase):
     """ProviderIM.
@@ -0,0 +1,121 @@
+"""Blocking calls.
+
+Helpers to keep blocking SDK calls (sync HTTP clients, token requests,
+SMTP libraries) off the event loop.
+
+* :func:`blocking_call` marks a provider method as blocking: calling it returns
+  an awaitable that runs the method on a bounded, process-wide executor
+  (``NOTIFY_BLOCKING_WORKERS`` threads), with the caller's context.
+* :class:`LoopLagMonitor` measures how late the event loop wakes up and
+  logs a warning whenever something still blocks it longer than
+  ``NOTIFY_LOOP_LAG_THRESHOLD`` milliseconds.
+"""
+import asyncio
+import contextvars
+import time
+from typing import Any, Optional
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from navconfig.logging import logging
+from notify.conf import NOTIFY_BLOCKING_WORKERS
+from .shared import on_shutdown
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """The shared executor for blocking provider calls."""
+    global _executor  # pylint: disable=W0603
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=NOTIFY_BLOCKING_WORKERS,
+            thread_name_prefix="notify-blocking"
+        )
+    return _executor
+
+
+async def run_blocking(fn: Callable, *args, **kwargs) -> Any:
+    """Run ``fn(*args, **kwargs)`` on the shared executor."""
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_executor(), partial(ctx.run, fn, *args, **kwargs)
+    )
+
+
+def blocking_call(fn: Callable) -> Callable:
+    """Mark a (sync) method as blocking.
+
+    The decorated method becomes a coroutine function executed on the
+    shared executor::
+
+        @blocking_call
+        def _acquire_token_(self, scopes):
+            return self.app.acquire_token_for_client(scopes=scopes)
+
+        token = await self._acquire_token_(scopes)
+
+    (not named ``blocking``: that name is the ``ProviderBase.blocking``
+    mode attribute, which would shadow the decorator in a class body.)
+    """
+    @wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await run_blocking(fn, *args, **kwargs)
+    wrapper.__blocking__ = True
+    return wrapper
+
+
+@on_shutdown
+async def shutdown_executor() -> None:
+    global _executor  # pylint: disable=W0603
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+class LoopLagMonitor:
+    """LoopLagMonitor.
+
+    Wakes up every ``interval`` seconds and measures the delay between the
+    expected and the real wake-up time; a delay over ``threshold`` (ms)
+    means the loop was blocked and is logged as a warning.
+    Attributes:
+        max_lag: highest lag seen (ms).
+        stalls: number of lags over the threshold.
+    """
+
+    def __init__(self, threshold: float = 100, interval: float = 0.5):
+        self.threshold = threshold
+        self.interval = interval
+        self.max_lag: float = 0.0
+        self.stalls: int = 0
+        self._task: Optional[asyncio.Task] = None
+        self.logger = logging.getLogger("Notify.LoopLag")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = (time.perf_counter() - expected) * 1000
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.threshold:
+                self.stalls += 1
+                self.logger.warning(
+                    f"Event loop blocked for {lag:.0f} ms "
+                    f"(threshold {self.threshold} ms)"
+                )
@@ -0,0 +1,165 @@
+"""Provider caches.
+
+Small caches shared by the providers of a worker process:
+
+* :class:`TTLCache`: in-memory LRU whose entries expire after ``ttl``
+  seconds.
+* :class:`SharedCache`: a :class:`TTLCache` backed by Redis
+  (``NOTIFY_CACHE_REDIS``), so the entries are shared by every worker
+  process; without Redis (not configured or ``redis`` not installed) it
+  works as a memory-only cache.
+
+Values stored in Redis must be JSON-serializable.  The Redis client is
+bound to the event loop that created it (one client per loop).
+"""
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from navconfig.logging import logging
+from notify.conf import NOTIFY_CACHE_REDIS
+from .shared import LoopRegistry, on_shutdown
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+
+_MISSING = object()
+
+
+async def _close_redis(client) -> None:
+    await client.close()
+
+
+_redis = LoopRegistry(close=_close_redis)
+
+
+def redis_client():
+    """Redis client of the running event loop for the shared caches
+    (``None`` when disabled)."""
+    if not NOTIFY_CACHE_REDIS or aioredis is None:
+        return None
+    return _redis.setdefault(
+        NOTIFY_CACHE_REDIS,
+        lambda: aioredis.Redis.from_url(NOTIFY_CACHE_REDIS, decode_responses=True)
+    )
+
+
+@on_shutdown
+async def close_redis() -> None:
+    """Close the Redis client of the running event loop."""
+    await _redis.close()
+
+
+class TTLCache:
+    """TTLCache.
+
+    In-memory LRU cache with a time-to-live per entry.
+    Attributes:
+        maxsize: entries kept (the least recently used are evicted).
+        ttl: default seconds an entry is valid.
+    """
+
+    __slots__ = ("maxsize", "ttl", "_data")
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            expires, value = self._data[key]
+        except KeyError:
+            return default
+        if expires <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        self._data[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        try:
+            return self._data.pop(key)[1]
+        except KeyError:
+            return default
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class SharedCache:
+    """SharedCache.
+
+    Two-tier cache: a local :class:`TTLCache` in front of Redis.
+
+    Args:
+        namespace: prefix of the Redis keys (``notify:<namespace>:<key>``).
+        maxsize: entries kept in memory.
+        ttl: default seconds an entry is valid.
+    """
+
+    def __init__(self, namespace: str, maxsize: int = 1024, ttl: float = 3600):
+        self.namespace = namespace
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.logger = logging.getLogger(f"Notify.Cache.{namespace}")
+
+    def __repr__(self) -> str:
+        return f"<SharedCache: {self.namespace} ({len(self.local)} local)>"
+
+    def _key(self, key: str) -> str:
+        return f"notify:{self.namespace}:{key}"
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if (redis := redis_client()) is None:
+            return default
+        try:
+            data = await redis.get(self._key(key))
+            ttl = await redis.ttl(self._key(key)) if data is not None else 0
+        except Exception as exc:  # pylint: disable=W0703
+            self.logger.warning(f"Redis unavailable: {exc}")
+            return default
+        if data is None:
+            return default
+        value = json.loads(data)
+        self.local.set(key, value, ttl=ttl if ttl > 0 else None)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self.local.set(key, value, ttl=ttl)
+        if (redis := redis_client()) is None:
+            return
+        try:
+            await redis.set(
+                self._key(key),
+                json.dumps(value),
+                ex=max(int(ttl or self.local.ttl), 1)
+            )
+        except Exception as exc:  # pylint: disable=W0703
+            self.logger.warning(f"Redis unavailable: {exc}")
+
+    async def delete(self, key: str) -> None:
+        self.local.pop(key)
+        if (redis := redis_client()) is None:
+            return
+        try:
+            await redis.delete(self._key(key))
+        except Exception as exc:  # pylint: disable=W0703
+            self.logger.warning(f"Redis unavailable: {exc}")
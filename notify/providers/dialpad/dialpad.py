@@ -1,17 +1,32 @@
+import asyncio
+import re
 import aiohttp
 import json
 from typing import Any, Union
-from collections.abc import Callable
 from navconfig.logging import logging
-from notify.providers.base import ProviderMessaging, ProviderType
+from notify.providers.base import ProviderMessaging, ProviderType, render_scope
+from notify.providers.shared import http_session
 from notify.models import Actor
 from notify.exceptions import ProviderError
 from notify.conf import (
     DIALPAD_APIKEY,
-    DIALPAD_FROM_NUMBER
+    DIALPAD_FROM_NUMBER,
+    DIALPAD_MAX_RECIPIENTS,
 )
 
+DIALPAD_SMS_URL = "https://dialpad.com/api/v2/sms"
+
+
 class Dialpad(ProviderMessaging):
+    """Dialpad.
+
+    Send SMS using the Dialpad API.
+
+    ``send(..., batch=True)`` groups the recipients that get the same
+    rendered text into one request with several ``to_numbers`` (up to
+    ``DIALPAD_MAX_RECIPIENTS``) and returns a status per number; by default
+    one request is sent per recipient.
+    """
     provider = "dialpad"
     provider_type = ProviderType.SMS
     level = ""
@@ -25,10 +40,10 @@ class Dialpad(ProviderMessaging):
 
         """
         self._msg = None
+        self.from_number = kwargs.pop('from_number', None) or DIALPAD_FROM_NUMBER
         super(Dialpad, self).__init__(**kwargs)
         self.token = DIALPAD_APIKEY if token is None else token
-        self.from_number = DIALPAD_APIKEY if kwargs.get('from_number') is None else kwargs.get('from_number')
-        
+
     async def connect(self, *args, **kwargs):
         if self.token is None or self.from_number is None:
             raise RuntimeError(
@@ -36,35 +51,156 @@ class Dialpad(ProviderMessaging):
                 DIALPAD_APIKEY and DIALPAD_FROM_NUMBER in environment\n \
                 variables or send token and from_number as parameters in instance."
             )
-        headers = {
+        self._headers = {
             "accept": "application/json",
             "content-type": "application/json"
         }
         self.timeout = aiohttp.ClientTimeout(total=60)
-        self.session = aiohttp.ClientSession(headers=headers, timeout=self.timeout)
+        # process-wide HTTP session (closed on worker shutdown)
+        self.session = http_session()
 
     async def close(self):
-        await self.session.close()
+        self.session = None
+
+    async def _post_sms_(self, numbers: list[str], text: str) -> dict:
+        """Send *text* to *numbers* in one request, always releasing the response.
+
+        Raises:
+            ProviderError: when Dialpad rejects the request.
+        """
+        data = {
+            "infer_country_code": True,
+            "from_number": self.from_number,
+            "to_numbers": numbers,
+            "text": text
+        }
+        async with self.session.post(
+            DIALPAD_SMS_URL,
+            params={"apikey": self.token},
+            data=json.dumps(data),
+            headers=self._headers,
+            timeout=self.timeout
+        ) as response:
+            try:
+                result = await response.json(content_type=None)
+            except (aiohttp.ContentTypeError, ValueError):
+                result = {"error": await response.text()}
+            if response.status >= 400:
+                raise ProviderError(
+                    f"Dialpad: error {response.status} sending SMS: {result}"
+                )
+            return result
 
     async def _send_(
         self, to: Actor, message: Union[str, Any], subject: str = None, **kwargs
     ):
         try:
-            url = f"https://dialpad.com/api/v2/sms?apikey={self.token}"
-
             message = await self._render_(to, message, **kwargs)
-            phone = to.account["number"]
-            data = {
-                "infer_country_code": True,
-                "from_number": DIALPAD_FROM_NUMBER,
-                "to_numbers": [phone],
-                "text": message
-            }
-            response = await self.session.post(url, data=json.dumps(data))
-            res = await response.json()
+            res = await self._post_sms_([self._phone_(to)], message)
             logging.debug(f"Sent to: {to.account!s} <> Result: {res!s}")
             return res
         except Exception as ex:
             raise ProviderError(
                 f"Error Sending SMS on Dialpad, current error: {ex}"
             ) from ex
+
+    @render_scope
+    async def send(
+        self,
+        recipient: list[Actor] = None,
+        message: Union[str, Any] = None,
+        subject: str = None,
+        batch: bool = False,
+        **kwargs,
+    ):
+        """
+        send.
+
+        Send an SMS to every recipient; with *batch*, recipients getting
+        the same text are grouped in multi-recipient requests.
+
+        Returns:
+            list: the Dialpad responses (see :meth:`_send_`); with *batch*,
+            per-number status dicts (``number``, ``status``, and the Dialpad
+            ``id`` or the ``error``), in recipient order.
+        """
+        if not batch:
+            return await super().send(recipient, message, subject, **kwargs)
+        message = await self._prepare_(
+            recipient=recipient,
+            message=message,
+            **kwargs
+        )
+        results = []
+        async for recipients in self._batches_(recipient):
+            results += await self._send_batch_(recipients, message, **kwargs)
+        return results
+
+    @staticmethod
+    def _statuses_(numbers: list[str], result: dict) -> dict[str, dict]:
+        """Per-number status of a Dialpad SMS response.
+
+        Dialpad returns one SMS (``id``, ``message_status``) with the
+        ``to_numbers`` it accepted: numbers missing from it were not sent.
+        """
+        accepted = result.get("to_numbers")
+        if isinstance(accepted, list):
+            # Dialpad returns E.164 numbers (country code inferred).
+            accepted = [re.sub(r"\D", "", str(n)) for n in accepted]
+        else:
+            accepted = None
+        statuses = {}
+        for number in numbers:
+            digits = re.sub(r"\D", "", number)
+            if accepted is not None and not any(n.endswith(digits) for n in accepted):
+                statuses[number] = {"number": number, "status": "failed", "error": "not accepted"}
+            else:
+                statuses[number] = {
+                    "number": number,
+                    "status": result.get("message_status", "sent"),
+                    "id": result.get("id"),
+                }
+        return statuses
+
+    async def _send_batch_(self, recipients: list, message: Any, **kwargs) -> list[dict]:
+        loop = asyncio.get_running_loop()
+        # group recipients by rendered text:
+        groups: dict[str, list] = {}
+        statuses: dict[int, dict] = {}
+        for idx, to in enumerate(recipients):
+            if not (number := self._phone_(to)):
+                statuses[idx] = {"number": None, "status": "failed", "error": "no number"}
+                continue
+            text = await self._render_(to, message, **kwargs)
+            groups.setdefault(text, []).append((idx, number))
+
+        async def send_group(text: str, members: list) -> None:
+            numbers = list(dict.fromkeys(number for _, number in members))
+            try:
+                result = await self._post_sms_(numbers, text)
+                by_number = self._statuses_(numbers, result)
+            except Exception as exc:  # pylint: disable=W0703
+                self.logger.error(f"Dialpad: unable to send SMS: {exc}")
+                by_number = {
+                    number: {"number": number, "status": "failed", "error": str(exc)}
+                    for number in numbers
+                }
+            for idx, number in members:
+                statuses[idx] = by_number[number]
+
+        size = DIALPAD_MAX_RECIPIENTS
+        await asyncio.gather(*[
+            send_group(text, members[i:i + size])
+            for text, members in groups.items()
+            for i in range(0, len(members), size)
+        ])
+        results = [statuses[idx] for idx in range(len(recipients))]
+        for to, status in zip(recipients, results):
+            try:
+                await self.__sent__(to, message, status, loop=loop, **kwargs)
+            except Exception as e:  # pylint: disable=W0703
+                self.logger.exception(
+                    f'Send for recipient {to} raised an exception: {e}',
+                    stack_info=True
+                )
+        return results
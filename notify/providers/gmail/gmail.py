@@ -4,11 +4,13 @@ Google Mail (gmail).
 Using gmail library to send Email Messages.
 """
 from typing import Union, Any
+import queue
 
 # 3rd party gmail support
 import smtplib
 from gmail import GMail as GMailWorker, Message
 from notify.providers.mail import ProviderEmail
+from notify.providers.blocking import blocking_call
 from notify.exceptions import ProviderError
 from notify.models import Actor
 from notify.conf import GMAIL_USERNAME, GMAIL_PASSWORD
@@ -25,7 +27,7 @@ class Gmail(ProviderEmail):
     """
 
     provider = "gmail"
-    blocking: bool = True
+    blocking: str = 'asyncio'
 
     def __init__(self, username: str = None, password: str = None, **kwargs):
         super(Gmail, self).__init__(**kwargs)
@@ -47,13 +49,35 @@ class Gmail(ProviderEmail):
                 "as `GMAIL_USERNAME` & `GMAIL_PASSWORD`."
             )
         self.actor = self.username
+        # idle SMTP connections: a GMailWorker is not thread-safe, so every
+        # concurrent send checks out its own one (reused afterwards).
+        self._idle: queue.SimpleQueue = queue.SimpleQueue()
 
     async def close(self):
-        if self._server:
+        while not self._idle.empty():
             try:
-                self._server.close()
+                self._idle.get_nowait().close()
             except Exception as err:
                 self.logger.warning(err)
+        self._server = None
+
+    @blocking_call
+    def _login_(self):
+        return GMailWorker(self.username, self.password)
+
+    @blocking_call
+    def _send_mail_(self, data: Message):
+        try:
+            server = self._idle.get_nowait()
+        except queue.Empty:
+            server = GMailWorker(self.username, self.password)
+        try:
+            result = server.send(data)
+        except Exception:
+            server.close()
+            raise
+        self._idle.put(server)
+        return result
 
     async def connect(self):
         """
@@ -61,8 +85,12 @@ class Gmail(ProviderEmail):
 
         Making a connection to Gmail Servers
         """
+        if not self._idle.empty():
+            # already connected (send() connects on every call).
+            return
         try:
-            self._server = GMailWorker(self.username, self.password)
+            self._server = await self._login_()
+            self._idle.put(self._server)
         except smtplib.SMTPAuthenticationError as err:
             raise ProviderError(
                 f"Authentication Error: {err}"
@@ -72,16 +100,16 @@ class Gmail(ProviderEmail):
 
     async def _render_(self, to: Actor, message: str = None, subject: str = None, **kwargs):
         """ """
-        msg = message
-        if self._template:
-            self._templateargs = {
+        msg = message = self._personalize_(message, to)
+        if template := self._template:
+            templateargs = {
                 "recipient": to,
                 "username": to,
                 "message": message,
                 "content": message,
                 **kwargs,
             }
-            msg = await self._template.render_async(**self._templateargs)
+            msg = await self._render_template_(template, templateargs)
         else:
             try:
                 msg = kwargs["body"]
@@ -108,6 +136,6 @@ class Gmail(ProviderEmail):
         data = await self._render_(to, message, subject, **kwargs)
         # making email connnection
         try:
-            return self._server.send(data)
+            return await self._send_mail_(data)
         except Exception as e:
             raise ProviderError(f"Gmail: Error sending Email to {to}: {e}") from e
@@ -1,4 +1,5 @@
 ## for abstract email provider:
+import os
 import ssl
 import asyncio
 from abc import ABC
@@ -7,8 +8,9 @@ from collections.abc import Callable
 import aiosmtplib
 from notify.models import Actor
 from notify.exceptions import ProviderError
+from notify.conf import EMAIL_ATTACHMENT_STREAM_SIZE
 # abstract class
-from .base import ProviderBase, ProviderType
+from .base import ProviderBase, ProviderType, render_scope
 from notify.providers import _mime_utils as _mu
 
 
@@ -121,6 +123,7 @@ class ProviderEmail(ProviderBase, ABC):
         Returns:
             A :class:`email.mime.multipart.MIMEMultipart` ready for transport.
         """
+        message = self._personalize_(message, to)
         recipient = (
             to.account.address if not isinstance(to, list)
             else ", ".join(to)
@@ -141,15 +144,15 @@ class ProviderEmail(ProviderBase, ABC):
         if message:
             _mu.attach_text_part(msg, message, "plain")
 
-        if self._template:
-            self._templateargs = {
+        if template := self._template:
+            templateargs = {
                 "recipient": to,
                 "username": to,
                 "message": message,
                 "content": message,
                 **kwargs,
             }
-            content = await self._template.render_async(**self._templateargs)
+            content = await self._render_template_(template, templateargs)
         else:
             content = message
         _mu.attach_text_part(msg, content or "", "html")
@@ -163,6 +166,10 @@ class ProviderEmail(ProviderBase, ABC):
         unknown and resolved via ``mimetypes.guess_type``; callers may pass
         a correctly-spelled explicit type to override detection.
 
+        Files of ``EMAIL_ATTACHMENT_STREAM_SIZE`` bytes or more are not
+        loaded in memory: they are encoded from disk while the message is
+        written to the SMTP socket (see :meth:`_send_streaming_`).
+
         Args:
             message: The :class:`email.mime.multipart.MIMEMultipart` envelope.
             filename: Filesystem path to the file to attach.
@@ -176,7 +183,84 @@ class ProviderEmail(ProviderBase, ABC):
             if mimetype in ("octect-stream", "application/octet-stream")
             else mimetype
         )
-        _mu.attach_file(message, filename, resolved)
+        stream = os.path.getsize(filename) >= EMAIL_ATTACHMENT_STREAM_SIZE
+        _mu.attach_file(message, filename, resolved, stream=stream)
+
+    @staticmethod
+    async def _drain_(protocol) -> None:
+        """Wait until the transport takes more data: the flow control of
+        aiosmtplib's protocol (what ``StreamWriter.drain()`` waits on)."""
+        try:
+            await protocol._drain_helper()  # pylint: disable=W0212
+        except ConnectionResetError as exc:
+            raise aiosmtplib.SMTPServerDisconnected(
+                "Connection lost while sending"
+            ) from exc
+
+    def _mail_options_(self, sender: str, recipients: list[str]) -> tuple[list[str], str]:
+        """``MAIL FROM`` options and address encoding, chosen like
+        ``aiosmtplib.SMTP.send_message`` does (SMTPUTF8, 8BITMIME)."""
+        options = []
+        try:
+            sender.encode("ascii")
+            "".join(recipients).encode("ascii")
+        except UnicodeEncodeError:
+            if not self._server.supports_extension("smtputf8"):
+                raise aiosmtplib.SMTPNotSupported(
+                    "An address containing non-ASCII characters was provided, "
+                    "but SMTPUTF8 is not supported by this server"
+                ) from None
+            options.append("SMTPUTF8")
+        if self._server.supports_extension("8BITMIME"):
+            options.append("BODY=8BITMIME")
+        return options, "utf-8" if "SMTPUTF8" in options else "ascii"
+
+    async def _send_streaming_(self, msg):
+        """Send *msg* writing its streamed attachments chunk by chunk.
+
+        ``aiosmtplib.SMTP.send_message`` needs the whole message as bytes,
+        so the envelope and the ``DATA`` phase are driven here instead
+        (through the aiosmtplib 5.x protocol), waiting for the transport
+        to drain between chunks.
+        """
+        protocol = self._server.protocol
+        if not all(
+            hasattr(protocol, attr) for attr in ("write", "read_response", "_drain_helper")
+        ):
+            raise ProviderError(
+                f"{self.__name__}: streamed attachments need aiosmtplib 5.x, "
+                f"got {aiosmtplib.__version__}"
+            )
+        sender, recipients = _mu.envelope_addresses(msg)
+        # EHLO first (done on connect): the options depend on the extensions.
+        if self._server.is_ehlo_or_helo_needed:
+            await self._server.ehlo(timeout=self.timeout)
+        options, encoding = self._mail_options_(sender, recipients)
+        await self._server.mail(
+            sender, options=options, encoding=encoding, timeout=self.timeout
+        )
+        errors = {}
+        for rcpt in recipients:
+            try:
+                await self._server.rcpt(rcpt, encoding=encoding, timeout=self.timeout)
+            except aiosmtplib.SMTPRecipientRefused as exc:
+                errors[rcpt] = (exc.code, exc.message)
+        if len(errors) == len(recipients):
+            await self._server.rset()
+            raise aiosmtplib.SMTPRecipientsRefused(
+                [aiosmtplib.SMTPRecipientRefused(*err, rcpt) for rcpt, err in errors.items()]
+            )
+        response = await self._server.execute_command(b"DATA", timeout=self.timeout)
+        if response.code != aiosmtplib.SMTPStatus.start_input:
+            raise aiosmtplib.SMTPDataError(response.code, response.message)
+        for chunk in _mu.iter_message_bytes(msg):
+            protocol.write(chunk)
+            await self._drain_(protocol)
+        protocol.write(b".\r\n")
+        response = await protocol.read_response(timeout=self.timeout)
+        if response.code != aiosmtplib.SMTPStatus.completed:
+            raise aiosmtplib.SMTPDataError(response.code, response.message)
+        return errors, response.message
 
     async def _send_(
         self, to: Actor, message: str, subject: str, **kwargs
@@ -192,7 +276,10 @@ class ProviderEmail(ProviderBase, ABC):
                 self.add_attachment(message=msg, filename=attach)
         try:
             try:
-                response = await self._server.send_message(msg)
+                if _mu.has_streaming_parts(msg):
+                    response = await self._send_streaming_(msg)
+                else:
+                    response = await self._server.send_message(msg)
                 if self._debug is True:
                     self.logger.debug(response)
             except aiosmtplib.errors.SMTPServerDisconnected as err:
@@ -206,6 +293,7 @@ class ProviderEmail(ProviderBase, ABC):
                 f"{self.__name__} Error: got {e.__class__}, {e}"
             ) from e
 
+    @render_scope
     async def send(
         self,
         recipient: list[Actor] = None,
@@ -1,4 +1,5 @@
 import asyncio
+import contextvars
 from typing import Any, Union
 from collections.abc import Callable, Awaitable
 from functools import partial
@@ -19,6 +20,8 @@ class ThreadMessage(threading.Thread):
     ):
         super().__init__()
         self._loop = asyncio.new_event_loop()
+        # threads don't inherit the caller's context (provider render state):
+        self._context = contextvars.copy_context()
         self._queue = queue
         self._message = message
         self._subject = subject
@@ -38,7 +41,8 @@ class ThreadMessage(threading.Thread):
                     self._message,
                     subject=self._subject,
                     **self._kwargs
-                )
+                ),
+                context=self._context
             )
             fn = partial(self._callback, self._rcpt, self._message, **self._kwargs)
             task.add_done_callback(fn)
@@ -17,6 +17,7 @@ from O365 import (
 from navconfig import BASE_DIR
 from navconfig.logging import logging
 from notify.providers.mail import ProviderEmail
+from notify.providers.blocking import run_blocking
 from notify.exceptions import NotifyAuthError
 from notify.models import Actor
 from notify.conf import (
@@ -88,7 +89,11 @@ class Office365(ProviderEmail):
     async def connect(self, **kwargs):
         """Connect.
         Making a connection using MS Office 365 Protocol.
+        The O365 library does sync token I/O: runs on the shared executor.
         """
+        return await run_blocking(self._connect_, **kwargs)
+
+    def _connect_(self, **kwargs):
         self.protocol = MSOffice365Protocol(**kwargs)
         credentials = (self.client_id, self.client_secret)
         # "https://graph.microsoft.com/.default",
@@ -148,14 +153,15 @@ class Office365(ProviderEmail):
                 print(f"Error during authentication: {e}")
                 # Token might be expired or invalid, delete it and start over
                 o365_token.unlink()
-                return await self.connect(**kwargs)
+                return self._connect_(**kwargs)
 
     async def close(self):
         pass
 
     async def _render_(self, to: Actor, message: str = None, subject: str = None, **kwargs):
         """ """
-        if self._template:
+        message = self._personalize_(message, to)
+        if template := self._template:
             templateargs = {
                 "recipient": to,
                 "username": to,
@@ -163,7 +169,7 @@ class Office365(ProviderEmail):
                 "content": message,
                 **kwargs,
             }
-            msg = await self._template.render_async(**templateargs)
+            msg = await self._render_template_(template, templateargs)
         else:
             try:
                 msg = kwargs["body"]
@@ -199,7 +205,7 @@ class Office365(ProviderEmail):
             print(exc)
             return False
         try:
-            result = message.send()
+            result = await run_blocking(message.send)
             return result
         except Exception as exc:
             print('Error: ', exc)
@@ -3,21 +3,33 @@ Onesignal.
 
 Using OneSignal infrastructure to send push notifications to browsers.
 """
-from typing import Union, Any
+import asyncio
+from typing import Union, Any, Optional
 from requests.exceptions import HTTPError
 from onesignal_sdk.client import AsyncClient
 from onesignal_sdk.error import OneSignalHTTPError
-from notify.providers.base import ProviderIMBase, ProviderType
+from notify.providers.base import ProviderPush, ProviderType, render_scope
 from notify.models import Actor
 from notify.exceptions import ProviderError
-from notify.conf import ONESIGNAL_PLAYER_ID, ONESIGNAL_OS_APP_ID, ONESIGNAL_OS_API_KEY
+from notify.conf import (
+    ONESIGNAL_PLAYER_ID,
+    ONESIGNAL_OS_APP_ID,
+    ONESIGNAL_OS_API_KEY,
+    ONESIGNAL_MAX_PLAYERS,
+    ONESIGNAL_MAX_CONCURRENCY,
+)
 
 
-class Onesignal(ProviderIMBase):
+class Onesignal(ProviderPush):
     """
     onesignal.
 
-    param:: player_ids: a list of "players", recipients of push messages
+    ``send(..., batch=True)`` groups the recipients that get the same
+    rendered message into notifications of up to ``ONESIGNAL_MAX_PLAYERS``
+    player IDs (``include_player_ids``), sent concurrently, and returns a
+    status per recipient; by default one notification is sent per recipient.
+
+    param:: player_ids: default player, for recipients without one
     param:: app_id: passing an APP_ID
     """
 
@@ -53,7 +65,7 @@ class Onesignal(ProviderIMBase):
                 app_id=self.os_app_id, rest_api_key=self.os_api_key
             )
         except Exception as err:
-            self._logger.error(f"Error connecting to OneSignal API: {err}")
+            self.logger.error(f"Error connecting to OneSignal API: {err}")
             raise ProviderError(f"Error connecting to OneSignal API {err}") from err
 
     async def close(self):
@@ -64,49 +76,147 @@ class Onesignal(ProviderIMBase):
             # Assuming there is a close method or any other cleanup logic for the client
             self.client = None
 
-    async def _send_(self, to: Actor, message: Union[str, Any], **kwargs) -> Any:
-        """_send_.
-        Send push notification through OneSignal API.
+    def _player_(self, to: Actor) -> Optional[str]:
+        """Player ID of a recipient (account ``userid``), or the default one."""
+        account = getattr(to, "account", None)
+        if isinstance(account, dict):
+            player = account.get("player_id") or account.get("userid")
+        else:
+            player = getattr(account, "player_id", None) or getattr(account, "userid", None)
+        return player or self.players
+
+    async def _notify_(self, players: list[str], contents: str) -> dict:
+        """Send one notification to *players*, returning the response body.
+
+        Raises:
+            ProviderError: when the request fails.
         """
         notification_body = {
-            "contents": {"en": message},
-            "include_player_ids": [self.players],  # Sending to specific players
-            "included_segments": ["Active Users"]  # Segments can be controlled
+            "contents": {"en": contents},
+            "include_player_ids": players,
         }
+        if self.client is None:
+            await self.connect()
         try:
             # Sends the push notification!
             response = await self.client.send_notification(notification_body)
-            self._logger.debug(f"OneSignal response: {response.body}")  # JSON parsed response
-            self._logger.debug(f"OneSignal status code: {response.status_code}")  # Status code
-            return response
+            self.logger.debug(f"OneSignal response: {response.body}")  # JSON parsed response
+            self.logger.debug(f"OneSignal status code: {response.status_code}")  # Status code
+            return response.body or {}
         except OneSignalHTTPError as e:
-            self._logger.error(f"OneSignal HTTP Error: {e}")
+            self.logger.error(f"OneSignal HTTP Error: {e}")
             raise ProviderError(f"OneSignal HTTP Error: {e}") from e
         except HTTPError as e:
             result = e.response.json()
-            self._logger.error(f"HTTP Error: {result}")
+            self.logger.error(f"HTTP Error: {result}")
             raise ProviderError(f"HTTP Error: {result}") from e
         except Exception as e:
-            self._logger.exception(f"Error while sending OneSignal push notification: {e}")
+            self.logger.exception(f"Error while sending OneSignal push notification: {e}")
             raise ProviderError(f"Unexpected Error: {e}") from e
 
+    async def _send_(self, to: Actor, message: Union[str, Any], **kwargs) -> Any:
+        """_send_.
+        Send push notification through OneSignal API.
+        """
+        contents = await self._render_(to, message, **kwargs)
+        return await self._notify_([self._player_(to)], contents)
+
+    @staticmethod
+    def _statuses_(players: list[str], body: dict) -> list[dict]:
+        """Per-player status of a notification response.
+
+        OneSignal reports ``errors`` as ``{"invalid_player_ids": [...]}``
+        (only those failed) or as a list of messages (nobody got it).
+        """
+        errors = body.get("errors")
+        if isinstance(errors, dict):
+            invalid = set(errors.get("invalid_player_ids") or [])
+            return [
+                {"player_id": player, "status": "failed", "error": "invalid_player_id"}
+                if player in invalid
+                else {"player_id": player, "status": "sent", "id": body.get("id")}
+                for player in players
+            ]
+        if errors and not body.get("id"):
+            error = "; ".join(str(e) for e in errors)
+            return [{"player_id": player, "status": "failed", "error": error} for player in players]
+        return [{"player_id": player, "status": "sent", "id": body.get("id")} for player in players]
+
+    @render_scope
     async def send(
         self,
         recipient: list[Actor] = None,
         message: Union[str, Any] = None,
         subject: str = None,
+        batch: bool = False,
         **kwargs,
     ):
         """
-        Main method to send push notifications to a list of recipients.
+        Main method to send push notifications to a list of recipients;
+        with *batch*, recipients getting the same content share one
+        notification.
+
+        Returns:
+            list: the OneSignal responses (see :meth:`_send_`); with *batch*,
+            per-recipient status dicts (``player_id``, ``status``, and the
+            notification ``id`` or the ``error``), in recipient order.
         """
+        if not batch:
+            return await super().send(recipient, message, subject, **kwargs)
+        message = await self._prepare_(
+            recipient=recipient,
+            message=message,
+            **kwargs
+        )
         results = []
-        recipients = [recipient] if not isinstance(recipient, list) else recipient
-        # Iterate over recipients and send push notifications
-        for to in recipients:
+        # enough recipients to fill the concurrent notifications:
+        size = ONESIGNAL_MAX_PLAYERS * ONESIGNAL_MAX_CONCURRENCY
+        async for recipients in self._batches_(recipient, size):
+            results += await self._send_batch_(recipients, message, **kwargs)
+        return results
+
+    async def _send_batch_(self, recipients: list, message: Any, **kwargs) -> list[dict]:
+        loop = asyncio.get_running_loop()
+        # group recipients by rendered content:
+        groups: dict[str, list] = {}
+        statuses: dict[int, dict] = {}
+        for idx, to in enumerate(recipients):
+            if not (player := self._player_(to)):
+                statuses[idx] = {"player_id": None, "status": "failed", "error": "no player id"}
+                continue
+            contents = await self._render_(to, message, **kwargs)
+            groups.setdefault(contents, []).append((idx, player))
+
+        semaphore = asyncio.Semaphore(ONESIGNAL_MAX_CONCURRENCY)
+
+        async def send_chunk(contents: str, members: list) -> None:
+            players = list(dict.fromkeys(player for _, player in members))
+            try:
+                async with semaphore:
+                    body = await self._notify_(players, contents)
+                by_player = {s["player_id"]: s for s in self._statuses_(players, body)}
+            except Exception as exc:  # pylint: disable=W0703
+                self.logger.error(f"OneSignal: unable to send notification: {exc}")
+                by_player = {
+                    player: {"player_id": player, "status": "failed", "error": str(exc)}
+                    for player in players
+                }
+            for idx, player in members:
+                statuses[idx] = by_player[player]
+
+        size = ONESIGNAL_MAX_PLAYERS
+        await asyncio.gather(*[
+            send_chunk(contents, members[i:i + size])
+            for contents, members in groups.items()
+            for i in range(0, len(members), size)
+        ])
+        results = [statuses[idx] for idx in range(len(recipients))]
+        for to, status in zip(recipients, results):
             try:
-                result = await self._send_(to, message, **kwargs)
-                results.append(result)
-            except Exception as e:
-                self._logger.error(f"Failed to send to {to}: {e}")
+                await self.__sent__(to, message, status, loop=loop, **kwargs)
+            except Exception as e:  # pylint: disable=W0703
+                self.logger.exception(
+                    f'Send for recipient {to} raised an exception: {e}',
+                    stack_info=True
+                )
         return results
@@ -9,6 +9,8 @@ import msal
 from office365.graph_client import GraphClient
 from navconfig.logging import logging
 from notify.providers.mail import ProviderEmail
+from notify.providers.blocking import blocking_call, run_blocking
+from notify.providers.tokens import get_token_cache, token_key
 from notify.models import Actor
 from notify.conf import (
     O365_CLIENT_ID,
@@ -46,6 +48,7 @@ class Outlook(ProviderEmail):
         self.protocol: Callable = None
         self._attachments: dict = {}
         self.client: Callable = None
+        self._token: dict = None
         super(Outlook, self).__init__(*args, **kwargs)
 
         # connection related settings
@@ -119,12 +122,11 @@ class Outlook(ProviderEmail):
         Making a connection using MS Office 365 Protocol.
         """
         try:
-            if self.use_credentials is True:
-                self.client = GraphClient(self.acquire_token_by_username)
-                self.authenticate = True
-            else:
-                self.client = GraphClient(self.acquire_token)
-                self.authenticate = True
+            # the Graph client asks for the token on every request: it is
+            # served from the shared token cache (see _cached_token_).
+            self.client = GraphClient(self._cached_token_)
+            await self._refresh_token_()
+            self.authenticate = True
         except Exception as exc:
             self.logger.error(
                 f"Error during authentication: {exc}"
@@ -133,9 +135,33 @@ class Outlook(ProviderEmail):
     async def close(self):
         self.client = None
 
+    async def _refresh_token_(self) -> dict:
+        """Get the token from the shared token cache (requested with msal
+        on the blocking executor only when missing or about to expire)."""
+        if self.use_credentials is True:
+            fetch = self.acquire_token_by_username
+            subject = self.username
+        else:
+            fetch = self.acquire_token
+            subject = None
+        key = token_key(
+            "msgraph", self.tenant_id, self.client_id, self.scopes, subject=subject
+        )
+        self._token = await get_token_cache().get(key, lambda: run_blocking(fetch))
+        return self._token
+
+    def _cached_token_(self) -> dict:
+        return self._token
+
+    @blocking_call
+    def _execute_query_(self, query):
+        # sync HTTP request of the Graph client.
+        return query.execute_query()
+
     async def _render_(self, to: Actor, message: str = None, subject: str = None, **kwargs):
         """ """
-        if self._template:
+        message = self._personalize_(message, to)
+        if template := self._template:
             templateargs = {
                 "recipient": to,
                 "username": to,
@@ -143,7 +169,7 @@ class Outlook(ProviderEmail):
                 "content": message,
                 **kwargs,
             }
-            msg = await self._template.render_async(**templateargs)
+            msg = await self._render_template_(template, templateargs)
         else:
             try:
                 msg = kwargs["body"]
@@ -173,7 +199,8 @@ class Outlook(ProviderEmail):
             print(exc)
             return False
         try:
-            result = message.execute_query()
+            await self._refresh_token_()
+            result = await self._execute_query_(message)
             return result
         except Exception as exc:
             print('Error: ', exc)
@@ -0,0 +1,106 @@
+"""SES Clients.
+
+Process-wide cache of aiobotocore clients keyed by service, region and
+credentials: credentials, endpoints and the HTTP connection pool are
+resolved once, and keep-alive connections (and their TLS sessions) are
+reused by every send.  Clients are closed on worker shutdown.
+
+Sends of the same account and region also share one :class:`RateLimiter`,
+paced to the account ``MaxSendRate`` (read at most every
+``SES_QUOTA_TTL`` seconds).
+"""
+import hashlib
+from contextlib import AsyncExitStack
+from typing import Any, NamedTuple
+from collections.abc import Awaitable, Callable
+from aiobotocore.config import AioConfig
+from notify.providers.shared import LoopRegistry, on_shutdown
+from notify.providers.cache import TTLCache
+from notify.utils.ratelimit import RateLimiter
+from notify.conf import (
+    SES_MAX_POOL_CONNECTIONS,
+    SES_KEEPALIVE_TIMEOUT,
+    SES_QUOTA_TTL,
+)
+
+
+class _CachedClient(NamedTuple):
+    client: Any
+    stack: AsyncExitStack
+
+
+async def _close_client(cached: _CachedClient) -> None:
+    await cached.stack.aclose()
+
+
+_clients = LoopRegistry(close=_close_client)
+# send-rate limiters and quotas, by (region, access key)
+_limiters = LoopRegistry()
+_quotas = TTLCache(maxsize=64, ttl=SES_QUOTA_TTL)
+
+
+def client_config() -> AioConfig:
+    return AioConfig(
+        max_pool_connections=SES_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=True,
+        connector_args={"keepalive_timeout": SES_KEEPALIVE_TIMEOUT},
+    )
+
+
+async def get_client(
+    session: Any,
+    service: str,
+    region_name: str,
+    aws_access_key_id: str,
+    aws_secret_access_key: str,
+) -> Any:
+    """Return the shared client for *service* ("ses", "sesv2"), creating it
+    with *session* on first use (or when the event loop changed)."""
+    key = (
+        service,
+        region_name,
+        aws_access_key_id,
+        hashlib.sha256(str(aws_secret_access_key).encode()).hexdigest(),
+    )
+
+    async def create() -> _CachedClient:
+        stack = AsyncExitStack()
+        client = await stack.enter_async_context(
+            session.create_client(
+                service,
+                region_name=region_name,
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key,
+                config=client_config(),
+            )
+        )
+        return _CachedClient(client, stack)
+    return (await _clients.acquire(key, create)).client
+
+
+async def get_limiter(
+    region_name: str,
+    aws_access_key_id: str,
+    send_rate: Callable[[], Awaitable[float]]
+) -> RateLimiter:
+    """Return the limiter shared by the sends of an account in a region.
+
+    ``await send_rate()`` reads the account quota when it isn't cached.
+    """
+    key = (region_name, aws_access_key_id)
+    limiter = _limiters.setdefault(key, lambda: RateLimiter(0))
+    if (rate := _quotas.get(key)) is None:
+        async with _limiters.lock(key):
+            if (rate := _quotas.get(key)) is None:
+                rate = await send_rate()
+                _quotas.set(key, rate)
+    limiter.rate = rate
+    return limiter
+
+
+@on_shutdown
+async def close_clients() -> None:
+    """Close the cached clients owned by the running event loop."""
+    await _clients.close()
+    await _limiters.close()
+    _quotas.clear()
@@ -1,17 +1,24 @@
 from typing import Optional, Union, Any
 from collections.abc import Callable
 import asyncio
+import json
 from aiobotocore.session import get_session
 from botocore.exceptions import ClientError
 from navconfig.logging import logging
+from notify.providers.base import render_scope
 from notify.providers.mail import ProviderEmail
 from notify.providers import _mime_utils as _mu
 from notify.models import Actor
+from .clients import get_client, get_limiter
 from notify.conf import (
     AWS_ACCESS_KEY_ID,
     AWS_SECRET_ACCESS_KEY,
     AWS_REGION_NAME,
-    AWS_SENDER_EMAIL
+    AWS_SENDER_EMAIL,
+    SES_BULK_CHUNK_SIZE,
+    SES_BULK_CONCURRENCY,
+    SES_MAX_SEND_RATE,
+    SES_FALLBACK_SEND_RATE,
 )
 
 logging.getLogger("aiobotocore").setLevel(logging.CRITICAL)
@@ -69,8 +76,20 @@ class Ses(ProviderEmail):
         self.session = get_session()
         self.authenticate = True
 
+    async def get_client(self, service: str = "ses") -> Callable:
+        """Shared aiobotocore client for this region and credentials."""
+        if self.session is None:
+            await self.connect()
+        return await get_client(
+            self.session,
+            service,
+            region_name=self.aws_region_name,
+            aws_access_key_id=self.aws_access_key_id,
+            aws_secret_access_key=self.aws_secret_access_key,
+        )
+
     async def close(self):
-        """Close the connection."""
+        """Release the provider (shared clients are closed on shutdown)."""
         self.client = None
         self.session = None
         self.authenticate = False
@@ -93,7 +112,8 @@ class Ses(ProviderEmail):
             A :class:`email.mime.multipart.MIMEMultipart` ready for
             serialisation and delivery via SES ``send_raw_email``.
         """
-        if self._template:
+        message = self._personalize_(message, to)
+        if template := self._template:
             templateargs = {
                 "recipient": to,
                 "username": to,
@@ -101,7 +121,7 @@ class Ses(ProviderEmail):
                 "content": message,
                 **kwargs,
             }
-            content = await self._template.render_async(**templateargs)
+            content = await self._render_template_(template, templateargs)
         else:
             try:
                 content = kwargs["body"]
@@ -124,37 +144,145 @@ class Ses(ProviderEmail):
         client: Optional[Callable] = None,
         **kwargs
     ):
-        """Send the email message to the recipient."""
-        if self.use_aws_template:
-            # Use AWS SES templates to send the email
-            try:
-                return await client.send_templated_email(
-                    Source=self.sender_email,
-                    Destination={
-                        'ToAddresses': [to.account.address],
-                    },
-                    Template=self.template_name,
-                    TemplateData=kwargs,
-                )
-            except ClientError as e:
-                self.logger.exception(e, stack_info=True)
-                raise RuntimeError(f"{e}") from e
-        else:
-            try:
-                message = await self._render_(to, message, subject, **kwargs)
-            except (TypeError, ValueError) as exc:
-                self.logger.error(exc)
-                return False
+        """Send the email message to the recipient (SES templates are
+        sent in bulk, see :meth:`_send_bulk_`)."""
+        if client is None:
+            client = await self.get_client("ses")
+        try:
+            message = await self._render_(to, message, subject, **kwargs)
+        except (TypeError, ValueError) as exc:
+            self.logger.error(exc)
+            return False
+        try:
+            return await client.send_raw_email(
+                Source=self.sender_email,
+                Destinations=self._addresses_(to),
+                RawMessage={"Data": message.as_string()},
+            )
+        except ClientError as exc:
+            self.logger.exception(exc, stack_info=True)
+            raise RuntimeError(f"{exc}") from exc
+
+    @staticmethod
+    def _addresses_(to: Actor) -> list[str]:
+        """E-mail addresses of a recipient (``account.address`` may be a list)."""
+        address = to.account.address
+        if isinstance(address, (list, tuple)):
+            return [a for a in address if a]
+        return [address] if address else []
+
+    def _replacement_data_(self, to: Actor, replacement: Optional[Callable]) -> str:
+        """Per-destination template data (JSON) for SendBulkEmail."""
+        addresses = self._addresses_(to)
+        data = {"name": getattr(to, "name", None), "email": addresses[0] if addresses else None}
+        if callable(replacement):
+            data.update(replacement(to) or {})
+        return json.dumps(data, default=str)
+
+    async def _send_rate_(self, client: Callable) -> float:
+        """Account send-rate quota (messages per second)."""
+        if SES_MAX_SEND_RATE:
+            return SES_MAX_SEND_RATE
+        try:
+            account = await client.get_account()
+            return float(account["SendQuota"]["MaxSendRate"])
+        except (ClientError, KeyError, TypeError, ValueError) as exc:
+            self.logger.warning(
+                f"Unable to read the SES send quota ({exc}), sending at "
+                f"{SES_FALLBACK_SEND_RATE} msg/s: set SES_MAX_SEND_RATE to the "
+                "account MaxSendRate."
+            )
+            return float(SES_FALLBACK_SEND_RATE)
+
+    async def _send_bulk_(
+        self,
+        recipient: Union[Actor, list[Actor]],
+        template_name: str,
+        template_data: Union[str, dict],
+        replacement_data: Optional[Callable] = None,
+        **kwargs
+    ) -> list[dict]:
+        """Send an SES template to every recipient using ``SendBulkEmail``.
+
+        Recipients are sent in chunks of ``SES_BULK_CHUNK_SIZE`` (max. 50)
+        destinations, each destination gets its own replacement data (name,
+        email and ``replacement_data(recipient)`` if given), so addresses
+        are never disclosed to other recipients.  Up to ``SES_BULK_CONCURRENCY``
+        chunks are sent at once, paced to the account ``MaxSendRate`` (the
+        pace is shared by every send of the account in the region).
+
+        Returns:
+            list: one ``BulkEmailEntryResult`` per recipient, in order.
+        """
+        if not isinstance(template_data, str):
+            template_data = json.dumps(template_data, default=str)
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(SES_BULK_CONCURRENCY)
+        client = await self.get_client("sesv2")
+        limiter = await get_limiter(
+            self.aws_region_name,
+            self.aws_access_key_id,
+            lambda: self._send_rate_(client)
+        )
+
+        async def send_chunk(chunk: list) -> list[dict]:
             try:
-                return await client.send_raw_email(
-                    Source=self.sender_email,
-                    Destinations=[to.account.address],
-                    RawMessage={"Data": message.as_string()},
-                )
-            except ClientError as exc:
-                self.logger.exception(exc, stack_info=True)
-                raise RuntimeError(f"{exc}") from exc
+                entries = [
+                    {
+                        "Destination": {"ToAddresses": self._addresses_(to)},
+                        "ReplacementEmailContent": {
+                            "ReplacementTemplate": {
+                                "ReplacementTemplateData": self._replacement_data_(
+                                    to, replacement_data
+                                )
+                            }
+                        },
+                    } for to in chunk
+                ]
+                await limiter.acquire(len(chunk))
+                try:
+                    response = await client.send_bulk_email(
+                        FromEmailAddress=self.sender_email,
+                        DefaultContent={
+                            "Template": {
+                                "TemplateName": template_name,
+                                "TemplateData": template_data,
+                            }
+                        },
+                        BulkEmailEntries=entries,
+                    )
+                    statuses = response["BulkEmailEntryResults"]
+                except ClientError as exc:
+                    self.logger.error(f"SES SendBulkEmail failed: {exc}")
+                    statuses = [
+                        {"Status": "FAILED", "Error": str(exc)} for _ in chunk
+                    ]
+            finally:
+                semaphore.release()
+            for to, status in zip(chunk, statuses):
+                if status.get("Status") != "SUCCESS":
+                    self.logger.warning(
+                        f"SES: unable to send to {self._addresses_(to)}: "
+                        f"{status.get('Status')} {status.get('Error', '')}"
+                    )
+                try:
+                    await self.__sent__(to, template_name, status, loop=loop, **kwargs)
+                except Exception as e:  # pylint: disable=W0703
+                    self.logger.exception(
+                        f'Send for recipient {to} raised an exception: {e}',
+                        stack_info=True
+                    )
+            return statuses
 
+        # recipients are pulled (lazily for iterators) as chunks complete.
+        tasks = []
+        async for chunk in self._batches_(recipient, SES_BULK_CHUNK_SIZE):
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(send_chunk(chunk)))
+        chunks = await asyncio.gather(*tasks)
+        return [status for statuses in chunks for status in statuses]
+
+    @render_scope
     async def send(
         self,
         recipient: list[Actor] = None,
@@ -176,56 +304,33 @@ class Ses(ProviderEmail):
         results = []
         async with self as provider:
             if provider.use_aws_template:
-                # Use AWS SES templates to send the email
-                recipients = [recipient.account.address for recipient in recipient]
+                # SES v2 bulk sending: one call per chunk of destinations.
                 template_name = kwargs.pop('template_name', provider.template_name)
                 template_data = kwargs.pop('template_data', {}) or {}
-                try:
-                    async with provider.session.create_client(
-                        "ses",
-                        region_name=provider.aws_region_name,
-                        aws_secret_access_key=provider.aws_secret_access_key,
-                        aws_access_key_id=provider.aws_access_key_id,
-                    ) as client:
-                        results = await client.send_templated_email(
-                            Source=provider.sender_email,
-                            Destination={
-                                'ToAddresses': recipients,
-                            },
-                            Template=template_name,
-                            TemplateData=template_data,
-                        )
-                except ClientError as e:
-                    provider.logger.exception(e, stack_info=True)
-                    raise RuntimeError(f"{e}") from e
+                results = await provider._send_bulk_(
+                    recipient,
+                    template_name,
+                    template_data,
+                    **kwargs
+                )
             else:
                 # Using basic Asyncio _send_ method
-                recipients = recipient if isinstance(recipient, list) else [recipient]
-                try:
-                    loop = asyncio.get_running_loop()
-                except RuntimeError:
-                    loop = asyncio.get_event_loop()
-                async with provider.session.create_client(
-                        "ses",
-                        region_name=provider.aws_region_name,
-                        aws_secret_access_key=provider.aws_secret_access_key,
-                        aws_access_key_id=provider.aws_access_key_id,
-                ) as client:
-                    tasks = [
+                loop = asyncio.get_running_loop()
+                client = await provider.get_client("ses")
+                async for recipients in provider._batches_(recipient):
+                    outcomes = await asyncio.gather(*[
                         provider._send_(
                             to, message, subject=subject, client=client, **kwargs
                         ) for to in recipients
-                    ]
-                    for to, future in zip(recipients, asyncio.as_completed(tasks)):
-                        result = None
-                        try:
-                            result = await future
-                            results.append(result)
-                        except Exception as e:
-                            provider.logger.exception(
-                                f'Send for recipient {to} raised an exception: {e}',
-                                stack_info=True
+                    ], return_exceptions=True)
+                    for to, result in zip(recipients, outcomes):
+                        if isinstance(result, Exception):
+                            provider.logger.error(
+                                f'Send for recipient {to} raised an exception: {result}'
                             )
+                            result = None
+                        else:
+                            results.append(result)
                         try:
                             await provider.__sent__(to, message, result, loop=loop, **kwargs)
                         except Exception as e:
@@ -254,20 +359,15 @@ class Ses(ProviderEmail):
         }
 
         try:
-            async with self.session.create_client(
-                "sesv2",  # Use the SES v2 API endpoint
-                region_name=self.aws_region_name,
-                aws_secret_access_key=self.aws_secret_access_key,
-                aws_access_key_id=self.aws_access_key_id,
-            ) as client:
-                response = await client.invoke_endpoint(
-                    "CreateEmailTemplate",
-                    Template=template
-                )
-                self.logger.debug(
-                    f"Template created successfully: {response}"
-                )
-                return response
+            client = await self.get_client("sesv2")
+            response = await client.invoke_endpoint(
+                "CreateEmailTemplate",
+                Template=template
+            )
+            self.logger.debug(
+                f"Template created successfully: {response}"
+            )
+            return response
         except ClientError as exc:
             self.logger.exception(
                 f"Error creating SES email template: {exc}"
@@ -0,0 +1,192 @@
+"""Shared provider resources.
+
+Providers keep long-lived, process-wide clients (HTTP sessions, SDK
+clients) in module-level caches, and register here the coroutine that
+releases them; the Notify worker runs :func:`shutdown_providers` when it
+stops.
+
+:func:`http_session` is the HTTP transport shared by every aiohttp-based
+provider: one ``ClientSession`` per event loop over a tuned
+``TCPConnector`` (pool and per-host limits, DNS cache, keep-alive).
+
+:class:`LoopRegistry` is the cache used for the other resources (SDK
+clients, bots, XMPP streams): entries and creation locks are bound to the
+event loop that created them.
+"""
+import asyncio
+import weakref
+from typing import Any, NamedTuple, Optional
+from collections.abc import Awaitable, Callable
+import aiohttp
+from navconfig.logging import logging
+from notify.conf import (
+    HTTP_POOL_LIMIT,
+    HTTP_LIMIT_PER_HOST,
+    HTTP_DNS_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_TIMEOUT,
+)
+
+
+_MISSING = object()
+_shutdown_hooks: list[Callable[[], Awaitable]] = []
+_http_sessions: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def on_shutdown(fn: Callable[[], Awaitable]) -> Callable[[], Awaitable]:
+    """Register *fn* (a coroutine function) to run on worker shutdown."""
+    if fn not in _shutdown_hooks:
+        _shutdown_hooks.append(fn)
+    return fn
+
+
+async def shutdown_providers() -> None:
+    """Close every shared provider resource (last registered, first closed)."""
+    for fn in reversed(_shutdown_hooks):
+        try:
+            await fn()
+        except Exception as exc:  # pylint: disable=W0703
+            logging.warning(f"Notify: error closing {fn.__qualname__}: {exc}")
+
+
+class _Entry(NamedTuple):
+    value: Any
+    loop: asyncio.AbstractEventLoop
+
+
+class LoopRegistry:
+    """LoopRegistry.
+
+    Process-wide cache of resources bound to an event loop, by key.
+
+    A value is only returned to the loop that created it; when another
+    loop asks for the key, the stale value is closed (best effort) and a
+    new one is created.  Creation is serialized per key with a lock of the
+    running loop, so concurrent first uses share one value.
+
+    Args:
+        close: coroutine function releasing a value.
+        alive: predicate telling if a cached value can still be used.
+    """
+
+    def __init__(
+        self,
+        close: Optional[Callable[[Any], Awaitable]] = None,
+        alive: Optional[Callable[[Any], bool]] = None
+    ):
+        self._close = close
+        self._alive = alive
+        self._entries: dict[Any, _Entry] = {}
+        self._locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._discarding: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lock(self, key: Any) -> asyncio.Lock:
+        """The lock of *key* in the running event loop."""
+        locks = self._locks.setdefault(asyncio.get_running_loop(), {})
+        if (lock := locks.get(key)) is None:
+            lock = locks[key] = asyncio.Lock()
+        return lock
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """The value of *key* for the running event loop."""
+        entry = self._entries.get(key)
+        if entry is None or entry.loop is not asyncio.get_running_loop():
+            return default
+        if self._alive is not None and not self._alive(entry.value):
+            return default
+        return entry.value
+
+    def setdefault(self, key: Any, factory: Callable[[], Any]) -> Any:
+        """The value of *key*, built with ``factory()`` when missing."""
+        if (value := self.get(key, _MISSING)) is not _MISSING:
+            return value
+        return self._store(key, factory())
+
+    async def acquire(self, key: Any, factory: Callable[[], Awaitable]) -> Any:
+        """The value of *key*, built with ``await factory()`` when missing."""
+        if (value := self.get(key, _MISSING)) is not _MISSING:
+            return value
+        async with self.lock(key):
+            if (value := self.get(key, _MISSING)) is not _MISSING:
+                return value
+            return self._store(key, await factory())
+
+    def _store(self, key: Any, value: Any) -> Any:
+        stale = self._entries.get(key)
+        self._entries[key] = _Entry(value, asyncio.get_running_loop())
+        if stale is not None and stale.value is not value:
+            self._release(stale)
+        return value
+
+    def _release(self, entry: _Entry) -> None:
+        """Close a replaced value, on its own loop while it is running."""
+        loop = asyncio.get_running_loop()
+        if entry.loop is not loop and not entry.loop.is_closed():
+            asyncio.run_coroutine_threadsafe(self._discard(entry.value), entry.loop)
+            return
+        task = loop.create_task(self._discard(entry.value))
+        self._discarding.add(task)
+        task.add_done_callback(self._discarding.discard)
+
+    async def _discard(self, value: Any) -> None:
+        if self._close is None:
+            return
+        try:
+            await self._close(value)
+        except Exception as exc:  # pylint: disable=W0703
+            # ie. the loop it belonged to is gone.
+            logging.debug(f"Notify: error closing {value!r}: {exc}")
+
+    async def pop(self, key: Any, value: Any = _MISSING) -> None:
+        """Close and forget the value of *key* (only if it is *value*,
+        when given: it may have been replaced already)."""
+        entry = self._entries.get(key)
+        if entry is None or (value is not _MISSING and entry.value is not value):
+            return
+        del self._entries[key]
+        await self._discard(entry.value)
+
+    async def close(self) -> None:
+        """Close the values of the running event loop, and the stale ones
+        of closed loops (best effort)."""
+        loop = asyncio.get_running_loop()
+        self._locks.pop(loop, None)
+        for key, entry in list(self._entries.items()):
+            if entry.loop is loop or entry.loop.is_closed():
+                del self._entries[key]
+                await self._discard(entry.value)
+
+
+def http_session() -> aiohttp.ClientSession:
+    """Shared ``aiohttp.ClientSession`` of the running event loop.
+
+    Don't close it: it is closed on worker shutdown.  Per-provider
+    headers and auth must be sent on every request.
+    """
+    loop = asyncio.get_running_loop()
+    session = _http_sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_LIMIT_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_TTL,
+            use_dns_cache=True,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT),
+        )
+        _http_sessions[loop] = session
+    return session
+
+
+@on_shutdown
+async def close_http_session() -> None:
+    """Close the shared HTTP session of the running event loop."""
+    loop = asyncio.get_running_loop()
+    if (session := _http_sessions.pop(loop, None)) is not None:
+        await session.close()
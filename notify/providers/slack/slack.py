@@ -3,17 +3,22 @@ Slack.
 
 Using Slack infraestructure to send messages to Slack Client.
 """
-from typing import Union, Any
+import re
+import hashlib
+from typing import Union, Any, Optional
 from collections.abc import Callable
 # Slack API
 from slack_bolt.authorization import AuthorizeResult
 # from slack_bolt.async_app import AsyncApp
 from slack_sdk.web.async_client import AsyncWebClient
+from slack_sdk.http_retry.builtin_async_handlers import AsyncRateLimitErrorRetryHandler
 from slack_sdk.errors import SlackApiError
 
 # notify
 from navconfig.logging import logging
 from notify.providers.base import ProviderIM, ProviderType
+from notify.providers.shared import LoopRegistry, http_session, on_shutdown
+from notify.providers.cache import SharedCache
 from notify.models import Actor, Channel
 from notify.exceptions import ProviderError, MessageError
 from notify.conf import (
@@ -21,9 +26,50 @@ from notify.conf import (
     SLACK_TEAM_ID,
     SLACK_BOT_TOKEN,
     SLACK_DEFAULT_CHANNEL,
+    SLACK_CHANNEL_CACHE_TTL,
+    SLACK_DM_CACHE_TTL,
+    SLACK_MAX_CONCURRENCY,
+    SLACK_MAX_RETRIES,
 )
 
 
+# conversation IDs (channels "C...", private groups "G...", DMs "D...")
+CHANNEL_ID = re.compile(r"^[CGD][A-Z0-9]{8,}$")
+
+# shared web clients, per event loop and token (the session is closed by
+# its own shutdown hook):
+_clients = LoopRegistry(alive=lambda client: not client.session.closed)
+# "<team>:<channel name>" -> channel ID, "<team>:<user ID>" -> DM channel ID
+_channel_ids = SharedCache("slack:channel", maxsize=10000, ttl=SLACK_CHANNEL_CACHE_TTL)
+_dm_channels = SharedCache("slack:dm", maxsize=10000, ttl=SLACK_DM_CACHE_TTL)
+# locks of the channel listing, per team:
+_channel_locks = LoopRegistry()
+
+
+def get_client(token: str, team_id: Optional[str] = None) -> AsyncWebClient:
+    """Shared ``AsyncWebClient`` of *token* for the running event loop,
+    over the shared HTTP session (retrying rate-limited calls)."""
+    key = (hashlib.sha256(str(token).encode()).hexdigest(), team_id)
+
+    def create() -> AsyncWebClient:
+        logger = logging.getLogger("Notify.Slack")
+        logger.setLevel(logging.INFO)
+        client = AsyncWebClient(
+            token=token, logger=logger, team_id=team_id, session=http_session()
+        )
+        client.retry_handlers.append(
+            AsyncRateLimitErrorRetryHandler(max_retry_count=SLACK_MAX_RETRIES)
+        )
+        return client
+    return _clients.setdefault(key, create)
+
+
+@on_shutdown
+async def close_clients() -> None:
+    await _clients.close()
+    await _channel_locks.close()
+
+
 async def authorize(enterprise_id, team_id, user_id, client: AsyncWebClient, logger):
     logger.info(f"{enterprise_id},{team_id},{user_id}")
     # You can implement your own logic here
@@ -37,79 +83,130 @@ class Slack(ProviderIM):
     """
     Slack.
 
-    param:: player_ids: a list of "players", recipients of push messages
-    param:: app_id: passing an APP_ID
+    Send messages to Slack channels and users (direct messages).
+
+    The web client is shared by every instance with the same token, and
+    channel names and DM channels are resolved once and cached; at most
+    ``SLACK_MAX_CONCURRENCY`` messages are in flight, and rate-limited
+    calls are retried after Slack's ``Retry-After``.
     """
     provider = "slack"
     provider_type = ProviderType.IM
     blocking: str = 'asyncio'
+    concurrency: int = SLACK_MAX_CONCURRENCY
 
     def __init__(self, *args, **kwargs):
         """
-        :param player_id: user token given by OneSignal API
-        :param app_id:
-        :param api_key:
+        :param token: bot token (default: SLACK_BOT_TOKEN)
+        :param team_id: workspace (default: SLACK_TEAM_ID)
 
         """
         self.client: Callable = None
         self.app: Callable = None
-        self.conversations: list = []
+        self.token = kwargs.pop('token', None) or SLACK_BOT_TOKEN
+        self.team_id = kwargs.pop('team_id', None) or SLACK_TEAM_ID
         super(Slack, self).__init__(*args, **kwargs)
 
     async def connect(self, **kwargs):
         try:
             # self.app = AsyncApp(signing_secret=SLACK_SIGNING_SECRET, authorize=authorize)
-            logger = logging.getLogger(__name__)
-            logger.setLevel(logging.INFO)
-            self.client = AsyncWebClient(
-                token=SLACK_BOT_TOKEN, logger=logger, team_id=SLACK_TEAM_ID
-            )
-            self.conversations = await self.client.conversations_list(
-                limit=10, team_id=SLACK_TEAM_ID
-            )
+            self.client = get_client(self.token, self.team_id)
         except Exception as err:
-            self._logger.error(err)
+            self.logger.error(err)
             raise ProviderError(
                 f"Error connecting to Slack API {err}"
             ) from err
 
     async def close(self):
+        # the client is shared: released on worker shutdown.
         self.client = None
         self.app = None
 
+    async def resolve_channel(self, channel: str) -> str:
+        """Return the ID of a channel given by name (``general``,
+        ``#general``) or ID.
+
+        Names are looked up in a cache filled by paging through
+        ``conversations.list`` (at most once per SLACK_CHANNEL_CACHE_TTL);
+        when the channels can't be listed (ie. ``missing_scope``) the
+        message is posted by name.
+        """
+        if not channel or CHANNEL_ID.match(channel):
+            return channel
+        name = channel.lstrip("#")
+        key = f"{self.team_id}:{name}"
+        if channel_id := await _channel_ids.get(key):
+            return channel_id
+        async with _channel_locks.lock(str(self.team_id)):
+            if not (channel_id := await _channel_ids.get(key)):
+                try:
+                    await self._load_channels_()
+                except SlackApiError as exc:
+                    self.logger.warning(
+                        f"Slack: cannot list channels, posting to {name!r} by name: {exc}"
+                    )
+                if not (channel_id := await _channel_ids.get(key)):
+                    # unknown (ie. not visible to the bot): let Slack decide,
+                    # without listing the channels again for every message.
+                    channel_id = name
+                    await _channel_ids.set(key, channel_id)
+        return channel_id
+
+    async def _load_channels_(self) -> None:
+        cursor = None
+        while True:
+            response = await self.client.conversations_list(
+                types="public_channel,private_channel",
+                exclude_archived=True,
+                limit=1000,
+                cursor=cursor,
+                team_id=self.team_id
+            )
+            for channel in response.get("channels", []):
+                await _channel_ids.set(f"{self.team_id}:{channel['name']}", channel["id"])
+            cursor = (response.get("response_metadata") or {}).get("next_cursor")
+            if not cursor:
+                break
+
+    async def open_dm(self, user_id: str) -> str:
+        """Return the DM channel with *user_id* (``conversations.open``, cached)."""
+        key = f"{self.team_id}:{user_id}"
+        if channel_id := await _dm_channels.get(key):
+            return channel_id
+        response = await self.client.conversations_open(users=user_id)
+        channel_id = response["channel"]["id"]
+        await _dm_channels.set(key, channel_id)
+        return channel_id
+
+    @staticmethod
+    def _slack_user_(to: Actor) -> Optional[str]:
+        try:
+            # getting User ID for Slack Account:
+            return to.account.userid if to.account.provider == "slack" else None
+        except (TypeError, AttributeError, KeyError):
+            return None
+
     async def _send_(self, to: Actor, message: Union[str, Any], **kwargs) -> Any:
         """_send_.
-        Send push notification through OneSignal API.
+        Send a message to a channel (Channel recipients, or the ``channel``
+        argument) or as a direct message to the Slack user of an Actor.
         """
-        if isinstance(to, Channel):
-            # send directly to a channel:
-            channel = to.channel_id
-        else:
-            print("AQUI ", to, to.account)
-            try:
-                # getting User ID for Slack Account:
-                channel = to.account.userid if to.account.provider == "slack" else None
-            except (TypeError, AttributeError, KeyError) as e:
-                print("ERR ", e)
-                channel = None
-            try:
-                channel = kwargs["channel"]
-            except KeyError:
-                channel = SLACK_DEFAULT_CHANNEL
+        if self.client is None:
+            await self.connect()
         msg = await self._render_(to, message, **kwargs)
-        notification_body = {"channel": channel, "text": msg}
         try:
+            if isinstance(to, Channel):
+                # send directly to a channel:
+                channel = await self.resolve_channel(to.channel_id)
+            elif kwargs.get("channel"):
+                channel = await self.resolve_channel(kwargs["channel"])
+            elif userid := self._slack_user_(to):
+                channel = await self.open_dm(userid)
+            else:
+                channel = await self.resolve_channel(SLACK_DEFAULT_CHANNEL)
+            notification_body = {"channel": channel, "text": msg}
             # Sends it!
-            response = await self.client.chat_postMessage(**notification_body)
-            return response
-            # if response.status_code == 200:
-            #     print(response.body) # JSON parsed response
-            #     return response
-            # else:
-            #     raise MessageError(
-            #         f"Slack: Error sending Notification: {response.http_response}",
-            #         payload=response
-            #     )
+            return await self.client.chat_postMessage(**notification_body)
         except (
             SlackApiError
         ) as ex:  # An exception is raised if response.status_code != 2xx
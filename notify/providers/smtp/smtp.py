@@ -1,4 +1,5 @@
 ## for abstract email provider:
+import os
 import ssl
 from collections.abc import Callable
 import smtplib
@@ -12,6 +13,7 @@ from notify.conf import (
     EMAIL_SMTP_PASSWORD,
     EMAIL_SMTP_HOST,
     EMAIL_SMTP_PORT,
+    EMAIL_ATTACHMENT_STREAM_SIZE,
 )
 
 
@@ -159,6 +161,7 @@ class SMTP(ProviderBase):
         Returns:
             A :class:`email.mime.multipart.MIMEMultipart` ready for transport.
         """
+        message = self._personalize_(message, to)
         sender = getattr(self, "actor", None) or self.username
         recipient = (
             to.account.address if not isinstance(to, list)
@@ -178,15 +181,15 @@ class SMTP(ProviderBase):
         if message:
             _mu.attach_text_part(msg, message, "plain")
 
-        if self._template:
-            self._templateargs = {
+        if template := self._template:
+            templateargs = {
                 "recipient": to,
                 "username": to,
                 "message": message,
                 "content": message,
                 **kwargs,
             }
-            content = self._template.render(**self._templateargs)
+            content = template.render(**templateargs)
         else:
             content = message
         _mu.attach_text_part(msg, content or "", "html")
@@ -199,6 +202,9 @@ class SMTP(ProviderBase):
         The historically misspelled default ``"octect-stream"`` is treated as
         unknown and resolved via ``mimetypes.guess_type``.
 
+        Files of ``EMAIL_ATTACHMENT_STREAM_SIZE`` bytes or more are encoded
+        from disk while sending (see :meth:`_send_streaming_`).
+
         Args:
             message: The :class:`email.mime.multipart.MIMEMultipart` envelope.
             filename: Filesystem path to the file to attach.
@@ -210,7 +216,39 @@ class SMTP(ProviderBase):
             if mimetype in ("octect-stream", "application/octet-stream")
             else mimetype
         )
-        _mu.attach_file(message, filename, resolved)
+        stream = os.path.getsize(filename) >= EMAIL_ATTACHMENT_STREAM_SIZE
+        _mu.attach_file(message, filename, resolved, stream=stream)
+
+    def _send_streaming_(self, msg):
+        """Send *msg* writing its streamed attachments chunk by chunk.
+
+        Drives ``MAIL``/``RCPT``/``DATA`` through the public ``smtplib``
+        primitives, since ``send_message`` flattens the whole message.
+        """
+        sender, recipients = _mu.envelope_addresses(msg)
+        code, resp = self._server.mail(sender)
+        if code != 250:
+            self._server.rset()
+            raise smtplib.SMTPSenderRefused(code, resp, sender)
+        errors = {}
+        for rcpt in recipients:
+            code, resp = self._server.rcpt(rcpt)
+            if code not in (250, 251):
+                errors[rcpt] = (code, resp)
+        if len(errors) == len(recipients):
+            self._server.rset()
+            raise smtplib.SMTPRecipientsRefused(errors)
+        self._server.putcmd("data")
+        code, resp = self._server.getreply()
+        if code != 354:
+            raise smtplib.SMTPDataError(code, resp)
+        for chunk in _mu.iter_message_bytes(msg):
+            self._server.send(chunk)
+        self._server.send(b".\r\n")
+        code, resp = self._server.getreply()
+        if code != 250:
+            raise smtplib.SMTPDataError(code, resp)
+        return errors
 
     def _send_(
         self, to: Actor, message: str, subject: str, **kwargs
@@ -226,7 +264,10 @@ class SMTP(ProviderBase):
                 self.add_attachment(message=msg, filename=attach)
         try:
             try:
-                response = self._server.send_message(msg)
+                if _mu.has_streaming_parts(msg):
+                    response = self._send_streaming_(msg)
+                else:
+                    response = self._server.send_message(msg)
                 if self._debug is True:
                     self.logger.debug(response)
             except smtplib.SMTPServerDisconnected as err:
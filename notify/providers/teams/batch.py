@@ -0,0 +1,181 @@
+"""Graph JSON batching.
+
+:class:`GraphBatcher` coalesces the Graph requests submitted within a
+short window (``MS_TEAMS_BATCH_WINDOW`` ms, or as soon as 20 requests are
+waiting) into one ``$batch`` call, and resolves every submitter with its
+own response.
+
+Sub-requests throttled by Graph (status 429) are submitted again after
+their ``Retry-After`` delay, up to ``MS_TEAMS_BATCH_RETRIES`` times.
+"""
+import asyncio
+from typing import Any, Optional
+from navconfig.logging import logging
+from ...providers.shared import http_session
+from ...exceptions import MessageError
+from ...conf import (
+    MS_TEAMS_BATCH_WINDOW,
+    MS_TEAMS_BATCH_RETRIES,
+)
+
+
+GRAPH_BATCH_URL = "https://graph.microsoft.com/v1.0/$batch"
+# requests accepted by the Graph $batch endpoint in one call
+MAX_BATCH_SIZE = 20
+
+
+class _BatchItem:
+    __slots__ = ("request", "future", "retries")
+
+    def __init__(self, request: dict, future: asyncio.Future):
+        self.request = request
+        self.future = future
+        self.retries = 0
+
+
+def _retry_after(headers: Optional[dict], default: float = 1.0) -> float:
+    for name, value in (headers or {}).items():
+        if name.lower() == "retry-after":
+            try:
+                return float(value)
+            except ValueError:
+                break
+    return default
+
+
+class GraphBatcher:
+    """GraphBatcher.
+
+    Args:
+        credential: async azure credential (``get_token``) used to
+            authenticate the ``$batch`` calls.
+        window: seconds a request waits for others to join its batch.
+        size: max. requests per batch (20 for Graph).
+        retries: times a throttled (429) request is submitted again.
+    """
+
+    def __init__(
+        self,
+        credential: Any,
+        window: float = MS_TEAMS_BATCH_WINDOW / 1000,
+        size: int = MAX_BATCH_SIZE,
+        retries: int = MS_TEAMS_BATCH_RETRIES
+    ):
+        self.credential = credential
+        self.window = window
+        self.size = min(size, MAX_BATCH_SIZE)
+        self.retries = retries
+        self.batches: int = 0
+        self._pending: list[_BatchItem] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        self.logger = logging.getLogger("Notify.Teams.Batch")
+
+    def submit(self, method: str, url: str, body: Any = None) -> asyncio.Future:
+        """Queue a request (*url* relative to the Graph version root).
+
+        Returns:
+            Future resolved with the response body of the request.
+        """
+        request = {"method": method, "url": url}
+        if body is not None:
+            request["headers"] = {"Content-Type": "application/json"}
+            request["body"] = body
+        future = asyncio.get_running_loop().create_future()
+        self._enqueue(_BatchItem(request, future))
+        return future
+
+    def _enqueue(self, item: _BatchItem) -> None:
+        self._pending.append(item)
+        if len(self._pending) >= self.size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.window, self._flush
+            )
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            items, self._pending = self._pending[:self.size], self._pending[self.size:]
+            task = loop.create_task(self._send(items))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _retry(self, item: _BatchItem, delay: float) -> bool:
+        if item.retries >= self.retries:
+            return False
+        item.retries += 1
+        asyncio.get_running_loop().call_later(delay, self._enqueue, item)
+        return True
+
+    @staticmethod
+    def _fail(item: _BatchItem, exc: Exception) -> None:
+        if not item.future.done():
+            item.future.set_exception(exc)
+
+    async def _send(self, items: list[_BatchItem]) -> None:
+        items = [item for item in items if not item.future.done()]
+        if not items:
+            return
+        payload = {
+            "requests": [
+                {"id": str(idx), **item.request} for idx, item in enumerate(items)
+            ]
+        }
+        try:
+            token = await self.credential.get_token()
+            self.batches += 1
+            async with http_session().post(
+                GRAPH_BATCH_URL,
+                json=payload,
+                headers={"Authorization": f"Bearer {token.token}"}
+            ) as response:
+                if response.status == 429:
+                    delay = _retry_after(response.headers)
+                    for item in items:
+                        if not self._retry(item, delay):
+                            self._fail(item, MessageError(
+                                "Teams: Graph throttled the request (429)", code=429
+                            ))
+                    return
+                result = await response.json(content_type=None)
+                if response.status >= 400:
+                    raise MessageError(
+                        f"Teams: Graph $batch error {response.status}: {result}",
+                        code=response.status
+                    )
+        except Exception as exc:  # pylint: disable=W0703
+            for item in items:
+                self._fail(item, exc)
+            return
+        answered = set()
+        for resp in result.get("responses", []):
+            try:
+                item = items[int(resp["id"])]
+            except (KeyError, ValueError, IndexError):
+                continue
+            answered.add(id(item))
+            status = resp.get("status", 500)
+            if item.future.done():
+                continue
+            if status == 429 and self._retry(item, _retry_after(resp.get("headers"))):
+                self.logger.debug(f"Graph throttled {item.request['url']}, retrying")
+                continue
+            if status >= 400:
+                error = (resp.get("body") or {}).get("error", {})
+                self._fail(item, MessageError(
+                    f"Teams: Graph error {status} on {item.request['url']}: "
+                    f"{error.get('code')}: {error.get('message')}",
+                    code=status
+                ))
+            else:
+                item.future.set_result(resp.get("body"))
+        for item in items:
+            if id(item) not in answered:
+                self._fail(item, MessageError(
+                    f"Teams: no $batch response for {item.request['url']}"
+                ))
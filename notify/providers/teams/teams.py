@@ -2,12 +2,13 @@ from typing import Dict, List, Optional, Union, Any
 import json
 import uuid
 import base64
-import aiohttp
+import asyncio
+import weakref
+from functools import partial
+from collections.abc import Awaitable, Callable
 import msal
-from azure.identity.aio import (
-    ClientSecretCredential
-)
-from azure.identity import UsernamePasswordCredential
+from azure.core.credentials import AccessToken
+from azure.core.credentials_async import AsyncTokenCredential
 from msgraph import GraphServiceClient
 from ._msgraph_patch import patch_graph_host_os_header
 from msgraph.generated.models.chat import Chat
@@ -30,6 +31,11 @@ from ...models import (
     TeamsCard
 )
 from ...providers.base import ProviderIM, ProviderType
+from ...providers.shared import http_session
+from ...providers.blocking import blocking_call
+from ...providers.tokens import get_token_cache, token_key
+from ...providers.cache import SharedCache
+from .batch import GraphBatcher
 from ...exceptions import NotifyException, MessageError
 from ...conf import (
     # MS Teams information:
@@ -39,6 +45,9 @@ from ...conf import (
     MS_TEAMS_DEFAULT_TEAMS_ID,
     MS_TEAMS_DEFAULT_CHANNEL_ID,
     MS_TEAMS_DEFAULT_WEBHOOK,
+    MS_TEAMS_CACHE_SIZE,
+    MS_TEAMS_CACHE_TTL,
+    MS_TEAMS_BATCH,
     O365_USER,
     O365_PASSWORD
 )
@@ -56,19 +65,68 @@ logging.getLogger('aiohttp').setLevel(logging.INFO)
 # versions don't trigger h11 "Illegal header value" on Graph API requests.
 patch_graph_host_os_header()
 
+# resolved IDs, shared by every Teams instance (and worker, with Redis):
+# "<tenant>:<email>" -> user id, "<tenant>:<chat type>:<member ids>" -> chat id
+_user_ids = SharedCache("teams:user", maxsize=MS_TEAMS_CACHE_SIZE, ttl=MS_TEAMS_CACHE_TTL)
+_chat_ids = SharedCache("teams:chat", maxsize=MS_TEAMS_CACHE_SIZE, ttl=MS_TEAMS_CACHE_TTL)
+# Graph $batch coalescers, per event loop and token:
+_batchers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+class CachedTokenCredential(AsyncTokenCredential):
+    """CachedTokenCredential.
+
+    Azure credential for the Graph client that serves the tokens of the
+    shared token cache, so every Teams instance (and worker) reuses the
+    same MS Graph token.
+    """
+
+    def __init__(self, key: str, fetch: Callable[[], Awaitable[dict]]):
+        self.key = key
+        self.fetch = fetch
+
+    async def token(self) -> dict:
+        return await get_token_cache().get(self.key, self.fetch)
+
+    async def get_token(self, *scopes, **kwargs) -> AccessToken:
+        result = await self.token()
+        try:
+            return AccessToken(result["access_token"], int(result["expires_at"]))
+        except KeyError as exc:
+            raise NotifyException(
+                f"{result.get('error')}: {result.get('error_description')}"
+            ) from exc
+
+    async def close(self) -> None:
+        # the Graph client closes its credential after every request.
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
 
 class Teams(ProviderIM):
     """
     Teams.
 
     Send messages to a channel using Teams.
+
+    With ``batch=True`` (default: ``MS_TEAMS_BATCH``) the chat and
+    channel posts of all the Teams instances are coalesced into Graph
+    ``$batch`` calls (see :class:`GraphBatcher`); posts then return the
+    Graph response (dict) instead of a ``ChatMessage``.
     """
     provider = "teams"
     provider_type = ProviderType.IM
     blocking: str = 'asyncio'
+    lite_recipients: bool = False
 
     def __init__(self, *args, **kwargs):
         self.as_user: bool = kwargs.pop('as_user', False)
+        self.use_batch: bool = kwargs.pop('batch', MS_TEAMS_BATCH)
         self._client_id = kwargs.pop('client_id', MS_TEAMS_CLIENT_ID)
         self._client_secret = kwargs.pop('client_secret', MS_TEAMS_CLIENT_SECRET)
         self._tenant_id = kwargs.pop('tenant_id', MS_TEAMS_TENANT_ID)
@@ -90,38 +148,43 @@ class Teams(ProviderIM):
             scopes = self.scopes
         return GraphServiceClient(credentials=client, scopes=scopes)
 
-    async def connect(self, *args, **kwargs):
-        # getting MS graph access token:
-        scopes = ["https://graph.microsoft.com/.default"]
-        authority = f"https://login.microsoftonline.com/{self._tenant_id}"
+    @blocking_call
+    def _acquire_token_(self, scopes: list, authority: str) -> dict:
         if self.as_user is True:
             self.app = msal.PublicClientApplication(
                 self._client_id, authority=authority
             )
             # Acquire token using ROPC
-            result = self.app.acquire_token_by_username_password(
+            return self.app.acquire_token_by_username_password(
                 scopes=scopes,
                 **self.credentials
             )
-            self._client = UsernamePasswordCredential(
-                tenant_id=self._tenant_id,
-                client_id=self._client_id,
-                **self.credentials
-            )
-        else:
-            self.app = msal.ConfidentialClientApplication(
+        self.app = msal.ConfidentialClientApplication(
+            self._client_id,
+            authority=authority,
+            client_credential=self._client_secret
+        )
+        return self.app.acquire_token_for_client(
+            scopes=scopes
+        )
+
+    async def connect(self, *args, **kwargs):
+        # getting MS graph access token:
+        scopes = ["https://graph.microsoft.com/.default"]
+        authority = f"https://login.microsoftonline.com/{self._tenant_id}"
+        # tokens are shared by every instance (msal requests run on the
+        # blocking executor, only when the cached token is about to expire):
+        self._client = CachedTokenCredential(
+            token_key(
+                "msgraph",
+                self._tenant_id,
                 self._client_id,
-                authority=authority,
-                client_credential=self._client_secret
-            )
-            result = self.app.acquire_token_for_client(
-                scopes=scopes
-            )
-            self._client = ClientSecretCredential(
-                tenant_id=self._tenant_id,
-                client_id=self._client_id,
-                client_secret=self._client_secret
-            )
+                scopes,
+                subject=self.credentials.get("username")
+            ),
+            partial(self._acquire_token_, scopes, authority)
+        )
+        result = await self._client.token()
         try:
             self._token = result["access_token"]
             self._authentication = result
@@ -151,15 +214,17 @@ class Teams(ProviderIM):
 
         Returns the parseable version of Message template.
         """
+        message = self._personalize_(message, to)
         if isinstance(message, TeamsCard):
+            # cards are serialized once (memoized on the card), not per recipient
             if _type == 'card':
-                # converting message to a dictionary
-                payload = message.to_dict()
+                # MessageCard, as bytes ready for the webhook
+                payload = message.to_bytes('message')
             else:
                 card = {
                     "id": str(message.card_id),
                     "contentType": message.content_type,
-                    "content": json.dumps(message.to_adaptative())
+                    "content": message.to_json('adaptive')
                 }
                 payload = {
                     "body": {
@@ -289,17 +354,27 @@ class Teams(ProviderIM):
                 'Content-Type': 'application/json'
             }
             message_url = f'https://graph.microsoft.com/v1.0/teams/{team_id}/channels/{channel_id}/messages'
-            async with aiohttp.ClientSession() as session:
-                async with session.post(message_url, headers=headers, json=message) as response:
-                    if response.status not in [200, 201]:
-                        raise MessageError(
-                            f"Teams: Error sending Notification: {await response.text()}"
-                        )
-                    return await response.json()
-        else:
-            body = message.get("body", {})
-            attachments_list = message.get("attachments", [])
-        request_body = ChatMessage(
+            async with http_session().post(
+                message_url, headers=headers, json=message
+            ) as response:
+                if response.status not in [200, 201]:
+                    raise MessageError(
+                        f"Teams: Error sending Notification: {await response.text()}"
+                    )
+                return await response.json()
+        # Send the message to Channel
+        self.logger.debug(f"Teams: posting to channel {channel_id} of team {team_id}")
+        return await self._post_message_(
+            f"/teams/{team_id}/channels/{channel_id}/messages",
+            message,
+            self._graph.teams.by_team_id(team_id).channels.by_channel_id(channel_id).messages
+        )
+
+    @staticmethod
+    def _chat_message_(payload: Dict[str, Any]) -> ChatMessage:
+        """Graph SDK model of a message payload (Graph JSON)."""
+        body = payload.get("body", {})
+        return ChatMessage(
             subject=None,
             body=ItemBody(
                 content_type=BodyType.Html,
@@ -314,58 +389,76 @@ class Teams(ProviderIM):
                     name=None,
                     thumbnail_url=None,
                 )
-                for att in attachments_list
+                for att in payload.get("attachments", [])
             ]
         )
-        # Send the message to Channel
-        print('TEAM > ', team_id)
-        print('Channel > ', channel_id)
-        return await self._graph.teams.by_team_id(
-            team_id
-        ).channels.by_channel_id(channel_id).messages.post(request_body)
-
-    async def send_webhook(self, webhook_url: str, message: str):
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                webhook_url,
-                data=json.dumps(message),
-                headers={"Content-Type": "application/json"}
-            ) as response:
-                if response.status != 200:
-                    raise MessageError(
-                        f"Teams: Error sending Notification: {await response.text()}"
-                    )
-                return await response.text()
 
-    async def send_message_to_chat(self, chat_id: str, message: Dict[str, Any]):
+    def _batcher_(self) -> GraphBatcher:
+        batchers = _batchers.setdefault(asyncio.get_running_loop(), {})
+        if (batcher := batchers.get(self._client.key)) is None:
+            batcher = batchers[self._client.key] = GraphBatcher(self._client)
+        return batcher
+
+    async def _post_message_(self, path: str, payload: Dict[str, Any], builder: Any):
+        """Post a message payload (Graph JSON) to *path*, using the
+        ``$batch`` coalescer or the request *builder* of the Graph SDK."""
+        if self.use_batch:
+            return await self._batcher_().submit("POST", path, {
+                "body": {"contentType": "html", **payload.get("body", {})},
+                "attachments": [
+                    {
+                        "id": att.get("id"),
+                        "contentType": att.get("contentType", "application/vnd.microsoft.card.adaptive"),
+                        "content": att.get("content", ""),
+                    }
+                    for att in payload.get("attachments", [])
+                ]
+            })
+        return await builder.post(self._chat_message_(payload))
+
+    async def send_webhook(self, webhook_url: str, message: Union[bytes, str, dict]):
+        if not isinstance(message, (bytes, str)):
+            message = json.dumps(message)
+        async with http_session().post(
+            webhook_url,
+            data=message,
+            headers={"Content-Type": "application/json"}
+        ) as response:
+            if response.status != 200:
+                raise MessageError(
+                    f"Teams: Error sending Notification: {await response.text()}"
+                )
+            return await response.text()
+
+    async def send_message_to_chat(self, chat_id: str, message: Union[Dict[str, Any], str, TeamsCard]):
         """
         Generic method: send a message to an existing chat (group or one-on-one).
         """
         async def _post_attachment_card(
-            card_payload: Dict[str, Any],
+            card_payload: Union[Dict[str, Any], str],
             content_type: str,
         ):
             attachment_id = str(uuid.uuid4())
-            request_body = ChatMessage(
-                subject=None,
-                body=ItemBody(
-                    content_type=BodyType.Html,
-                    content=f'<attachment id="{attachment_id}"></attachment>'
-                ),
-                attachments=[
-                    ChatMessageAttachment(
-                        id=attachment_id,
-                        content_type=content_type,
-                        content=json.dumps(card_payload),
-                        content_url=None,
-                        name=None,
-                        thumbnail_url=None,
-                    )
-                ]
+            return await self._post_message_(
+                f"/chats/{chat_id}/messages",
+                {
+                    "body": {"content": f'<attachment id="{attachment_id}"></attachment>'},
+                    "attachments": [{
+                        "id": attachment_id,
+                        "contentType": content_type,
+                        # already serialized cards are sent as they are
+                        "content": card_payload if isinstance(card_payload, str) else json.dumps(card_payload),
+                    }]
+                },
+                self._graph.chats.by_chat_id(chat_id).messages
             )
-            return await self._graph.chats.by_chat_id(chat_id).messages.post(request_body)
 
         message_payload: Optional[Dict[str, Any]] = None
+        if isinstance(message, TeamsCard):
+            return await _post_attachment_card(
+                message.to_json('adaptive'),
+                "application/vnd.microsoft.card.adaptive"
+            )
         if isinstance(message, str):
             parsed_message: Optional[Dict[str, Any]] = None
             try:
@@ -376,13 +469,13 @@ class Teams(ProviderIM):
             if isinstance(parsed_message, dict):
                 if parsed_message.get("type") == "AdaptiveCard":
                     return await _post_attachment_card(
-                        parsed_message,
+                        message,
                         "application/vnd.microsoft.card.adaptive"
                     )
 
                 if parsed_message.get("@type") == "MessageCard":
                     return await _post_attachment_card(
-                        parsed_message,
+                        message,
                         "application/vnd.microsoft.teams.card.o365connector"
                     )
 
@@ -429,43 +522,61 @@ class Teams(ProviderIM):
             )
             return
 
-        attachments_list = message_payload.get("attachments", []) if message_payload else []
-        request_body = ChatMessage(
-            subject=None,
-            body=ItemBody(
-                content_type=BodyType.Html,
-                content=body.get('content')
-            ),
-            attachments=[
-                ChatMessageAttachment(
-                    id=att.get("id"),
-                    content_type=att.get("contentType", "application/vnd.microsoft.card.adaptive"),
-                    content=att.get('content', ''),
-                    content_url=None,
-                    name=None,
-                    thumbnail_url=None,
-                )
-                for att in attachments_list
-            ]
+        return await self._post_message_(
+            f"/chats/{chat_id}/messages",
+            message_payload,
+            self._graph.chats.by_chat_id(chat_id).messages
         )
-        return await self._graph.chats.by_chat_id(chat_id).messages.post(request_body)
 
     async def send_direct_message(self, recipient: Actor, message: Dict[str, Any]):
         """
         Send a direct (1:1) message to a user identified by email address.
 
-        1) We get the user object (to retrieve user ID).
-        2) We create a new chat or reuse an existing one (this sample always creates new).
+        1) We resolve the user ID (cached).
+        2) We find an existing chat or create a new one (cached).
         3) Post the message to /chats/{chatId}/messages.
         """
-        user = await self.get_teams_user(recipient.account.address)
-        user_id = user.id
-
-        # 2) Create new chat (or find existing)
-        chat_id = await self._get_chat(user_id) or await self._create_chat(self._owner_id, user_id)
+        user_id = await self.resolve_user_id(recipient.account.address)
+        key = self._chat_key('oneOnOne', [self._owner_id, user_id])
+        if not (chat_id := await _chat_ids.get(key)):
+            chat_id = await self._get_chat(user_id) or await self._create_chat(self._owner_id, user_id)
+            await _chat_ids.set(key, chat_id)
+        return await self._post_to_chat(key, chat_id, message)
+
+    def _chat_key(self, chat_type: str, member_ids: list) -> str:
+        members = ",".join(sorted({m for m in member_ids if m}))
+        return f"{self._tenant_id}:{chat_type}:{members}"
+
+    async def _post_to_chat(self, key: str, chat_id: str, message: Dict[str, Any]):
+        try:
+            return await self.send_message_to_chat(chat_id, message)
+        except Exception as exc:
+            # Graph SDK errors carry the status as response_status_code,
+            # $batch errors (MessageError) as their code.
+            status = getattr(exc, "response_status_code", None)
+            if status is None and isinstance(exc, MessageError):
+                status = exc.code
+            if status == 404:
+                # the chat is gone: resolve it again next time.
+                await _chat_ids.delete(key)
+            raise
+
+    async def resolve_user_id(self, email: str) -> str:
+        """Return the Graph user ID of *email* (cached).
 
-        # 4) Send the message to chat
-        return await self.send_message_to_chat(chat_id, message)
+        Raises:
+            NotifyException: when the user cannot be found.
+        """
+        key = f"{self._tenant_id}:{email.lower()}"
+        if user_id := await _user_ids.get(key):
+            return user_id
+        user = await self.get_teams_user(email)
+        if user is None:
+            raise NotifyException(
+                f"Teams: unable to find an user for {email}"
+            )
+        await _user_ids.set(key, user.id)
+        return user.id
 
     async def _create_chat(self, owner, user_id: str) -> str:
         """
@@ -544,14 +655,17 @@ class Teams(ProviderIM):
         if not chats.value:
             return None
 
+        found = None
         for chat in chats.value:
             if not chat.members:
                 continue
             member_ids = [m.user_id for m in chat.members]
+            # remember every listed chat: next DMs skip this listing.
+            _chat_ids.local.set(self._chat_key('oneOnOne', member_ids), chat.id)
             # If the target user is in there, that is our existing chat
-            if user_id in member_ids:
-                return chat.id
-        return None
+            if found is None and user_id in member_ids:
+                found = chat.id
+        return found
 
     async def _get_group_chat(
         self,
@@ -633,15 +747,18 @@ class Teams(ProviderIM):
                 "send_group_direct_message requires as_user=True so _owner_id is set."
             )
 
-        # Resolve the user ids for all recipients
-        user_ids: list[str] = []
-        for recipient in recipients:
-            user = await self.get_teams_user(recipient.account.address)
-            user_ids.append(user.id)
+        # Resolve the user ids for all recipients (concurrently)
+        emails = list(dict.fromkeys(r.account.address for r in recipients))
+        user_ids = await asyncio.gather(
+            *[self.resolve_user_id(email) for email in emails]
+        )
 
         # Todos los miembros = owner + usuarios
-        member_ids = [self._owner_id, *user_ids]
+        member_ids = list(dict.fromkeys([self._owner_id, *user_ids]))
         # Buscar chat existente o crear nuevo
-        chat_id = await self._get_group_chat(member_ids) or await self._create_group_chat(member_ids, topic=topic)
+        key = self._chat_key('group', member_ids)
+        if not (chat_id := await _chat_ids.get(key)):
+            chat_id = await self._get_group_chat(member_ids) or await self._create_group_chat(member_ids, topic=topic)
+            await _chat_ids.set(key, chat_id)
         # Enviar mensaje usando tu lógica actual
-        return await self.send_message_to_chat(chat_id, message)
+        return await self._post_to_chat(key, chat_id, message)
@@ -1,11 +1,9 @@
+import asyncio
 from typing import Union, Any
 from io import BytesIO
 from pathlib import Path, PurePath
 import emoji
 # telegram
-from aiogram.client.session.aiohttp import AiohttpSession
-from aiogram import Bot, Dispatcher
-from aiogram.client.default import DefaultBotProperties
 # from aiogram.dispatcher.webhook import SendMessage
 # Files
 from aiogram.types import FSInputFile, BufferedInputFile, URLInputFile
@@ -15,8 +13,8 @@ from aiogram.exceptions import (
     TelegramUnauthorizedError,
     TelegramNetworkError,
     TelegramNotFound,
+    TelegramRetryAfter,
 )
-from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.enums import ParseMode
 # from aiogram.utils.emoji import emojize
 # from aiogram.utils.markdown import bold, code, italic, text
@@ -26,10 +24,15 @@ from navconfig.logging import logging
 from notify.models import Actor, Chat
 from notify.exceptions import NotifyException
 from notify.providers.base import ProviderIM, ProviderType
+from .bots import get_bot, drop_bot
+from . import media as media_cache
+from .transcode import get_transcoder
+from .pacing import get_pacer
 
 from notify.conf import (
     TELEGRAM_BOT_TOKEN,
-    TELEGRAM_CHAT_ID
+    TELEGRAM_CHAT_ID,
+    TELEGRAM_MAX_RETRIES,
 )
 
 aiogram_logger = logging.getLogger("aiogram")
@@ -49,7 +52,6 @@ class Telegram(ProviderIM):
         except KeyError:
             self.parseMode = "html"
         self._bot = None
-        self._dispatcher = None
         self._info = None
         self._bot_token = None
         self._chat_id: str = None
@@ -69,32 +71,14 @@ class Telegram(ProviderIM):
         return self._bot
 
     async def close(self):
-        try:
-            if self._bot:
-                await self._bot.session.close()  # Close the bot's session
-            await self._dispatcher.stop()
-        except Exception:
-            pass
-        finally:
-            self._bot = None
-            self._connected = False
+        # the bot (and its session) is shared: closed on worker shutdown.
+        self._bot = None
+        self._connected = False
 
     async def connect(self, *args, **kwargs):
-        # creation of bot
+        # shared bot of this token (created, and get_me() called, once):
         try:
-            self._session = AiohttpSession()
-            bot_settings = {
-                "session": self._session,
-                "default": DefaultBotProperties(
-                    parse_mode=ParseMode.HTML,
-                    disable_notification=True,
-                    allow_sending_without_reply=True
-                )
-            }
-            self._bot = Bot(token=self._bot_token, **bot_settings)
-            storage = MemoryStorage()
-            self._dispatcher = Dispatcher(storage=storage)
-            self._info = await self._bot.get_me()
+            self._bot, self._info = await get_bot(self._bot_token)
             self.logger.debug(
                 f"🤖 Hello, I'm {self._info.first_name}.\nHave a nice Day!"
             )
@@ -155,14 +139,17 @@ class Telegram(ProviderIM):
             else:
                 chat_id = self._chat_id
         try:
-            args = {"chat_id": chat_id, "text": msg, "parse_mode": mode, **kwargs}
-            print(args)
-            response = await self._bot.send_message(**args)
+            kwargs.pop("chat_id", None)
+            args = {"text": msg, "parse_mode": mode, **kwargs}
+            response = await self._call_(self._bot.send_message, chat_id, **args)
             # TODO: make the processing of response
             return response
+        except NotifyException:
+            raise
         except TelegramUnauthorizedError as err:
-            # remove update.message.chat_id from conversation list
-            print(err)
+            # the token was revoked: don't keep the shared bot.
+            await drop_bot(self._bot_token)
+            self.logger.error(f"Telegram: bot token was revoked: {err}")
         except TelegramNotFound as err:
             # the chat_id of a group has changed, use e.new_chat_id instead
             print(err)
@@ -181,6 +168,61 @@ class Telegram(ProviderIM):
                 f"{err}"
             ) from err
 
+    async def _call_(self, method, chat_id: Any, *args, **kwargs):
+        """Call a bot *method* for *chat_id* within the Telegram rate limits,
+        waiting and retrying when Telegram asks for it (``retry_after``).
+
+        Raises:
+            NotifyException: still flood-controlled after the retries.
+        """
+        pacer = get_pacer(self._bot_token)
+        for attempt in range(TELEGRAM_MAX_RETRIES + 1):
+            await pacer.acquire(chat_id)
+            try:
+                return await method(chat_id, *args, **kwargs)
+            except TelegramRetryAfter as err:
+                if attempt >= TELEGRAM_MAX_RETRIES:
+                    raise NotifyException(
+                        f"Telegram: flood control on {chat_id}, retry after {err.retry_after}s"
+                    ) from err
+                self.logger.warning(
+                    f"Telegram: flood control on {chat_id}, retry in {err.retry_after}s"
+                )
+                pacer.retry_after(chat_id, err.retry_after)
+
+    async def _send_media_(self, kind: str, chat_id: Any, source: Any, prepare, **kwargs):
+        """Send *source* as *kind* media, reusing the file_id of a previous
+        upload of the same content (see :mod:`.media`)."""
+        send = getattr(self._bot, f"send_{kind}")
+        key = await media_cache.media_key(self._bot_token, kind, source)
+        if key is None:
+            if (media := await prepare(source)) is None:
+                return None
+            return await self._call_(send, chat_id, **{kind: media}, **kwargs)
+        if file_id := await media_cache.get_file_id(key):
+            try:
+                return await self._call_(send, chat_id, **{kind: file_id}, **kwargs)
+            except TelegramBadRequest:
+                # unknown file_id (ie. another bot): upload it again.
+                await media_cache.forget(key)
+        upload, created = media_cache.start_upload(key)
+        if not created:
+            # another sender is uploading it (after our lookup).
+            if file_id := await asyncio.shield(upload):
+                return await self._call_(send, chat_id, **{kind: file_id}, **kwargs)
+            if (media := await prepare(source)) is None:
+                return None
+            return await self._call_(send, chat_id, **{kind: media}, **kwargs)
+        file_id = None
+        try:
+            if (media := await prepare(source)) is None:
+                return None
+            response = await self._call_(send, chat_id, **{kind: media}, **kwargs)
+            file_id = media_cache.file_id_of(response, kind)
+            return response
+        finally:
+            await media_cache.finish_upload(key, upload, file_id)
+
     async def prepare_photo(self, photo):
         # Migrate to aiofile
         if isinstance(photo, PurePath):
@@ -204,13 +246,16 @@ class Telegram(ProviderIM):
             return None
 
     async def send_photo(self, photo, **kwargs):
-        image = await self.prepare_photo(photo)
-        if image:
+        if photo is not None:
             chat_id = self.get_chat()
             try:
-                response = await self._bot.send_photo(chat_id, photo=image, **kwargs)
+                response = await self._send_media_(
+                    "photo", chat_id, photo, self.prepare_photo, **kwargs
+                )
                 # print(response) # TODO: make the processing of response
                 return response
+            except NotifyException:
+                raise
             except TelegramUnauthorizedError as err:
                 # remove update.message.chat_id from conversation list
                 print(err)
@@ -256,15 +301,14 @@ class Telegram(ProviderIM):
 
     async def send_document(self, document, **kwargs):
         chat_id = self.get_chat()
-        doc = await self.get_document(document)
         try:
-            response = await self._bot.send_document(
-                chat_id,
-                document=doc,
-                **kwargs
+            response = await self._send_media_(
+                "document", chat_id, document, self.get_document, **kwargs
             )
             # print(response) # TODO: make the processing of response
             return response
+        except NotifyException:
+            raise
         except TelegramUnauthorizedError as err:
             # remove update.message.chat_id from conversation list
             print(err)
@@ -314,9 +358,13 @@ class Telegram(ProviderIM):
         chat_id = self.get_chat()
         sticker = await self.get_sticker(sticker)
         try:
-            response = await self._bot.send_sticker(chat_id, sticker=sticker, **kwargs)
+            response = await self._call_(
+                self._bot.send_sticker, chat_id, sticker=sticker, **kwargs
+            )
             # print(response) # TODO: make the processing of response
             return response
+        except NotifyException:
+            raise
         except TelegramUnauthorizedError as err:
             # remove update.message.chat_id from conversation list
             print(err)
@@ -355,9 +403,9 @@ class Telegram(ProviderIM):
         if isinstance(media, PurePath):  # Path to a File:
             if media.exists():
                 if media.suffix == ".webm":
-                    # its a webm video, convert to mp4
-                    media = self.convert_to_mp4(media)
-                    return FSInputFile(media, filename=media.name)
+                    # its a webm video, convert to mp4 (on a process pool)
+                    converted = await get_transcoder().to_mp4(media)
+                    return FSInputFile(converted, filename=f"{media.stem}.mp4")
                 return FSInputFile(media, filename=media.name)
             else:
                 raise FileNotFoundError(
@@ -376,11 +424,14 @@ class Telegram(ProviderIM):
 
     async def send_video(self, video: Union[str, Any], **kwargs):
         chat_id = self.get_chat()
-        media = await self.get_media(video)
         try:
-            response = await self._bot.send_video(chat_id, video=media, **kwargs)
+            response = await self._send_media_(
+                "video", chat_id, video, self.get_media, **kwargs
+            )
             # print(response) # TODO: make the processing of response
             return response
+        except NotifyException:
+            raise
         except TelegramUnauthorizedError as err:
             # remove update.message.chat_id from conversation list
             print(err)
@@ -404,11 +455,14 @@ class Telegram(ProviderIM):
 
     async def send_audio(self, audio: Union[str, PurePath, Any], **kwargs):
         chat_id = self.get_chat()
-        sound = await self.get_media(audio)
         try:
-            response = await self._bot.send_audio(chat_id, audio=sound, **kwargs)
+            response = await self._send_media_(
+                "audio", chat_id, audio, self.get_media, **kwargs
+            )
             # print(response) # TODO: make the processing of response
             return response
+        except NotifyException:
+            raise
         except TelegramUnauthorizedError as err:
             # remove update.message.chat_id from conversation list
             print(err)
@@ -0,0 +1,65 @@
+"""Telegram Bots.
+
+Process-wide registry of aiogram bots keyed by token: the bot session
+(and its connection pool) stays warm between sends and ``get_me()`` is
+called once per bot, so every Telegram instance of the worker reuses
+them.  Sessions are closed on worker shutdown.
+"""
+import hashlib
+from typing import Any, NamedTuple
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.default import DefaultBotProperties
+from aiogram.enums import ParseMode
+from notify.providers.shared import LoopRegistry, on_shutdown
+
+
+class _CachedBot(NamedTuple):
+    bot: Bot
+    info: Any
+
+
+async def _close_bot(cached: _CachedBot) -> None:
+    await cached.bot.session.close()
+
+
+_bots = LoopRegistry(close=_close_bot)
+
+
+def _bot_key(token: str) -> str:
+    return hashlib.sha256(str(token).encode()).hexdigest()
+
+
+async def get_bot(token: str) -> tuple[Bot, Any]:
+    """Return the shared bot of *token* and its ``get_me()`` info,
+    creating them on first use (or when the event loop changed)."""
+
+    async def create() -> _CachedBot:
+        bot = Bot(
+            token=token,
+            session=AiohttpSession(),
+            default=DefaultBotProperties(
+                parse_mode=ParseMode.HTML,
+                disable_notification=True,
+                allow_sending_without_reply=True
+            )
+        )
+        try:
+            info = await bot.get_me()
+        except Exception:
+            await bot.session.close()
+            raise
+        return _CachedBot(bot, info)
+    cached = await _bots.acquire(_bot_key(token), create)
+    return cached.bot, cached.info
+
+
+async def drop_bot(token: str) -> None:
+    """Close and forget the bot of *token* (ie. after it was revoked)."""
+    await _bots.pop(_bot_key(token))
+
+
+@on_shutdown
+async def close_bots() -> None:
+    """Close the sessions of the bots owned by the running event loop."""
+    await _bots.close()
@@ -0,0 +1,115 @@
+"""Telegram Media.
+
+Telegram returns a ``file_id`` for every uploaded photo, document, video
+or audio; sending that ``file_id`` reuses the stored file instead of
+uploading it again.
+
+The ``file_id`` of each media is cached by bot, media kind and content
+hash (SHA-256 of the file or the buffer) in a
+:class:`SharedCache` (``TELEGRAM_MEDIA_CACHE_TTL`` seconds, shared through
+Redis when ``NOTIFY_CACHE_REDIS`` is set).  Concurrent sends of a media
+not cached yet wait for the first upload.
+
+URLs are not cached: Telegram downloads them itself (nothing is uploaded
+from here) and the file behind a URL can change at any time.
+"""
+import asyncio
+import hashlib
+import os
+from io import BytesIO
+from pathlib import Path, PurePath
+from typing import Any, Optional
+from notify.providers.blocking import run_blocking
+from notify.providers.cache import SharedCache, TTLCache
+from notify.conf import (
+    TELEGRAM_MEDIA_CACHE_SIZE,
+    TELEGRAM_MEDIA_CACHE_TTL,
+)
+from .bots import _bot_key
+
+
+_file_ids = SharedCache(
+    "telegram:media", maxsize=TELEGRAM_MEDIA_CACHE_SIZE, ttl=TELEGRAM_MEDIA_CACHE_TTL
+)
+# file digests, by (path, mtime, size): a file is hashed once.
+_digests = TTLCache(maxsize=TELEGRAM_MEDIA_CACHE_SIZE, ttl=TELEGRAM_MEDIA_CACHE_TTL)
+# uploads in progress: media key -> future with the file_id
+_uploads: dict[str, asyncio.Future] = {}
+
+
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as fp:
+        return hashlib.file_digest(fp, "sha256").hexdigest()
+
+
+async def content_digest(source: Any) -> Optional[str]:
+    """SHA-256 of a media source (path or BytesIO); ``None`` when the
+    source can't be hashed (ie. a URL)."""
+    if isinstance(source, str) and source.startswith("http"):
+        return None
+    if isinstance(source, BytesIO):
+        return hashlib.sha256(source.getbuffer()).hexdigest()
+    if isinstance(source, (str, PurePath)):
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return None
+        key = (str(Path(source).resolve()), stat.st_mtime_ns, stat.st_size)
+        if (digest := _digests.get(key)) is None:
+            # large files: don't hash on the event loop.
+            digest = await run_blocking(_file_digest, str(source))
+            _digests.set(key, digest)
+        return digest
+    return None
+
+
+async def media_key(token: str, kind: str, source: Any) -> Optional[str]:
+    """Cache key of *source* sent as *kind* (photo, document...) by the
+    bot of *token* (file_ids are only valid for the bot that got them)."""
+    if (digest := await content_digest(source)) is None:
+        return None
+    return f"{_bot_key(token)[:16]}:{kind}:{digest}"
+
+
+def file_id_of(message: Any, kind: str) -> Optional[str]:
+    """The ``file_id`` of the *kind* media of a sent message."""
+    media = getattr(message, kind, None)
+    if isinstance(media, list):
+        # photos: every size shares the upload, keep the biggest.
+        media = media[-1] if media else None
+    return getattr(media, "file_id", None)
+
+
+async def get_file_id(key: str) -> Optional[str]:
+    # uploads in progress first: checked before any await.
+    if (upload := _uploads.get(key)) is not None:
+        return await asyncio.shield(upload)
+    return await _file_ids.get(key)
+
+
+def start_upload(key: str) -> tuple[asyncio.Future, bool]:
+    """Register the upload of *key*; concurrent senders wait for it.
+
+    Returns:
+        tuple: the upload future and whether it was created by this call
+        (``False``: another upload of *key* is running, await its future).
+    """
+    if (future := _uploads.get(key)) is not None:
+        return future, False
+    future = _uploads[key] = asyncio.get_running_loop().create_future()
+    return future, True
+
+
+async def finish_upload(key: str, future: asyncio.Future, file_id: Optional[str]) -> None:
+    """Store the *file_id* of an upload started by :func:`start_upload`."""
+    if _uploads.get(key) is future:
+        del _uploads[key]
+    if not future.done():
+        future.set_result(file_id)
+    if file_id:
+        await _file_ids.set(key, file_id)
+
+
+async def forget(key: str) -> None:
+    """Drop a file_id rejected by Telegram."""
+    await _file_ids.delete(key)
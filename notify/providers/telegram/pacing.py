@@ -0,0 +1,83 @@
+"""Telegram Pacing.
+
+Telegram limits every bot to about 30 messages per second overall, one
+message per second in a chat and 20 messages per minute in a group.
+
+:class:`TelegramPacer` keeps one schedule per chat plus the global rate,
+so a broadcast to many chats runs at the global rate while repeated
+messages to the same chat are spaced out, without one busy chat holding
+back the others.  A ``TelegramRetryAfter`` moves the schedule of the chat
+by the ``retry_after`` requested by Telegram.
+"""
+import asyncio
+from typing import Any
+from notify.utils import RateLimiter
+from notify.providers.shared import LoopRegistry
+from notify.conf import (
+    TELEGRAM_RATE_LIMIT,
+    TELEGRAM_CHAT_RATE,
+    TELEGRAM_GROUP_RATE,
+)
+from .bots import _bot_key
+
+
+def is_group(chat_id: Any) -> bool:
+    """Groups, supergroups and channels have negative ids (or @usernames)."""
+    chat = str(chat_id)
+    return chat.startswith("-") or chat.startswith("@")
+
+
+class TelegramPacer:
+    """TelegramPacer.
+
+    Args:
+        rate: messages per second for the bot.
+        chat_rate: messages per second in a private chat.
+        group_rate: messages per minute in a group.
+    """
+
+    def __init__(
+        self,
+        rate: float = TELEGRAM_RATE_LIMIT,
+        chat_rate: float = TELEGRAM_CHAT_RATE,
+        group_rate: float = TELEGRAM_GROUP_RATE
+    ):
+        self.limiter = RateLimiter(rate)
+        self.chat_interval = 1 / chat_rate if chat_rate > 0 else 0
+        self.group_interval = 60 / group_rate if group_rate > 0 else 0
+        self._next: dict[str, float] = {}
+
+    def __repr__(self) -> str:
+        return f"<TelegramPacer: {self.limiter.rate}/s, {len(self._next)} chats>"
+
+    async def acquire(self, chat_id: Any) -> None:
+        """Wait for the turn of the next message to *chat_id*."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        chat = str(chat_id)
+        interval = self.group_interval if is_group(chat) else self.chat_interval
+        start = max(now, self._next.get(chat, 0.0))
+        self._next[chat] = start + interval
+        if len(self._next) > 10000:
+            self._prune(now)
+        if (delay := start - now) > 0:
+            await asyncio.sleep(delay)
+        await self.limiter.acquire()
+
+    def retry_after(self, chat_id: Any, seconds: float) -> None:
+        """Hold the messages to *chat_id* for *seconds* (flood control)."""
+        until = asyncio.get_running_loop().time() + seconds
+        chat = str(chat_id)
+        self._next[chat] = max(self._next.get(chat, 0.0), until)
+
+    def _prune(self, now: float) -> None:
+        self._next = {chat: t for chat, t in self._next.items() if t > now}
+
+
+# pacers hold asyncio locks: one per event loop.
+_pacers = LoopRegistry()
+
+
+def get_pacer(token: str) -> TelegramPacer:
+    """The pacer of the bot of *token* (limits are per bot)."""
+    return _pacers.setdefault(_bot_key(token), TelegramPacer)
@@ -0,0 +1,170 @@
+"""Telegram Transcoding.
+
+Videos that Telegram can't play (webm) are converted to mp4 with moviepy
+(ffmpeg) on a process pool, never on the event loop.
+
+* At most ``TELEGRAM_TRANSCODE_QUEUE`` conversions are queued or running;
+  further requests wait for a free slot.
+* Outputs are stored in ``TELEGRAM_TRANSCODE_DIR`` named by the content
+  hash of the source (re-hashed only when its mtime or size change): a
+  source already converted is never encoded again, and concurrent
+  requests for the same source share one conversion.
+* Outputs not used for ``TELEGRAM_MEDIA_CACHE_TTL`` seconds (when their
+  ``file_id`` expires too) are deleted after each conversion.
+"""
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path, PurePath
+from typing import Optional, Union
+from navconfig.logging import logging
+from notify.providers.blocking import run_blocking
+from notify.providers.shared import on_shutdown
+from notify.conf import (
+    TELEGRAM_MEDIA_CACHE_TTL,
+    TELEGRAM_TRANSCODE_WORKERS,
+    TELEGRAM_TRANSCODE_QUEUE,
+    TELEGRAM_TRANSCODE_DIR,
+)
+from .media import content_digest
+
+
+def _transcode(source: str, output: str, codec: str) -> str:
+    """Convert *source* to mp4 (runs on a pool process)."""
+    try:
+        from moviepy import VideoFileClip
+    except ImportError as exc:
+        raise ImportError(
+            "moviepy is required to convert videos to mp4. "
+            "Install it with `pip install async-notify[telegram]` or `pip install moviepy==2.2.1`"
+        ) from exc
+    # write aside and rename: a partial output is never reused.
+    partial = f"{output}.{os.getpid()}.part.mp4"
+    clip = VideoFileClip(source)
+    try:
+        clip.write_videofile(partial, codec=codec, logger=None)
+    finally:
+        clip.close()
+    os.replace(partial, output)
+    return output
+
+
+def _evict(directory: str, max_age: float) -> int:
+    """Delete the files of *directory* unused for *max_age* seconds
+    (left-over partial outputs too); returns how many were deleted."""
+    limit = time.time() - max_age
+    removed = 0
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < limit:
+                os.unlink(entry.path)
+                removed += 1
+        except OSError:
+            # (deleted meanwhile)
+            continue
+    return removed
+
+
+class Transcoder:
+    """Transcoder.
+
+    Args:
+        directory: where converted files are kept.
+        max_workers: processes of the pool.
+        queue_size: conversions queued or running at the same time.
+        max_age: seconds an unused output is kept.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, PurePath, None] = None,
+        max_workers: int = TELEGRAM_TRANSCODE_WORKERS,
+        queue_size: int = TELEGRAM_TRANSCODE_QUEUE,
+        max_age: float = TELEGRAM_MEDIA_CACHE_TTL
+    ):
+        self.directory = Path(
+            directory or Path(tempfile.gettempdir()).joinpath("notify-transcode")
+        )
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.max_age = max_age
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._running: dict[str, asyncio.Future] = {}
+        self.logger = logging.getLogger("Notify.Telegram.Transcoder")
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def to_mp4(self, video: Union[str, PurePath], codec: str = "libx264") -> Path:
+        """Return the mp4 version of *video*, converting it if needed."""
+        digest = await content_digest(video)
+        if digest is None:
+            raise FileNotFoundError(f"Telegram Bot: file {video} doesn't exists.")
+        output = self.directory.joinpath(f"{digest}.mp4")
+        try:
+            # mtime is the last use: a reused output is not evicted.
+            os.utime(output)
+            return output
+        except FileNotFoundError:
+            pass
+        if (running := self._running.get(digest)) is not None:
+            return await asyncio.shield(running)
+        future = asyncio.get_running_loop().create_future()
+        self._running[digest] = future
+        try:
+            result = await self._convert(str(video), output, codec)
+            future.set_result(result)
+            return result
+        except BaseException as exc:
+            future.set_exception(exc)
+            # nobody may be waiting for it:
+            future.exception()
+            raise
+        finally:
+            del self._running[digest]
+
+    async def _convert(self, source: str, output: Path, codec: str) -> Path:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.queue_size)
+        async with self._slots:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.logger.debug(f"Converting {source} to mp4")
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                self.pool, _transcode, source, str(output), codec
+            )
+        if removed := await run_blocking(_evict, str(self.directory), self.max_age):
+            self.logger.debug(f"Deleted {removed} unused converted videos")
+        return output
+
+
+_transcoder: Optional[Transcoder] = None
+
+
+def get_transcoder() -> Transcoder:
+    """The video transcoder of this process."""
+    global _transcoder  # pylint: disable=W0603
+    if _transcoder is None:
+        _transcoder = Transcoder(TELEGRAM_TRANSCODE_DIR)
+    return _transcoder
+
+
+@on_shutdown
+async def close_transcoder() -> None:
+    if _transcoder is not None:
+        _transcoder.close()
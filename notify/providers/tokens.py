@@ -0,0 +1,164 @@
+"""OAuth token cache.
+
+Access tokens (MS Graph, Zoom, ...) are shared by every provider instance
+of the worker, and by every worker process when ``NOTIFY_CACHE_REDIS`` is
+set, instead of being requested again on each ``connect()``.
+
+* Tokens are keyed by provider, tenant, client and scope
+  (see :func:`token_key`); secrets are never part of the key.
+* A token is refreshed in the background once it is within
+  ``NOTIFY_TOKEN_REFRESH_MARGIN`` seconds of expiring, while callers keep
+  using the current one.
+* Requests are single-flight: concurrent callers of the same key wait for
+  the one token request in progress (in this process), and a short Redis
+  lock keeps other processes from requesting it at the same time.
+
+Usage::
+
+    key = token_key("zoom", account_id, client_id)
+    token = await get_token_cache().get(key, self._fetch_token_)
+    token["access_token"]
+
+The *fetch* coroutine function returns the token response of the
+authority (a dict with ``access_token`` and ``expires_in``); responses
+without ``access_token`` (errors) are returned but never cached.
+"""
+import asyncio
+import time
+from typing import Optional, Union
+from collections.abc import Awaitable, Callable
+from navconfig.logging import logging
+from notify.conf import NOTIFY_TOKEN_REFRESH_MARGIN
+from .cache import SharedCache, redis_client
+
+
+LOCK_TIMEOUT = 30
+
+
+def token_key(
+    provider: str,
+    tenant: Optional[str],
+    client_id: Optional[str],
+    scopes: Union[str, list, tuple, None] = None,
+    subject: Optional[str] = None
+) -> str:
+    """Cache key of a token.
+
+    Args:
+        provider: token family (ie. ``msgraph``, ``zoom``).
+        tenant: tenant or account the token is issued for.
+        client_id: OAuth client (application) id.
+        scopes: scope or list of scopes.
+        subject: delegated user, for user tokens.
+    """
+    if isinstance(scopes, (list, tuple)):
+        scopes = " ".join(sorted(scopes))
+    parts = [provider, tenant or "", client_id or "", scopes or ""]
+    if subject:
+        parts.append(subject)
+    return ":".join(parts)
+
+
+class TokenCache:
+    """TokenCache.
+
+    Process-wide cache of OAuth access tokens (see the module docs).
+    Attributes:
+        margin: seconds before expiration a token is refreshed.
+        requests: number of token requests made (fetch calls).
+    """
+
+    def __init__(self, margin: float = NOTIFY_TOKEN_REFRESH_MARGIN):
+        self.margin = margin
+        self.requests: int = 0
+        self._cache = SharedCache("token", maxsize=256)
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.logger = logging.getLogger("Notify.Tokens")
+
+    def peek(self, key: str) -> Optional[dict]:
+        """The (unexpired) token of *key* in memory, without any I/O."""
+        token = self._cache.local.get(key)
+        if token and time.time() < token["expires_at"]:
+            return token
+        return None
+
+    async def get(self, key: str, fetch: Callable[[], Awaitable[dict]]) -> dict:
+        """Return a valid token for *key*, calling *fetch* only when needed."""
+        token = await self._cache.get(key)
+        now = time.time()
+        if token and now < token["expires_at"]:
+            if now >= token["expires_at"] - self.margin:
+                # still valid: refresh in the background.
+                self._request(key, fetch)
+            return token
+        return await asyncio.shield(self._request(key, fetch))
+
+    async def invalidate(self, key: str) -> None:
+        """Drop the token of *key* (ie. after the API rejected it)."""
+        await self._cache.delete(key)
+
+    def _request(self, key: str, fetch: Callable) -> asyncio.Task:
+        if (task := self._inflight.get(key)) is None:
+            task = asyncio.get_running_loop().create_task(self._fetch(key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_done(key, t))
+        return task
+
+    def _on_done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            # background refreshes have nobody waiting for them.
+            self.logger.debug(f"Token request for {key} failed: {exc}")
+
+    async def _fetch(self, key: str, fetch: Callable) -> dict:
+        redis = redis_client()
+        lock = f"notify:token-lock:{key}"
+        locked = False
+        if redis is not None:
+            try:
+                locked = await redis.set(lock, "1", nx=True, ex=LOCK_TIMEOUT)
+                if not locked:
+                    # another process is requesting this token:
+                    if token := await self._wait_shared(key):
+                        return token
+            except Exception as exc:  # pylint: disable=W0703
+                self.logger.warning(f"Redis unavailable: {exc}")
+        try:
+            started = time.time()
+            self.requests += 1
+            result = await fetch()
+            if not isinstance(result, dict) or not result.get("access_token"):
+                return result
+            expires_in = int(result.get("expires_in", 3600))
+            token = {**result, "expires_at": started + expires_in}
+            await self._cache.set(key, token, ttl=expires_in)
+            return token
+        finally:
+            if locked:
+                try:
+                    await redis.delete(lock)
+                except Exception:  # pylint: disable=W0703
+                    pass
+
+    async def _wait_shared(self, key: str) -> Optional[dict]:
+        """Wait (up to the lock timeout) for a fresh token from another process."""
+        deadline = time.time() + LOCK_TIMEOUT
+        while time.time() < deadline:
+            await asyncio.sleep(0.1)
+            self._cache.local.pop(key)
+            token = await self._cache.get(key)
+            if token and time.time() < token["expires_at"] - self.margin:
+                return token
+        return None
+
+
+_token_cache: Optional[TokenCache] = None
+
+
+def get_token_cache() -> TokenCache:
+    """The token cache of this process."""
+    global _token_cache  # pylint: disable=W0603
+    if _token_cache is None:
+        _token_cache = TokenCache()
+    return _token_cache
@@ -1,29 +1,46 @@
 from typing import Union, Any
-from twilio.base.exceptions import TwilioRestException
-from twilio.rest import Client
+import aiohttp
+from navconfig.logging import logging
 from notify.providers.base import ProviderMessaging, ProviderType
+from notify.providers.shared import http_session
 from notify.models import Actor
 from notify.exceptions import ProviderError
 from notify.conf import (
     TWILIO_AUTH_TOKEN,
     TWILIO_ACCOUNT_SID,
-    TWILIO_PHONE
+    TWILIO_PHONE,
+    TWILIO_MAX_CONCURRENCY,
+    TWILIO_STATUS_CALLBACK,
 )
 
+TWILIO_API_URL = "https://api.twilio.com/2010-04-01/Accounts/{sid}/Messages.json"
+
+
 class Twilio(ProviderMessaging):
+    """Twilio.
+
+    Send SMS using the Twilio REST API over the shared aiohttp session,
+    with at most ``TWILIO_MAX_CONCURRENCY`` requests in flight per send
+    (the provider ``concurrency``).
+    """
     provider = "sms"
     provider_type = ProviderType.SMS
     level = ""
     blocking: str = 'asyncio'
+    concurrency: int = TWILIO_MAX_CONCURRENCY
 
     def __init__(self, sid: str = None, token: str = None, **kwargs):
         """
         :param token: twilio auth token given by Twilio
         :param sid: twilio auth id given by Twilio
+        :param from_number: sender number (default: TWILIO_PHONE)
+        :param status_callback: URL notified by Twilio on status changes
 
         """
         self._msg = None
         self.client = None
+        self.from_number = kwargs.pop('from_number', None) or TWILIO_PHONE
+        self.status_callback = kwargs.pop('status_callback', None) or TWILIO_STATUS_CALLBACK
         super(Twilio, self).__init__(**kwargs)
         self.token = TWILIO_AUTH_TOKEN if token is None else token
         self.sid = TWILIO_ACCOUNT_SID if sid is None else sid
@@ -42,7 +59,8 @@ class Twilio(ProviderMessaging):
                 TWILIO_ACCOUNT_SID & TWILIO_AUTH_TOKEN in \n"
                 "environment variables or send account_sid & auth_token in instance."
             )
-        self.client = Client(self.sid, self.token)
+        # process-wide HTTP session (closed on worker shutdown)
+        self.client = http_session()
 
     async def _send_(self, to: Actor, message: Union[str, Any], **kwargs) -> Any:
         """
@@ -51,17 +69,44 @@ class Twilio(ProviderMessaging):
         Send a text message using twilio
         :param to: recipient number
         :param message: message to send
+        :param status_callback: status callback URL for this message
+        :return: the Twilio Message resource (dict)
         """
+        if self.client is None:
+            await self.connect()
+        data = await self._render_(to, message, **kwargs)
+        payload = {
+            "To": self._phone_(to),
+            "From": self.from_number,
+            "Body": data,
+        }
+        if callback := kwargs.get('status_callback', self.status_callback):
+            payload["StatusCallback"] = callback
         try:
-            data = self._render(to, message, **kwargs)
-            phone = to.account["phone"]
-            msg = self.client.messages.create(to=phone, from_=TWILIO_PHONE, body=data)
-            # print(msg)
-            # print(msg.sid)
-            # TODO: processing the output, adding callbacks
-            return msg
-        except TwilioRestException as ex:
-            print(ex)
+            async with self.client.post(
+                TWILIO_API_URL.format(sid=self.sid),
+                data=payload,
+                auth=aiohttp.BasicAuth(self.sid, self.token),
+            ) as response:
+                try:
+                    result = await response.json(content_type=None)
+                except ValueError as ex:
+                    # ie. an HTML error page from a proxy
+                    text = await response.text()
+                    raise ProviderError(
+                        f"Error Sending SMS on Twilio, invalid response "
+                        f"(status {response.status}): {text[:200]}"
+                    ) from ex
+                if response.status >= 400:
+                    raise ProviderError(
+                        f"Error Sending SMS on Twilio, current error: "
+                        f"{result.get('code')} {result.get('message')}"
+                    )
+        except aiohttp.ClientError as ex:
             raise ProviderError(
                 f"Error Sending SMS on Twilio, current error: {ex}"
             ) from ex
+        logging.debug(
+            f"Twilio: sent to {payload['To']}: {result.get('sid')} {result.get('status')}"
+        )
+        return result
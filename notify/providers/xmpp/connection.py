@@ -0,0 +1,271 @@
+"""XMPP Connections.
+
+Process-wide registry of authenticated XMPP streams keyed by JID: every
+Xmpp instance of the worker sends through one long-lived stream instead of
+logging in for each batch of messages.
+
+* At most ``JABBER_QUEUE_SIZE`` messages are queued or waiting for an
+  ack: senders wait for room instead of piling stanzas up while the
+  stream is down.
+* With Stream Management (XEP-0198) a send completes when the server acks
+  the stanza; servers without it complete the send once it is written.
+* A dropped stream is reconnected with exponential backoff (up to
+  ``JABBER_RECONNECT_MAX`` seconds); unacked messages are resent by the
+  resumed session, or sent again when a new session has to be opened.
+* A rejected login closes the connection and fails its messages.
+"""
+import asyncio
+import hashlib
+import random
+from typing import Any, NamedTuple, Optional
+from navconfig.logging import logging
+from notify.providers.shared import LoopRegistry, on_shutdown
+from notify.exceptions import ProviderError, NotifyAuthError, NotifyTimeout
+from notify.conf import (
+    JABBER_QUEUE_SIZE,
+    JABBER_ACK_TIMEOUT,
+    JABBER_RECONNECT_DELAY,
+    JABBER_RECONNECT_MAX,
+)
+
+
+class _Outgoing(NamedTuple):
+    to: str
+    body: str
+    mtype: str
+    future: asyncio.Future
+
+
+class XmppConnection:
+    """XmppConnection.
+
+    Args:
+        client: slixmpp client (``xep_0198`` registered for delivery acks).
+        queue_size: messages queued or waiting for an ack.
+        ack_timeout: seconds to wait for the ack of a message.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        queue_size: int = JABBER_QUEUE_SIZE,
+        ack_timeout: float = JABBER_ACK_TIMEOUT
+    ):
+        self.client = client
+        self.ack_timeout = ack_timeout
+        self.logger = logging.getLogger("Notify.XMPP.Connection")
+        self._queue: asyncio.Queue = asyncio.Queue()
+        # a slot per message, from send() until it is acked (or failed):
+        self._slots = asyncio.Semaphore(queue_size)
+        self._pending: dict[str, _Outgoing] = {}
+        self._ready = asyncio.Event()
+        self._session: Optional[asyncio.Future] = None
+        self._acks = False
+        self._closing = False
+        self._attempts = 0
+        self._worker: Optional[asyncio.Task] = None
+        self._reconnect: Optional[asyncio.Task] = None
+        client.add_event_handler("session_start", self._on_session_start)
+        client.add_event_handler("session_resumed", self._on_session_resumed)
+        client.add_event_handler("sm_enabled", self._on_sm_enabled)
+        client.add_event_handler("stanza_acked", self._on_acked)
+        client.add_event_handler("failed_auth", self._on_failed_auth)
+        client.add_event_handler("disconnected", self._on_disconnected)
+
+    def __repr__(self) -> str:
+        return (
+            f"<XmppConnection: {self.client.boundjid.bare}, "
+            f"{self._queue.qsize()} queued, {len(self._pending)} unacked>"
+        )
+
+    @property
+    def connected(self) -> bool:
+        return self._ready.is_set()
+
+    @property
+    def closed(self) -> bool:
+        return self._closing
+
+    async def start(self, timeout: float = 30) -> None:
+        """Open the stream and wait (up to *timeout*) for the session.
+
+        Raises:
+            NotifyTimeout: no session after *timeout* seconds.
+            NotifyAuthError: the server rejected the credentials.
+        """
+        self._session = asyncio.get_running_loop().create_future()
+        self.client.connect()
+        try:
+            await asyncio.wait_for(self._session, timeout)
+        except asyncio.TimeoutError as exc:
+            self._abort(ProviderError("XMPP: connection closed"))
+            raise NotifyTimeout(
+                f"XMPP: no session for {self.client.boundjid.bare} after {timeout}s"
+            ) from exc
+        self._worker = asyncio.create_task(self._deliver())
+
+    async def send(self, to: str, body: str, mtype: str = "chat") -> None:
+        """Queue a message and wait until it was delivered to the server.
+
+        Raises:
+            NotifyTimeout: the message was not acked in ``ack_timeout``.
+            ProviderError: the connection was closed.
+        """
+        if self._closing:
+            raise ProviderError("XMPP: connection is closed")
+        await self._slots.acquire()
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda _: self._slots.release())
+        self._queue.put_nowait(_Outgoing(str(to), body, mtype, future))
+        try:
+            await asyncio.wait_for(future, self.ack_timeout)
+        except asyncio.TimeoutError as exc:
+            raise NotifyTimeout(
+                f"XMPP: message to {to} not acked after {self.ack_timeout}s"
+            ) from exc
+
+    async def _deliver(self) -> None:
+        while True:
+            item = await self._queue.get()
+            await self._ready.wait()
+            if not item.future.done():  # (timed out while queued)
+                self._send(item)
+
+    def _send(self, item: _Outgoing) -> None:
+        try:
+            msg = self.client.make_message(mto=item.to, mbody=item.body, mtype=item.mtype)
+            msg["id"] = msg_id = self.client.new_id()
+            msg.send()
+        except Exception as exc:  # pylint: disable=W0703
+            item.future.set_exception(ProviderError(f"XMPP: {exc}"))
+            return
+        if not self._acks:
+            item.future.set_result(msg_id)
+            return
+        self._pending[msg_id] = item
+        item.future.add_done_callback(lambda _: self._pending.pop(msg_id, None))
+
+    def _on_acked(self, stanza) -> None:
+        if (item := self._pending.get(stanza["id"])) is not None and not item.future.done():
+            item.future.set_result(stanza["id"])
+
+    def _on_sm_enabled(self, event) -> None:
+        self._acks = True
+
+    def _on_session_start(self, event) -> None:
+        # a new session: the stanzas unacked by the old one are lost,
+        # send them again (keeping their slots) before the queued ones.
+        unacked = list(self._pending.values())
+        self._pending.clear()
+        if unacked:
+            self.logger.warning(f"XMPP: re-sending {len(unacked)} unacked messages")
+        for item in unacked:
+            self._send(item)
+        self._connected()
+
+    def _on_session_resumed(self, event) -> None:
+        # xep_0198 re-sends the unacked stanzas itself.
+        self._acks = True
+        self._connected()
+
+    def _connected(self) -> None:
+        self._attempts = 0
+        self._ready.set()
+        if self._session is not None and not self._session.done():
+            self._session.set_result(True)
+
+    def _on_failed_auth(self, event) -> None:
+        error = NotifyAuthError(
+            f"XMPP: authentication failed for {self.client.boundjid.bare}"
+        )
+        if self._session is not None and not self._session.done():
+            self._session.set_exception(error)
+        self._abort(error)
+
+    def _on_disconnected(self, event) -> None:
+        self._ready.clear()
+        # the next session tells if it acks (sm_enabled / session_resumed).
+        self._acks = False
+        if self._closing:
+            return
+        if self._reconnect is None or self._reconnect.done():
+            self._reconnect = asyncio.create_task(self._reconnect_later())
+
+    def backoff(self) -> float:
+        """Seconds before the next reconnection attempt (with jitter)."""
+        delay = min(JABBER_RECONNECT_DELAY * 2 ** self._attempts, JABBER_RECONNECT_MAX)
+        return delay * random.uniform(0.5, 1)
+
+    async def _reconnect_later(self) -> None:
+        delay = self.backoff()
+        self._attempts += 1
+        self.logger.warning(f"XMPP: stream lost, reconnecting in {delay:.1f}s")
+        await asyncio.sleep(delay)
+        if not self._closing:
+            self.client.connect()
+
+    def _abort(self, error: Exception, timeout: float = 2.0) -> None:
+        """Stop sending, fail the undelivered messages and disconnect."""
+        self._closing = True
+        for task in (self._worker, self._reconnect):
+            if task is not None:
+                task.cancel()
+        undelivered = list(self._pending.values())
+        while not self._queue.empty():
+            undelivered.append(self._queue.get_nowait())
+        for item in undelivered:
+            if not item.future.done():
+                item.future.set_exception(error)
+        self.client.disconnect(wait=timeout)
+
+    async def close(self, timeout: float = 2.0) -> None:
+        """Stop sending, fail the undelivered messages and disconnect."""
+        if not self._closing:
+            self._abort(ProviderError("XMPP: connection closed"), timeout)
+
+
+async def _close_connection(connection: XmppConnection) -> None:
+    await connection.close()
+
+
+_connections = LoopRegistry(
+    close=_close_connection, alive=lambda connection: not connection.closed
+)
+
+
+def _connection_key(jid: str, password: str) -> str:
+    return hashlib.sha256(f"{jid}:{password}".encode()).hexdigest()
+
+
+async def get_connection(jid: str, password: str, factory, timeout: float = 30) -> XmppConnection:
+    """Return the shared connection of *jid*, opening it on first use (or
+    when the event loop changed or the connection was closed).
+
+    ``factory()`` builds the slixmpp client of a new connection.
+    """
+
+    async def create() -> XmppConnection:
+        connection = XmppConnection(factory())
+        await connection.start(timeout=timeout)
+        return connection
+    return await _connections.acquire(_connection_key(jid, password), create)
+
+
+async def drop_connection(
+    jid: str,
+    password: str,
+    connection: Optional[XmppConnection] = None
+) -> None:
+    """Close and forget the connection of *jid* (ie. after an auth failure);
+    with *connection*, only if it is still the shared one."""
+    key = _connection_key(jid, password)
+    if connection is None:
+        await _connections.pop(key)
+    else:
+        await _connections.pop(key, connection)
+
+
+@on_shutdown
+async def close_connections() -> None:
+    """Close the connections owned by the running event loop."""
+    await _connections.close()
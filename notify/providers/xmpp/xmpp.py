@@ -4,7 +4,6 @@ xmpp.
 XMPP use slixmpp to send jabber messages (XMPP protocol)
 """
 from typing import Union, Any
-import ssl
 # XMPP library
 from slixmpp import ClientXMPP
 from slixmpp.exceptions import IqError, IqTimeout
@@ -12,11 +11,12 @@ from slixmpp.xmlstream.xmlstream import NotConnectedError
 from navconfig.logging import logging
 from notify.models import Actor
 from notify.providers.base import ProviderIM, ProviderType
-from notify.exceptions import ProviderError
+from notify.exceptions import ProviderError, NotifyException, NotifyTimeout
 from notify.conf import (
     JABBER_JID,
     JABBER_PASSWORD
 )
+from .connection import XmppConnection, get_connection, drop_connection
 
 
 class Client(ClientXMPP):
@@ -39,17 +39,7 @@ class Client(ClientXMPP):
             "session_start",
             self.session_start
         )
-        # The message event is triggered whenever a message
-        # stanza is received. Be aware that that includes
-        # MUC messages and error messages.
-        self.add_event_handler(
-            "message",
-            self.message
-        )
-        self.add_event_handler(
-            "disconnected",
-            self.on_disconnect
-        )
+        # Reconnection is handled by the XmppConnection.
         self.add_event_handler(
             "connection_failed",
             self.on_connection_failure
@@ -57,8 +47,6 @@ class Client(ClientXMPP):
         if isinstance(plugins, list):
             for p in plugins:
                 self.register_plugin(p)
-        self["xep_0030"].add_feature("echo_demo")
-        self.ssl_version = ssl.PROTOCOL_SSLv3
 
     async def session_start(self, event):
         self.send_presence()
@@ -76,42 +64,25 @@ class Client(ClientXMPP):
             )
             self.disconnect()
 
-    def message(self, msg):
-        """
-        called by slixmpp on incoming XMPP messages
-        """
-        if msg["type"] in ("chat", "normal"):
-            msg.reply("Thanks for sending\n%(body)s" % msg).send()
-
-    def on_disconnect(self, event):
-        if self.do_reconnections:
-            self.connect()
-
     def on_connection_failure(self, event):
-        self.log("XMPP connection failed. Try to reconnect in 5min.")
-        self.schedule(
-            "Reconnect after connection failure", 60 * 5, self.on_disconnect, event
-        )
-
-    async def close(self):
-        logging.info("Terminating XMPP session")
-        self.do_reconnections = False
-        self.disconnect()
-        logging.info("XMPP session terminated.")
+        logging.warning(f"XMPP connection failed: {event}")
 
 
 class Xmpp(ProviderIM):
     """
     xmpp.
 
-    XMPP message provider
+    XMPP message provider; instances with the same JID share one
+    persistent stream (see :mod:`notify.providers.xmpp.connection`).
     :param username: JID Jabber
     :param password: Jabber password
     """
 
     provider = "xmpp"
     provider_type = ProviderType.IM
+    blocking: str = 'asyncio'
     client = None
+    _connection: XmppConnection = None
     _session = None
     _id = None
     _plugins = [
@@ -119,6 +90,7 @@ class Xmpp(ProviderIM):
         "xep_0199",  # XMPP Ping
         "xep_0060",  # PubSub
         "xep_0004",  # Data Forms
+        "xep_0198",  # Stream Management (delivery acks, resumption)
     ]
 
     def __init__(self, username: str = None, password: str = None, **kwargs):
@@ -158,44 +130,76 @@ class Xmpp(ProviderIM):
             self.logger.info(f"Error pinging {jid}: {error}")
         except IqTimeout:
             self.logger.info(f"No response from {jid}")
-        finally:
-            self.client.disconnect()
 
-    def connect(self, **kwargs):
+    async def connect(self, **kwargs):
+        """Connect to the XMPP server on the running event loop.
+
+        The stream of this JID is opened once (waiting up to ``timeout``
+        seconds for the session) and reused by the next instances.
+        """
         try:
-            self.client = Client(
+            self._connection = await get_connection(
                 self.username,
                 self.password,
-                plugins=self._plugins
+                lambda: Client(self.username, self.password, plugins=self._plugins),
+                timeout=kwargs.get("timeout", 30)
             )
-            # Connect to the XMPP server and start processing XMPP stanzas
-            self.client.connect()
-            self.client.process(forever=False)
+        except NotifyException:
+            await drop_connection(self.username, self.password)
+            raise
         except Exception as e:
+            await drop_connection(self.username, self.password)
             raise ProviderError(e) from e
+        self.client = self._connection.client
         return self.client
 
+    @staticmethod
+    def _jid_(to: Union[Actor, str]) -> str:
+        """JID of a recipient: its account address (or userid)."""
+        if isinstance(to, str):
+            return to
+        account = getattr(to, "account", None)
+        address = getattr(account, "address", None)
+        if isinstance(address, list):
+            address = address[0] if address else None
+        return address or getattr(account, "userid", None) or str(to)
+
     async def _send_(
         self, to: Actor, message: Union[str, Any], subject: str = None, **kwargs
     ) -> Any:
+        """_send_.
+
+        Queue the message on the shared stream and wait for the server ack.
+        """
+        if self._connection is None:
+            await self.connect()
+        body = await self._render_(to, message, subject=subject, **kwargs)
+        if subject:
+            body = f"{subject}: {body}"
         try:
-            context = kwargs["context"]
-        except KeyError:
-            context = None
-        try:
-            self.client.send_message(
-                mto=to, mbody=f"{subject}: {message}", mtype="chat"
-            )
-        except NotConnectedError:
-            self.logger.warning(
-                "Message NOT SENT, not connected."
-            )
-        except IqError as e:
-            raise ProviderError(e) from e
-        except IqTimeout as e:
-            raise ProviderError(e) from e
+            await self._connection.send(self._jid_(to), body, mtype="chat")
+        except NotifyTimeout:
+            raise
+        except ProviderError:
+            # closed or rejected (ie. auth failure): open a new one next time.
+            await self._drop_()
+            raise
+        except NotConnectedError as e:
+            await self._drop_()
+            raise ProviderError(f"Message NOT SENT, not connected: {e}") from e
+        except NotifyException:
+            raise
         except Exception as e:
             raise ProviderError(e) from e
+        return {"to": self._jid_(to), "status": "sent"}
+
+    async def _drop_(self) -> None:
+        """Forget the shared stream of this JID (if still the same)."""
+        connection, self._connection = self._connection, None
+        self.client = None
+        await drop_connection(self.username, self.password, connection)
 
     async def close(self):
-        await self.client.close()
+        # the stream is shared: it is closed on worker shutdown.
+        self._connection = None
+        self.client = None
@@ -24,13 +24,14 @@ Usage::
             message="Hello from FlowTask!",
         )
 """
-import time as _time
 from typing import Any, Union, Optional
 
 import aiohttp
 from navconfig.logging import logging
 
 from notify.providers.base import ProviderMessaging, ProviderType
+from notify.providers.shared import http_session
+from notify.providers.tokens import get_token_cache, token_key
 from notify.models import Actor
 from notify.exceptions import ProviderError
 from notify.conf import (
@@ -82,10 +83,10 @@ class Zoom(ProviderMessaging):
         self._msg = None
         self.session: Optional[aiohttp.ClientSession] = None
         self._token: Optional[str] = None
-        self._token_expiry: float = 0.0
         super(Zoom, self).__init__(**kwargs)
         self.account_id = account_id or ZOOM_SMS_ACCOUNT_ID
         self.client_id = client_id or ZOOM_SMS_CLIENT_ID
+        self._token_key = token_key("zoom", self.account_id, self.client_id)
         self.client_secret = client_secret or ZOOM_SMS_CLIENT_SECRET
         self.from_number = from_number or ZOOM_SMS_DEFAULT_FROM
         self.user_id = kwargs.get("user_id") or ZOOM_SMS_USER_ID
@@ -109,20 +110,19 @@ class Zoom(ProviderMessaging):
                 "Set ZOOM_SMS_DEFAULT_FROM or pass from_number."
             )
         if not getattr(self, "session", None) or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            # process-wide HTTP session (closed on worker shutdown)
+            self.session = http_session()
             await self._refresh_token()
 
     async def close(self):
-        """Close the HTTP session."""
-        if self.session and not self.session.closed:
-            await self.session.close()
-            self.session = None
+        """Release the (shared) HTTP session."""
+        self.session = None
 
     async def _refresh_token(self) -> str:
-        """Fetch or refresh the OAuth access token.
+        """Return a valid OAuth access token.
 
-        Uses Server-to-Server OAuth (account_credentials grant).
-        Tokens are cached with a 60-second safety margin.
+        Tokens are shared by every Zoom instance (and worker process)
+        through the token cache, and refreshed before they expire.
 
         Returns:
             Valid access token string.
@@ -130,17 +130,19 @@ class Zoom(ProviderMessaging):
         Raises:
             ProviderError: If the token request fails.
         """
-        # Return cached token if still valid
-        if self._token and _time.time() < self._token_expiry:
-            return self._token
+        result = await get_token_cache().get(self._token_key, self._fetch_token_)
+        self._token = result["access_token"]
+        return self._token
 
+    async def _fetch_token_(self) -> dict:
+        """Request a token using Server-to-Server OAuth (account_credentials grant)."""
         auth = aiohttp.BasicAuth(self.client_id, self.client_secret)
         data = {
             "grant_type": "account_credentials",
             "account_id": self.account_id,
         }
         try:
-            async with self.session.post(
+            async with http_session().post(
                 ZOOM_AUTH_URL, auth=auth, data=data
             ) as resp:
                 if resp.status != 200:
@@ -150,15 +152,11 @@ class Zoom(ProviderMessaging):
                         f"({resp.status}): {error}"
                     )
                 result = await resp.json()
-                self._token = result.get("access_token")
-                if not self._token:
+                if not result.get("access_token"):
                     raise ProviderError(
                         "No access_token in Zoom OAuth response"
                     )
-                expires_in = int(result.get("expires_in", 3600))
-                # 60-second safety margin
-                self._token_expiry = _time.time() + expires_in - 60
-                return self._token
+                return result
         except aiohttp.ClientError as exc:
             raise ProviderError(
                 f"Zoom OAuth connection error: {exc}"
@@ -237,7 +235,7 @@ class Zoom(ProviderMessaging):
                     return body
                 elif resp.status == 401:
                     # Token expired, refresh and retry once
-                    self._token = None
+                    await get_token_cache().invalidate(self._token_key)
                     token = await self._refresh_token()
                     headers["Authorization"] = f"Bearer {token}"
                     async with self.session.post(
@@ -0,0 +1,29 @@
+"""Recipients.
+
+Recipient representations for bulk sends (LiteRecipient, RecipientBatch)
+and validation, normalization and de-duplication before fan-out.
+"""
+from .lite import LiteAccount, LiteRecipient, as_actor, as_recipient, build_recipient
+from .batch import RecipientBatch, StringColumn
+from .normalize import (
+    RecipientReport,
+    normalize_email,
+    normalize_phone,
+    normalize_recipients,
+    recipient_key,
+)
+
+__all__ = (
+    "LiteAccount",
+    "LiteRecipient",
+    "as_actor",
+    "as_recipient",
+    "RecipientBatch",
+    "StringColumn",
+    "RecipientReport",
+    "normalize_email",
+    "normalize_phone",
+    "normalize_recipients",
+    "recipient_key",
+    "build_recipient",
+)
@@ -0,0 +1,228 @@
+"""RecipientBatch.
+
+Columnar storage for campaign-sized recipient lists.
+
+Every column (name, address, number, userid) is a :class:`StringColumn`:
+one ``bytes`` buffer with the UTF-8 values plus an ``array`` of offsets
+(the Arrow string layout), so a recipient costs the size of its strings
+plus 8 bytes per column instead of a graph of Python objects.
+
+Recipients are materialized as :class:`LiteRecipient` only while a chunk
+is being sent (see :meth:`RecipientBatch.chunks`).
+"""
+import csv
+from array import array
+from pathlib import PurePath
+from typing import Any, Optional, Union
+from collections.abc import Iterable, Iterator
+from .lite import LiteRecipient
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+COLUMNS = ("name", "address", "number", "userid")
+
+
+class StringColumn:
+    """StringColumn.
+
+    Append-only column of (nullable) strings backed by a contiguous buffer.
+    """
+
+    __slots__ = ("_data", "_offsets", "_nulls")
+
+    def __init__(self):
+        self._data = bytearray()
+        self._offsets = array("Q", [0])
+        self._nulls = bytearray()
+
+    def append(self, value: Union[str, list, None]) -> None:
+        """Append a value (``None`` is null, ``""`` an empty string).
+
+        A column holds one string per row: of a list of addresses or
+        numbers only the first one is kept.
+        """
+        if isinstance(value, (list, tuple)):
+            value = value[0] if value else None
+        if value is None:
+            self._nulls.append(1)
+        else:
+            self._data += str(value).encode("utf-8")
+            self._nulls.append(0)
+        self._offsets.append(len(self._data))
+
+    def __len__(self) -> int:
+        return len(self._nulls)
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        if self._nulls[index]:
+            return None
+        return self._data[self._offsets[index]:self._offsets[index + 1]].decode("utf-8")
+
+    def slice(self, start: int, stop: int) -> list:
+        """Decode rows ``start:stop`` at once (one copy of the buffer range)."""
+        offsets, nulls = self._offsets, self._nulls
+        base = offsets[start]
+        buffer = bytes(self._data[base:offsets[stop]])
+        return [
+            None if nulls[i] else buffer[offsets[i] - base:offsets[i + 1] - base].decode("utf-8")
+            for i in range(start, stop)
+        ]
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            len(self._data)
+            + self._offsets.itemsize * len(self._offsets)
+            + len(self._nulls)
+        )
+
+
+class RecipientBatch:
+    """RecipientBatch.
+
+    Columnar list of recipients accepted by ``ProviderBase.send``.
+
+    Build it with :meth:`append`/:meth:`extend` or load it with
+    :meth:`from_csv`, :meth:`from_parquet` and :meth:`from_cursor`.
+    Attributes:
+        provider: provider name set on every materialized recipient.
+    """
+
+    def __init__(self, rows: Iterable = None, provider: str = "dummy"):
+        self.provider = provider
+        self._columns = {name: StringColumn() for name in COLUMNS}
+        if rows is not None:
+            self.extend(rows)
+
+    def __repr__(self) -> str:
+        return f"<RecipientBatch: {len(self)} recipients>"
+
+    def __len__(self) -> int:
+        return len(self._columns["name"])
+
+    def __getitem__(self, index: int) -> LiteRecipient:
+        if index < 0:
+            index += len(self)
+        values = [self._columns[name][index] for name in COLUMNS]
+        return LiteRecipient(*values, provider=self.provider)
+
+    def __iter__(self) -> Iterator[LiteRecipient]:
+        for chunk in self.chunks():
+            yield from chunk
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the column buffers."""
+        return sum(column.nbytes for column in self._columns.values())
+
+    def column(self, name: str) -> StringColumn:
+        return self._columns[name]
+
+    def append(
+        self,
+        name: str = None,
+        address: str = None,
+        number: str = None,
+        userid: str = None,
+    ) -> None:
+        columns = self._columns
+        columns["name"].append(name)
+        columns["address"].append(address)
+        columns["number"].append(number)
+        columns["userid"].append(userid)
+
+    def extend(self, rows: Iterable[Union[dict, tuple, Any]]) -> None:
+        """Append rows: mappings, ``(name, address, number, userid)``
+        sequences or recipient objects (Actor, LiteRecipient)."""
+        for row in rows:
+            if isinstance(row, dict):
+                if isinstance(account := row.get("account"), dict):
+                    row = {"name": row.get("name"), **account}
+                self.append(*(row.get(name) for name in COLUMNS))
+            elif isinstance(row, (tuple, list)):
+                self.append(*row[:len(COLUMNS)])
+            else:
+                account = getattr(row, "account", None)
+                self.append(
+                    getattr(row, "name", None),
+                    *(getattr(account, name, None) or None for name in COLUMNS[1:])
+                )
+
+    def chunks(self, size: int = 1000) -> Iterator[list[LiteRecipient]]:
+        """Yield the recipients in lists of at most *size* elements."""
+        columns = [self._columns[name] for name in COLUMNS]
+        provider = self.provider
+        for start in range(0, len(self), size):
+            stop = min(start + size, len(self))
+            yield [
+                LiteRecipient(*values, provider=provider)
+                for values in zip(*(column.slice(start, stop) for column in columns))
+            ]
+
+    @classmethod
+    def from_csv(
+        cls,
+        path: Union[str, PurePath],
+        provider: str = "dummy",
+        **kwargs
+    ) -> "RecipientBatch":
+        """Load a CSV file with (some of) the ``name``, ``address``,
+        ``number`` and ``userid`` header columns.
+
+        Empty fields are loaded as nulls; extra keyword arguments are
+        passed to :class:`csv.DictReader`.
+        """
+        with open(path, newline="", encoding="utf-8") as fp:
+            rows = csv.DictReader(fp, **kwargs)
+            return cls(
+                ({key: value or None for key, value in row.items()} for row in rows),
+                provider=provider
+            )
+
+    @classmethod
+    def from_parquet(
+        cls,
+        path: Union[str, PurePath],
+        provider: str = "dummy",
+        batch_size: int = 65536
+    ) -> "RecipientBatch":
+        """Load a Parquet file (requires ``pyarrow``)."""
+        if pq is None:
+            raise RuntimeError(
+                "RecipientBatch.from_parquet requires pyarrow: pip install pyarrow"
+            )
+        batch = cls(provider=provider)
+        parquet = pq.ParquetFile(path)
+        names = [name for name in COLUMNS if name in parquet.schema_arrow.names]
+        for record in parquet.iter_batches(batch_size=batch_size, columns=names):
+            values = [
+                record.column(name).to_pylist() if name in names
+                else [None] * record.num_rows
+                for name in COLUMNS
+            ]
+            for row in zip(*values):
+                batch.append(*row)
+        return batch
+
+    @classmethod
+    def from_cursor(
+        cls,
+        cursor: Any,
+        provider: str = "dummy",
+        size: int = 10000
+    ) -> "RecipientBatch":
+        """Load the rows of an executed DB-API cursor (``fetchmany``).
+
+        Columns are matched by name using ``cursor.description``.
+        """
+        names = [column[0] for column in cursor.description]
+        index = [names.index(name) if name in names else None for name in COLUMNS]
+        batch = cls(provider=provider)
+        while rows := cursor.fetchmany(size):
+            for row in rows:
+                batch.append(*(row[i] if i is not None else None for i in index))
+        return batch
@@ -0,0 +1,191 @@
+"""LiteRecipient.
+
+Compact recipient for bulk sends.
+
+A :class:`LiteRecipient` carries only what providers read from an
+:class:`~notify.models.Actor` (name and the account destination) in
+``__slots__`` objects: no validation, no ``uuid4()`` per instance (the
+``userid`` is generated on first use) and no ``Account`` model, so
+``to.account.address`` and ``to.account.number`` keep working in the
+providers; the full ``Actor`` is only built (and cached) by
+:meth:`LiteRecipient.to_actor` when a provider needs it.
+"""
+import uuid
+from typing import Any, Optional, Union
+from collections.abc import AsyncIterator, Iterable
+from datamodel import BaseModel
+from ..models import Actor, Chat, Channel, TeamsChannel
+
+
+def _frozen(value: Any) -> Any:
+    return tuple(value) if isinstance(value, list) else value
+
+
+class LiteAccount:
+    """LiteAccount.
+
+    Account of a :class:`LiteRecipient` (the fields of an ``Account``).
+    """
+
+    __slots__ = ("address", "number", "userid", "provider", "attributes")
+    enabled: bool = True
+
+    def __init__(
+        self,
+        address: Union[str, list[str]] = None,
+        number: Union[str, list[str]] = None,
+        userid: str = "",
+        provider: str = "dummy",
+        attributes: Optional[dict] = None,
+    ):
+        self.address = address
+        self.number = number
+        self.userid = userid
+        self.provider = provider
+        self.attributes = attributes
+
+    def __repr__(self) -> str:
+        return f"<LiteAccount: {self.provider} {self.address or self.number or self.userid}>"
+
+
+class LiteRecipient:
+    """LiteRecipient.
+
+    Slots-based recipient accepted by every provider in place of an Actor.
+    Attributes:
+        name: recipient name.
+        account: the :class:`LiteAccount` (address, number, userid of the
+            provider user, provider and attributes).
+        userid: recipient id (UUID), as ``Actor.userid``.
+    """
+
+    __slots__ = ("name", "account", "_userid", "_actor")
+
+    def __init__(
+        self,
+        name: str = None,
+        address: Union[str, list[str]] = None,
+        number: Union[str, list[str]] = None,
+        userid: str = "",
+        provider: str = "dummy",
+        attributes: Optional[dict] = None,
+    ):
+        """Build a recipient; the arguments after *name* are the account
+        fields (*userid* is the provider user id, ie. a Slack user)."""
+        self.name = name
+        self.account = LiteAccount(address, number, userid, provider, attributes)
+        self._userid = None
+        self._actor = None
+
+    @property
+    def userid(self) -> uuid.UUID:
+        if self._userid is None:
+            self._userid = self._actor.userid if self._actor is not None else uuid.uuid4()
+        return self._userid
+
+    def __repr__(self) -> str:
+        return f"<LiteRecipient: {self.name} {self.account.address or self.account.number}>"
+
+    def __str__(self) -> str:
+        return f"<{self.name}: {self.userid}>"
+
+    def _key(self) -> tuple:
+        account = self.account
+        return (
+            self.name, _frozen(account.address), _frozen(account.number), account.userid
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, LiteRecipient):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LiteRecipient":
+        """Build from the dictionary form of an Actor (``{"name", "account"}``)
+        or from a flat row (``{"name", "address", "number", ...}``)."""
+        account = data.get("account") or data
+        return cls(
+            name=data.get("name"),
+            address=account.get("address"),
+            number=account.get("number"),
+            userid=account.get("userid", ""),
+            provider=account.get("provider", "dummy"),
+            attributes=account.get("attributes"),
+        )
+
+    @classmethod
+    def from_actor(cls, actor: Actor) -> "LiteRecipient":
+        account = actor.account
+        obj = cls(
+            name=actor.name,
+            address=getattr(account, "address", None),
+            number=getattr(account, "number", None),
+            userid=getattr(account, "userid", ""),
+            provider=getattr(account, "provider", "dummy"),
+            attributes=getattr(account, "attributes", None),
+        )
+        obj._actor = actor
+        return obj
+
+    def to_actor(self) -> Actor:
+        """Return the full :class:`Actor` (built once, then cached)."""
+        if self._actor is None:
+            lite = self.account
+            account = {"provider": lite.provider, "userid": lite.userid or ""}
+            if lite.address:
+                account["address"] = lite.address
+            if lite.number:
+                account["number"] = lite.number
+            if lite.attributes:
+                account["attributes"] = lite.attributes
+            kwargs = {} if self._userid is None else {"userid": self._userid}
+            self._actor = Actor(name=self.name, account=account, **kwargs)
+        return self._actor
+
+
+def as_actor(recipient: Any) -> Any:
+    """Promote a :class:`LiteRecipient` to Actor; other objects pass through."""
+    if isinstance(recipient, LiteRecipient):
+        return recipient.to_actor()
+    return recipient
+
+
+def build_recipient(entry: dict, lite: bool = False) -> Any:
+    """Build the recipient model for a dictionary, sniffing its keys.
+
+    With *lite*, actors are built as :class:`LiteRecipient`.
+    """
+    if 'chat_id' in entry:
+        return Chat(**entry)
+    elif 'team_id' in entry:
+        return TeamsChannel(**entry)
+    elif 'channel_id' in entry:
+        return Channel(**entry)
+    elif lite:
+        return LiteRecipient.from_dict(entry)
+    return Actor(**entry)
+
+
+def as_recipient(row: Any) -> Any:
+    """Convert a mapping row (dict, DB record) to a recipient.
+
+    Actor-like rows become :class:`LiteRecipient`, chats and channels models;
+    models, LiteRecipients and any other object pass through.
+    """
+    if isinstance(row, (LiteRecipient, BaseModel)):
+        return row
+    if isinstance(row, dict):
+        return build_recipient(row, lite=True)
+    if hasattr(row, "keys") and hasattr(row, "get"):
+        return build_recipient(dict(row), lite=True)
+    return row
+
+
+async def aiter_recipients(recipients: Iterable) -> AsyncIterator:
+    """Iterate a synchronous iterable from async code."""
+    for recipient in recipients:
+        yield recipient
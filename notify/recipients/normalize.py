@@ -0,0 +1,241 @@
+"""Recipient normalization.
+
+Validates, normalizes and de-duplicates recipient entries in a single pass
+before the fan-out, so invalid or repeated recipients never reach a
+provider (nor pay for a datamodel construction).
+
+* e-mail addresses: display name stripped, domain lower-cased.
+* phone numbers: E.164 (``phonenumbers`` is used when installed).
+* duplicates: detected by canonical address for the provider kind.
+"""
+import re
+from typing import Any, Optional, Union
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from email.utils import parseaddr
+from datamodel import BaseModel
+from ..conf import NOTIFY_DEFAULT_COUNTRY_CODE
+from .lite import LiteRecipient, build_recipient
+
+try:
+    import phonenumbers
+except ImportError:
+    phonenumbers = None
+
+
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s.]+$")
+PHONE_CLEANUP_RE = re.compile(r"[\s().\-/]")
+# provider kinds that can only deliver to a valid address/number.
+STRICT_KINDS = ("email", "sms")
+
+
+def normalize_email(address: str) -> Optional[str]:
+    """Return the canonical form of an e-mail address (``None`` if invalid).
+
+    ``'Name <User@Example.COM>'`` becomes ``'User@example.com'``.
+    """
+    if not isinstance(address, str):
+        return None
+    _, addr = parseaddr(address.strip())
+    if not addr or not EMAIL_RE.match(addr):
+        return None
+    local, _, domain = addr.rpartition("@")
+    return f"{local}@{domain.lower()}"
+
+
+def normalize_phone(
+    number: Union[str, int],
+    country_code: Optional[str] = NOTIFY_DEFAULT_COUNTRY_CODE
+) -> Optional[str]:
+    """Return a phone number in E.164 format (``None`` if invalid).
+
+    Numbers without international prefix are assumed to belong to
+    *country_code* (``NOTIFY_DEFAULT_COUNTRY_CODE``); without a country
+    code they are returned unchanged (the provider decides).
+    """
+    if isinstance(number, int):
+        number = str(number)
+    if not isinstance(number, str) or not number.strip():
+        return None
+    number = number.strip()
+    digits = PHONE_CLEANUP_RE.sub("", number)
+    if not country_code and not digits.startswith(("+", "00")):
+        return number if digits.isdigit() and 3 <= len(digits) <= 15 else None
+    if digits.startswith("00"):
+        number = f"+{digits[2:]}"
+    if phonenumbers is not None:
+        try:
+            region = None
+            if country_code:
+                region = phonenumbers.region_code_for_country_code(int(country_code))
+            parsed = phonenumbers.parse(number, region)
+        except (phonenumbers.NumberParseException, ValueError):
+            return None
+        if not phonenumbers.is_valid_number(parsed):
+            return None
+        return phonenumbers.format_number(
+            parsed, phonenumbers.PhoneNumberFormat.E164
+        )
+    if digits.startswith("+"):
+        digits = digits[1:]
+    elif digits.startswith("00"):
+        digits = digits[2:]
+    else:
+        digits = f"{country_code}{digits.lstrip('0')}"
+    if not digits.isdigit() or not 8 <= len(digits) <= 15:
+        return None
+    return f"+{digits}"
+
+
+@dataclass
+class RecipientReport:
+    """RecipientReport.
+
+    Result of :func:`normalize_recipients`.
+    Attributes:
+        recipients: valid and unique recipients, in their original order.
+        duplicates: entries dropped because the destination was repeated.
+        invalid: ``(entry, reason)`` of entries that couldn't be used.
+    """
+    recipients: list = field(default_factory=list)
+    duplicates: list = field(default_factory=list)
+    invalid: list[tuple[Any, str]] = field(default_factory=list)
+    _keys: list = field(default_factory=list, repr=False)
+
+    @property
+    def dropped(self) -> int:
+        return len(self.duplicates) + len(self.invalid)
+
+    def groups(self) -> dict[str, list]:
+        """Group recipients by destination (mail domain, team or kind)."""
+        groups: dict[str, list] = {}
+        for key, rcpt in zip(self._keys, self.recipients):
+            groups.setdefault(key[1], []).append(rcpt)
+        return groups
+
+
+def _get(obj: Any, name: str) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def _canonical(values: Any, normalizer: Callable, strict: bool) -> Optional[list]:
+    """Normalize one or several destinations; ``None`` when any is invalid.
+
+    Non-strict normalization keeps values that can't be normalized (ie. an
+    IM handle on the ``address`` field) as they are.
+    """
+    canonical = []
+    for value in (values if isinstance(values, list) else [values]):
+        if (normalized := normalizer(value)) is None:
+            if strict:
+                return None
+            normalized = str(value).strip()
+        canonical.append(normalized)
+    return canonical
+
+
+def _account_key(account: Any, kind: Optional[str]) -> tuple[str, str]:
+    """Canonical (key, group) of an account; normalizes dict accounts.
+
+    ``email`` providers need a valid address, ``sms`` providers a valid
+    phone number; any other kind uses the first destination available.
+    """
+    if kind != "sms" and (address := _get(account, "address")):
+        canonical = _canonical(address, normalize_email, kind == "email")
+        if canonical is None:
+            raise ValueError(f"invalid e-mail address: {address!r}")
+        if isinstance(account, dict):
+            account["address"] = canonical if isinstance(address, list) else canonical[0]
+        key = ",".join(sorted(addr.lower() for addr in canonical))
+        local, at, domain = canonical[0].rpartition("@")
+        return f"email:{key}", domain.lower() if at and local else "address"
+    if kind != "email" and (number := _get(account, "number")):
+        canonical = _canonical(number, normalize_phone, kind == "sms")
+        if canonical is None:
+            raise ValueError(f"invalid phone number: {number!r}")
+        if isinstance(account, dict):
+            account["number"] = canonical if isinstance(number, list) else canonical[0]
+        return f"phone:{','.join(sorted(canonical))}", "phone"
+    if kind not in ("email", "sms") and (userid := _get(account, "userid")):
+        return f"user:{userid}", "user"
+    if kind not in ("email", "sms") and (player := _get(account, "player_id")):
+        return f"player:{player}", "player"
+    raise ValueError(f"no {kind or 'usable'} destination in account")
+
+
+def recipient_key(recipient: Any, kind: Optional[str] = None) -> tuple[str, str]:
+    """Return the ``(dedup key, group)`` of a recipient dict or model.
+
+    Args:
+        recipient: an ``Actor``/``Chat``/``Channel``/``TeamsChannel`` or
+            its dictionary representation (dicts are normalized in place).
+        kind: provider kind (``ProviderType`` value) deciding which
+            destination is used: ``"email"`` or ``"sms"``.
+
+    Raises:
+        ValueError: when the recipient has no valid destination.
+    """
+    if (team := _get(recipient, "team_id")) and _get(recipient, "channel_id"):
+        return f"team:{team}:{_get(recipient, 'channel_id')}", f"team:{team}"
+    if chat := _get(recipient, "chat_id"):
+        return f"chat:{chat}", "chat"
+    if channel := _get(recipient, "channel_id"):
+        return f"channel:{channel}", "channel"
+    if account := _get(recipient, "account"):
+        return _account_key(account, kind)
+    raise ValueError("recipient without account, chat or channel")
+
+
+def normalize_recipients(
+    recipients: Iterable[Any],
+    kind: Optional[str] = None,
+    lite: bool = False
+) -> RecipientReport:
+    """Validate, normalize and de-duplicate a list of recipients.
+
+    Dictionaries are normalized and converted to models only when they are
+    valid and unique; models are validated and de-duplicated as they are.
+
+    Args:
+        recipients: recipient dictionaries and/or models.
+        kind: provider kind (``"email"``, ``"sms"``, ...) used to choose
+            the canonical destination.
+        lite: build :class:`LiteRecipient` instead of ``Actor`` models.
+
+    Returns:
+        RecipientReport: unique recipients plus dropped entries.
+    """
+    report = RecipientReport()
+    seen: set = set()
+    for index, entry in enumerate(recipients):
+        if isinstance(entry, dict):
+            entry = {**entry}
+            if isinstance(entry.get("account"), dict):
+                entry["account"] = {**entry["account"]}
+        elif not isinstance(entry, (BaseModel, LiteRecipient)):
+            report.invalid.append((entry, "unsupported recipient type"))
+            continue
+        try:
+            key = recipient_key(entry, kind)
+        except ValueError as exc:
+            if kind in STRICT_KINDS:
+                report.invalid.append((entry, str(exc)))
+                continue
+            # other providers may know how to reach it (ie. by name):
+            # kept, without a destination to de-duplicate on.
+            key = (f"entry:{index}", "other")
+        if key[0] in seen:
+            report.duplicates.append(entry)
+            continue
+        if isinstance(entry, dict):
+            try:
+                entry = build_recipient(entry, lite=lite)
+            except Exception as exc:  # pylint: disable=W0703
+                report.invalid.append((entry, str(exc)))
+                continue
+        seen.add(key[0])
+        report.recipients.append(entry)
+        report._keys.append(key)  # pylint: disable=W0212
+    return report
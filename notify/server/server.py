@@ -19,9 +19,13 @@ from notify.conf import (
     NOTIFY_WORKER_STREAM,
     NOTIFY_WORKER_GROUP,
     NOTIFY_DEFAULT_HOST,
-    NOTIFY_DEFAULT_PORT
+    NOTIFY_DEFAULT_PORT,
+    NOTIFY_LOOP_LAG_THRESHOLD
 )
 from notify.exceptions import NotifyException
+from notify.notify import RenderPool
+from notify.providers.shared import shutdown_providers
+from notify.providers.blocking import LoopLagMonitor
 from .queue import QueueManager
 from .wrapper import NotifyWrapper
 
@@ -59,6 +63,7 @@ class NotifyWorker:
         self.debug = debug
         self.queue = None
         self._server: Awaitable = None
+        self.loop_monitor: Optional[LoopLagMonitor] = None
         self._pid = os.getpid()
         self._new_evt = False
         self._running: bool = True
@@ -372,6 +377,13 @@ class NotifyWorker:
         self.start_redis()
         # Queue Manager.
         self.queue = QueueManager()
+        # spawn the template render processes before the first message:
+        if RenderPool is not None:
+            await RenderPool.start()
+        # flag anything that still blocks the event loop:
+        if NOTIFY_LOOP_LAG_THRESHOLD > 0:
+            self.loop_monitor = LoopLagMonitor(threshold=NOTIFY_LOOP_LAG_THRESHOLD)
+            self.loop_monitor.start()
         # Subscription Manager:
         self.subscription_task = self._loop.create_task(
             self.start_subscription()
@@ -443,6 +455,8 @@ class NotifyWorker:
             self.logger.debug(
                 'Shutting down Notify Service.'
             )
+        if self.loop_monitor is not None:
+            await self.loop_monitor.stop()
         # forcing close the queue
         try:
             await self.queue.empty_queue()
@@ -487,6 +501,10 @@ class NotifyWorker:
                 f"Error closing Notify Worker: {exc}"
             ) from exc
         finally:
+            # shared provider clients (HTTP sessions, SDK clients):
+            await shutdown_providers()
+            if RenderPool is not None:
+                RenderPool.close()
             self.logger.debug(
                 'Notify Service stopped.'
             )
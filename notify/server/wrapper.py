@@ -6,10 +6,10 @@ Any other wrapper extends this.
 from typing import Any
 from collections.abc import Coroutine, Callable
 import uuid
-from datamodel import BaseModel
 from navconfig.logging import logging
 from notify import Notify
-from notify.models import Actor, Chat, Channel, TeamsChannel
+from notify.notify import PROVIDERS, LoadProvider
+from notify.recipients import normalize_recipients
 
 
 coro = Callable[[int], Coroutine[Any, Any, str]]
@@ -41,22 +41,17 @@ class NotifyWrapper:
         self._id = str(uuid.uuid4())
         self.recipients: list = []
         recipients = kwargs.pop('recipient', [])
-        rcpt = []
-        for recipient in recipients:
-            if isinstance(recipient, dict):
-                if 'chat_id' in recipient:
-                    rcpt.append(Chat(**recipient))
-                elif 'team_id' in recipient:
-                    rcpt.append(TeamsChannel(**recipient))
-                elif 'channel_id' in recipient:
-                    rcpt.append(Channel(**recipient))
-                else:
-                    rcpt.append(Actor(**recipient))
-            elif isinstance(recipient, BaseModel):
-                rcpt.append(recipient)
-            else:
-                print(f'Recipient {recipient} discarded.')
-        self.recipients = rcpt
+        # validate, normalize and de-duplicate before building the models:
+        self.report = normalize_recipients(
+            recipients, kind=self._provider_kind(provider)
+        )
+        for entry, reason in self.report.invalid:
+            logging.warning(f'Recipient {entry!r} discarded: {reason}')
+        if self.report.duplicates:
+            logging.debug(
+                f'{len(self.report.duplicates)} duplicated recipients discarded.'
+            )
+        self.recipients = self.report.recipients
         self.loop = None
         # provider to be handled:
         self._provider = provider
@@ -66,6 +61,16 @@ class NotifyWrapper:
     def __repr__(self):
         return f"<Notify:{self._provider!r}>"
 
+    @staticmethod
+    def _provider_kind(provider: str):
+        """Type of provider (email, sms, ...) used to pick the destination."""
+        try:
+            if provider not in PROVIDERS:
+                PROVIDERS[provider] = LoadProvider(provider)
+            return PROVIDERS[provider].provider_type.value
+        except Exception:  # pylint: disable=W0703
+            return None
+
     async def call(self):
         try:
             notify: coro = Notify(self._provider, **self.kwargs)
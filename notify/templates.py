@@ -1,7 +1,12 @@
+import os
+import pickle
+import asyncio
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from navconfig import config
+from navconfig.logging import logging
 from jinja2 import Environment, FileSystemLoader, TemplateError, TemplateNotFound
 
 jinja_config = {
@@ -20,12 +25,11 @@ class TemplateParser:
     def __init__(
         self,
         directory: Path,
-        filters: Optional[list] = None,
+        filters: Optional[dict] = None,
         **kwargs
     ):
-        self.template = None
         self.path = directory.resolve()
-        self.filters = filters
+        self.filters: dict = dict(filters or {})
         if not self.path.exists():
             raise RuntimeError(
                 f"Notify: template directory {directory} does not exist"
@@ -61,7 +65,7 @@ class TemplateParser:
                 f"Notify: Error loading Template Environment: {err}"
             ) from err
         ### adding custom filters:
-        if self.filters is not None:
+        if self.filters:
             self.env.filters.update(self.filters)
 
     def get_template(self, filename: str):
@@ -69,8 +73,7 @@ class TemplateParser:
         Get a template from Template Environment using the Filename.
         """
         try:
-            self.template = self.env.get_template(str(filename))
-            return self.template
+            return self.env.get_template(str(filename))
         except TemplateNotFound as ex:
             raise FileNotFoundError(
                 f"Template cannot be found: {filename}"
@@ -87,13 +90,14 @@ class TemplateParser:
     def add_filter(self, func: Callable, name: Optional[str] = None) -> None:
         """add_filter.
         Register a custom function as Template Filter.
+
+        A running RenderExecutor built from ``self.filters`` only sees the
+        new filter after its pool is restarted (``close()`` then ``start()``).
         """
-        if name is not None:
-            filter_name = name
-        elif callable(func):
-            filter_name = name.__name__
-        else:
+        if not callable(func):
             raise TypeError(f"Template Filter must be a callable function: {func!r}")
+        filter_name = name if name is not None else func.__name__
+        self.filters[filter_name] = func
         self.env.filters[filter_name] = func
 
     def render(self, filename: str, params: Optional[dict] = None) -> str:
@@ -101,8 +105,8 @@ class TemplateParser:
             params = {}
         result = None
         try:
-            self.template = self.env.get_template(str(filename))
-            result = self.template.render(**params)
+            template = self.env.get_template(str(filename))
+            result = template.render(**params)
             return result
         except Exception as err:
             raise RuntimeError(
@@ -128,3 +132,202 @@ class TemplateParser:
             raise RuntimeError(
                 f"NAV: Error rendering: {filename}, error: {err}"
             ) from err
+
+
+## Process-pool rendering:
+# jinja Environment living in every render worker process.
+_worker_env: Optional[Environment] = None
+
+
+def _init_render_worker(
+    directory: str,
+    filters: Optional[dict] = None,
+    warm: Optional[list] = None
+) -> None:
+    """Build the worker's template Environment (sync rendering)."""
+    global _worker_env  # pylint: disable=W0603
+    env_config = {
+        **jinja_config,
+        "enable_async": False,
+        "extensions": list(jinja_config["extensions"])
+    }
+    _worker_env = Environment(
+        loader=FileSystemLoader(searchpath=[directory]), **env_config
+    )
+    if filters:
+        _worker_env.filters.update(filters)
+    # pre-compile the templates we know will be used:
+    for name in warm or []:
+        _worker_env.get_template(name)
+
+
+def _worker_ready() -> bool:
+    return _worker_env is not None
+
+
+def _render_batch(filename: str, contexts: list[dict]) -> list[tuple[bool, Any]]:
+    """Render a template once per context, inside a worker process."""
+    results = []
+    try:
+        template = _worker_env.get_template(filename)
+    except Exception as exc:  # pylint: disable=W0703
+        error = f"Error parsing Template {filename}: {exc}"
+        return [(False, error)] * len(contexts)
+    for params in contexts:
+        try:
+            results.append((True, template.render(**params)))
+        except Exception as exc:  # pylint: disable=W0703
+            results.append(
+                (False, f"Error rendering template: {filename}, error: {exc}")
+            )
+    return results
+
+
+class _Unpicklable(Exception):
+    """The batch of a context couldn't be sent to the workers."""
+
+
+class RenderExecutor:
+    """RenderExecutor.
+
+    Renders templates on a pool of processes, each one with a pre-warmed
+    Jinja2 Environment, so CPU-heavy templates don't block the event loop.
+
+    Concurrent ``render()`` calls for the same template (as produced by a
+    send fan-out) are coalesced and shipped to the pool in batches of up to
+    ``batch_size`` contexts, amortizing the inter-process round trip.
+    ``filters`` must be picklable (module-level functions); they are read
+    when the pool is (re)started, so a filter added later needs a
+    ``close()`` before it reaches the workers.  Contexts that can't be
+    pickled (ie. live clients, lambdas) are rendered in-process with the
+    ``template`` given to :meth:`render`.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_workers: Optional[int] = None,
+        batch_size: int = 32,
+        filters: Optional[dict] = None,
+        warm: Optional[list] = None
+    ):
+        self.path = directory.resolve()
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self._filters = filters
+        self._warm = warm or []
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending: dict[str, list] = {}
+        self.logger = logging.getLogger('Notify.RenderExecutor')
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_render_worker,
+                initargs=(str(self.path), self._filters, self._warm)
+            )
+        return self._pool
+
+    async def start(self) -> None:
+        """Spawn (and warm up) every worker process ahead of the first send."""
+        loop = asyncio.get_running_loop()
+        workers = self.max_workers or os.cpu_count() or 1
+        await asyncio.gather(*[
+            loop.run_in_executor(self.pool, _worker_ready)
+            for _ in range(workers)
+        ])
+
+    def close(self) -> None:
+        """Shut the process pool down, cancelling queued batches."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def render(
+        self,
+        filename: str,
+        params: Optional[dict] = None,
+        template: Any = None
+    ) -> str:
+        """Render a template on the pool.
+
+        The call is queued and flushed with any other pending render of the
+        same template on the next loop iteration (or when the batch is full).
+        When the batch can't be pickled, *template* (the async Jinja2
+        template of *filename*) renders it in-process instead.
+        """
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        params = params or {}
+        queue = self._pending.setdefault(filename, [])
+        queue.append((params, fut))
+        if len(queue) >= self.batch_size:
+            self._flush(filename)
+        elif len(queue) == 1:
+            loop.call_soon(self._flush, filename)
+        try:
+            return await fut
+        except _Unpicklable as exc:
+            if template is None:
+                raise RuntimeError(
+                    f"Notify: Error rendering template: {filename}, error: {exc}"
+                ) from exc
+            return await template.render_async(**params)
+
+    async def render_many(self, filename: str, contexts: list[dict]) -> list[str]:
+        """Render the same template for a list of contexts, preserving order."""
+        return await asyncio.gather(
+            *[self.render(filename, params) for params in contexts]
+        )
+
+    def _flush(self, filename: str) -> None:
+        batch = self._pending.pop(filename, None)
+        if not batch:
+            return
+        contexts = [params for params, _ in batch]
+        futures = [fut for _, fut in batch]
+        try:
+            loop = asyncio.get_running_loop()
+            task = loop.run_in_executor(
+                self.pool, _render_batch, str(filename), contexts
+            )
+        except Exception as exc:  # pylint: disable=W0703
+            for fut in futures:
+                if not fut.done():
+                    fut.set_exception(
+                        RuntimeError(f"Notify: Error rendering template: {filename}, error: {exc}")
+                    )
+            return
+        task.add_done_callback(
+            lambda done: self._resolve(filename, futures, done)
+        )
+
+    def _resolve(self, filename: str, futures: list, done: asyncio.Future) -> None:
+        if done.cancelled() or done.exception() is not None:
+            exc = None if done.cancelled() else done.exception()
+            # rendering errors are returned by the workers: a raised
+            # TypeError/AttributeError comes from pickling the batch.
+            unpicklable = isinstance(
+                exc, (pickle.PicklingError, TypeError, AttributeError)
+            )
+            for fut in futures:
+                if fut.done():
+                    continue
+                if unpicklable:
+                    fut.set_exception(_Unpicklable(str(exc)))
+                else:
+                    fut.set_exception(
+                        RuntimeError(
+                            f"Notify: Error rendering template: {filename}, error: {exc}"
+                        )
+                    )
+            return
+        for fut, (ok, value) in zip(futures, done.result()):
+            if fut.done():
+                continue
+            if ok:
+                fut.set_result(value)
+            else:
+                fut.set_exception(RuntimeError(value))
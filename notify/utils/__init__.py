@@ -1,6 +1,12 @@
 from .functions import cPrint, Msg
+from .formatter import CompiledFormat, compile_format, format_message
+from .ratelimit import RateLimiter
 
 __all__ = (
     "cPrint",
     "Msg",
+    "CompiledFormat",
+    "compile_format",
+    "format_message",
+    "RateLimiter",
 )
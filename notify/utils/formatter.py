@@ -0,0 +1,110 @@
+"""Formatter.
+
+Compiled ``str.format`` templates for non-template (plain string) messages.
+
+A message is parsed once with :meth:`string.Formatter.parse`; the compiled
+version keeps the literal chunks and the replacement slots, so formatting a
+message for every recipient only resolves the fields and joins the parts.
+Missing fields are kept verbatim (like ``format_map(SafeDict(...))``), which
+allows partial formatting in several steps.
+"""
+from typing import Any, Optional
+from collections.abc import Mapping
+from functools import lru_cache
+from string import Formatter
+from _string import formatter_field_name_split  # pylint: disable=E0401
+
+
+_parser = Formatter()
+_CONVERSIONS = {"r": repr, "s": str, "a": ascii}
+
+
+class CompiledFormat:
+    """CompiledFormat.
+
+    A pre-parsed format string.  Use :func:`compile_format` to get one.
+    Attributes:
+        template: the original format string.
+        fields: top-level names referenced by the replacement fields.
+    """
+
+    __slots__ = ("template", "fields", "_parts", "_slots")
+
+    def __init__(self, template: str, parts: list, slots: tuple):
+        self.template = template
+        self._parts = parts
+        self._slots = slots
+        self.fields = frozenset(slot[1] for slot in slots)
+
+    def __repr__(self) -> str:
+        return f"<CompiledFormat: {self.template!r}>"
+
+    def format_map(self, mapping: Mapping) -> str:
+        """Substitute the fields available on *mapping*."""
+        parts = self._parts.copy()
+        for index, first, chain, conversion, spec in self._slots:
+            try:
+                obj = mapping[first]
+                for is_attr, key in chain:
+                    obj = getattr(obj, key) if is_attr else obj[key]
+            except (KeyError, AttributeError, IndexError, TypeError):
+                # keep the replacement field (and its spec) untouched.
+                continue
+            if conversion:
+                obj = _CONVERSIONS[conversion](obj)
+            parts[index] = format(obj, spec) if spec else str(obj)
+        return "".join(parts)
+
+    def format(self, **kwargs) -> str:
+        return self.format_map(kwargs)
+
+
+@lru_cache(maxsize=512)
+def compile_format(template: str) -> Optional[CompiledFormat]:
+    """Parse and cache a format string.
+
+    Returns ``None`` when *template* can't be used as a named-fields
+    format string: invalid syntax, positional fields (``{}``, ``{0}``)
+    or nested fields inside a format spec.
+    """
+    parts: list = []
+    slots: list = []
+    try:
+        for literal, field, spec, conversion in _parser.parse(template):
+            if literal:
+                parts.append(literal)
+            if field is None:
+                continue
+            if spec and "{" in spec:
+                return None
+            if conversion is not None and conversion not in _CONVERSIONS:
+                return None
+            first, rest = formatter_field_name_split(field)
+            if not first or isinstance(first, int):
+                return None
+            raw = "{" + field
+            if conversion:
+                raw += "!" + conversion
+            if spec:
+                raw += ":" + spec
+            raw += "}"
+            slots.append(
+                (len(parts), first, tuple(rest), conversion, spec)
+            )
+            parts.append(raw)
+    except ValueError:
+        return None
+    return CompiledFormat(template, parts, tuple(slots))
+
+
+def format_message(message: Any, **kwargs) -> Any:
+    """Format *message* with *kwargs*, keeping unknown fields as-is.
+
+    Non-string messages and strings that aren't valid named-fields format
+    strings are returned unchanged.
+    """
+    if not isinstance(message, str):
+        return message
+    if (compiled := compile_format(message)) is None:
+        return message
+    return compiled.format_map(kwargs)
@@ -0,0 +1,34 @@
+"""RateLimiter.
+
+Spread API calls so that no more than ``rate`` units per second are sent.
+"""
+import asyncio
+
+
+class RateLimiter:
+    """RateLimiter.
+
+    Async pacing for quota-limited APIs (ie. SES "MaxSendRate").
+    ``acquire(n)`` reserves *n* units and waits until they fit in the rate;
+    reservations are served in order.  A ``rate`` of 0 disables the limit.
+    """
+
+    __slots__ = ("rate", "_next", "_lock")
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._next: float = 0.0
+        self._lock = asyncio.Lock()
+
+    def __repr__(self) -> str:
+        return f"<RateLimiter: {self.rate}/s>"
+
+    async def acquire(self, units: int = 1) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            start = max(now, self._next)
+            self._next = start + units / self.rate
+        if (delay := start - now) > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,44 @@
+"""Blocking provider calls on the shared executor, and loop-lag monitoring."""
+import asyncio
+import threading
+import time
+import pytest
+from notify.providers.blocking import LoopLagMonitor, blocking_call
+
+
+class _Client:
+    # like providers: the attribute must not shadow the decorator.
+    blocking: str = 'asyncio'
+
+    def __init__(self):
+        self.threads = []
+
+    @blocking_call
+    def fetch(self, value):
+        self.threads.append(threading.current_thread().name)
+        time.sleep(0.05)
+        return value * 2
+
+
+@pytest.mark.asyncio
+async def test_blocking_method_runs_off_the_loop():
+    client = _Client()
+    monitor = LoopLagMonitor(threshold=30, interval=0.01)
+    monitor.start()
+    results = await asyncio.gather(*(client.fetch(i) for i in range(4)))
+    await monitor.stop()
+    assert results == [0, 2, 4, 6]
+    assert all(name.startswith("notify-blocking") for name in client.threads)
+    assert monitor.stalls == 0
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_flags_blocking_calls():
+    monitor = LoopLagMonitor(threshold=30, interval=0.01)
+    monitor.start()
+    await asyncio.sleep(0.02)
+    time.sleep(0.1)  # blocks the event loop
+    await asyncio.sleep(0.02)
+    await monitor.stop()
+    assert monitor.stalls >= 1
+    assert monitor.max_lag >= 50
@@ -0,0 +1,23 @@
+"""Dialpad batched SMS (:mod:`notify.providers.dialpad`)."""
+import pytest
+from notify.providers.dialpad import Dialpad
+
+
+def _rows():
+    for number in ("+15550001", "+15550002", "+15550003"):
+        yield {"name": number, "account": {"provider": "dialpad", "number": number}}
+
+
+@pytest.mark.asyncio
+async def test_generator_recipients_are_batched_and_mapped_per_number():
+    sms = Dialpad(token="token", from_number="+15559999")
+    posts = []
+
+    async def post_sms(numbers, text):
+        posts.append(numbers)
+        # Dialpad only accepted two of the numbers:
+        return {"id": 1, "message_status": "pending", "to_numbers": numbers[:2]}
+    sms._post_sms_ = post_sms
+    results = await sms.send(_rows(), "hello", batch=True)
+    assert posts == [["+15550001", "+15550002", "+15550003"]]
+    assert [r["status"] for r in results] == ["pending", "pending", "failed"]
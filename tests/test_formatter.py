@@ -0,0 +1,32 @@
+"""Compiled message formatting (:mod:`notify.utils.formatter`)."""
+from types import SimpleNamespace
+import pytest
+from notify.utils.formatter import compile_format, format_message
+
+
+RECIPIENT = SimpleNamespace(name="Ana", account={"address": "ana@example.com"})
+
+
+def test_compiled_format_resolves_attributes_and_items():
+    fmt = compile_format("Hi {recipient.name} <{recipient.account[address]}> #{n:03d}")
+    assert fmt.fields == {"recipient", "n"}
+    assert fmt.format(recipient=RECIPIENT, n=7) == "Hi Ana <ana@example.com> #007"
+
+
+def test_missing_fields_are_kept_verbatim():
+    fmt = compile_format("{greeting} {recipient.name} {count:>4} {{literal}}")
+    assert fmt.format(greeting="Hello") == "Hello {recipient.name} {count:>4} {literal}"
+    # partial formatting can be chained:
+    assert compile_format(fmt.format(greeting="Hello")).format(
+        recipient=RECIPIENT
+    ) == "Hello Ana {count:>4} {literal}"
+
+
+@pytest.mark.parametrize("message", ["{}", "{0} items", "unbalanced {", "{a:{b}}"])
+def test_unsupported_format_strings(message):
+    assert compile_format(message) is None
+    assert format_message(message, a=1) == message
+
+
+def test_compile_format_is_cached():
+    assert compile_format("Hi {name}") is compile_format("Hi {name}")
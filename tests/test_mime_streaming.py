@@ -0,0 +1,100 @@
+"""Offline tests for streamed (constant-memory) attachments.
+
+Streamed parts are attached with ``stream=True`` and encoded from disk by
+:func:`notify.providers._mime_utils.iter_message_bytes`; the wire bytes are
+un-stuffed, parsed back with ``BytesParser`` and compared to the source file.
+"""
+import os
+from email.mime.text import MIMEText
+from email.parser import BytesParser
+from email.policy import default as policy_default
+from pathlib import Path
+
+import pytest
+
+from notify.providers import _mime_utils as mu
+
+
+@pytest.fixture
+def big_file(tmp_path: Path):
+    """A binary file spanning several (non line-aligned) stream chunks."""
+    f = tmp_path / "informe_año.bin"
+    f.write_bytes(os.urandom(mu.B64_LINE_BYTES * 300 + 13))
+    return f
+
+
+def _parse_wire(msg, chunk_size=mu.STREAM_CHUNK_SIZE):
+    wire = b"".join(mu.iter_message_bytes(msg, chunk_size=chunk_size))
+    # undo the SMTP dot-stuffing the server would strip:
+    return wire, BytesParser(policy=policy_default).parsebytes(
+        wire.replace(b"\r\n..", b"\r\n.")
+    )
+
+
+def test_attach_file_stream_defers_read(big_file: Path):
+    """A streamed part only holds a placeholder until serialisation."""
+    msg = mu.build_alternative_message(sender="a@b", to="u@b", subject="x")
+    mu.attach_file(msg, big_file, stream=True)
+    assert mu.has_streaming_parts(msg)
+    part = msg.get_payload()[-1]
+    assert len(part.get_payload()) < 100
+
+
+def test_attach_file_stream_missing_file(tmp_path: Path):
+    """Missing files still fail at attach time, not while sending."""
+    msg = mu.build_alternative_message(sender="a@b", to="u@b", subject="x")
+    with pytest.raises(FileNotFoundError):
+        mu.attach_file(msg, tmp_path / "missing.pdf", stream=True)
+
+
+def test_iter_message_bytes_roundtrip(big_file: Path):
+    """Streamed attachment decodes to the original bytes, with CRLF and dot-stuffing."""
+    msg = mu.build_alternative_message(sender="a@b", to="u@b", subject="x")
+    msg.attach(MIMEText(".starts with a dot", "plain", "us-ascii"))
+    mu.attach_file(msg, big_file, stream=True)
+    wire, parsed = _parse_wire(msg, chunk_size=1000)
+    assert b"\n" not in wire.replace(b"\r\n", b"")
+    assert b"\r\n..starts with a dot" in wire
+    attachments = [
+        p for p in parsed.walk()
+        if p.get_content_disposition() == "attachment"
+    ]
+    assert len(attachments) == 1
+    assert attachments[0].get_filename() == "informe_año.bin"
+    assert attachments[0].get_payload(decode=True) == big_file.read_bytes()
+
+
+def test_iter_message_bytes_empty_file(tmp_path: Path):
+    """Zero-length files can't be memory-mapped but still stream."""
+    f = tmp_path / "empty.txt"
+    f.write_bytes(b"")
+    msg = mu.build_alternative_message(sender="a@b", to="u@b", subject="x")
+    mu.attach_file(msg, f, stream=True)
+    _, parsed = _parse_wire(msg)
+    attachment = next(
+        p for p in parsed.walk()
+        if p.get_content_disposition() == "attachment"
+    )
+    assert attachment.get_payload(decode=True) == b""
+
+
+def test_envelope_addresses():
+    """Envelope is taken from the (RFC 2047 encoded) From/To headers."""
+    msg = mu.build_alternative_message(
+        sender="Sr. Ñoño <s@example.com>",
+        to=["a@example.com", "Bé <b@example.com>"],
+        subject="x",
+    )
+    sender, recipients = mu.envelope_addresses(msg)
+    assert sender == "s@example.com"
+    assert recipients == ["a@example.com", "b@example.com"]
+
+
+def test_iter_message_bytes_drops_bcc(big_file: Path):
+    """Bcc stays in the envelope, never in the DATA sent to every recipient."""
+    msg = mu.build_alternative_message(sender="a@b", to="u@b", subject="x")
+    msg["Bcc"] = "hidden@b"
+    mu.attach_file(msg, big_file, stream=True)
+    wire, parsed = _parse_wire(msg)
+    assert b"hidden@b" not in wire and parsed["Bcc"] is None
+    assert "hidden@b" in mu.envelope_addresses(msg)[1]
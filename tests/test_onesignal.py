@@ -0,0 +1,50 @@
+"""OneSignal batched push (:mod:`notify.providers.onesignal`)."""
+from types import SimpleNamespace
+import pytest
+from notify.models import Actor
+from notify.providers.onesignal import Onesignal
+
+
+class _Client:
+    def __init__(self):
+        self.bodies = []
+
+    async def send_notification(self, body):
+        self.bodies.append(body)
+        players = body["include_player_ids"]
+        if "bad" in players:
+            return SimpleNamespace(
+                status_code=200,
+                body={"id": "n-1", "errors": {"invalid_player_ids": ["bad"]}}
+            )
+        if body["contents"]["en"] == "fail":
+            return SimpleNamespace(status_code=400, body={"errors": ["Message Notifications must have English language content"]})
+        return SimpleNamespace(status_code=200, body={"id": f"n-{len(self.bodies)}"})
+
+
+def _actor(player):
+    return Actor(name=player, account={"userid": player})
+
+
+@pytest.mark.asyncio
+async def test_recipients_are_chunked_and_errors_mapped(monkeypatch):
+    from notify.providers.onesignal import onesignal
+    monkeypatch.setattr(onesignal, "ONESIGNAL_MAX_PLAYERS", 2)
+    push = Onesignal(app_id="app", api_key="key")
+    push.client = _Client()
+    recipients = [_actor(p) for p in ("a", "b", "c", "bad", "d")]
+    # generators are accepted (and pulled lazily) too:
+    results = await push.send((to for to in recipients), "hello", batch=True)
+    assert len(push.client.bodies) == 3
+    assert all(len(b["include_player_ids"]) <= 2 for b in push.client.bodies)
+    assert [r["player_id"] for r in results] == ["a", "b", "c", "bad", "d"]
+    assert results[3]["status"] == "failed"
+    assert all(r["status"] == "sent" for i, r in enumerate(results) if i != 3)
+
+
+@pytest.mark.asyncio
+async def test_a_rejected_notification_fails_all_its_players():
+    push = Onesignal(app_id="app", api_key="key")
+    push.client = _Client()
+    results = await push.send([_actor("a"), _actor("b")], "fail", batch=True)
+    assert [r["status"] for r in results] == ["failed", "failed"]
@@ -0,0 +1,63 @@
+"""Columnar recipient batches (:class:`notify.recipients.RecipientBatch`)."""
+import sqlite3
+from notify.recipients import LiteRecipient, RecipientBatch, StringColumn
+
+
+def test_batch_from_csv_and_chunks(tmp_path):
+    path = tmp_path.joinpath("campaign.csv")
+    path.write_text(
+        "name,address,number\n"
+        "Jesus,jlara@example.com,\n"
+        "Ana,,+34692810005\n"
+        "Carl,carl@example.com,+12127365000\n"
+    )
+    batch = RecipientBatch.from_csv(path, provider="email")
+    assert len(batch) == 3
+    chunks = list(batch.chunks(2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    first, second = chunks[0]
+    assert isinstance(first, LiteRecipient)
+    assert first.account.address == "jlara@example.com"
+    assert first.account.number is None
+    assert second.account.number == "+34692810005"
+    assert batch[-1].name == "Carl"
+    assert batch[-1].account.provider == "email"
+
+
+def test_batch_from_cursor():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("create table users (id integer, address text, name text)")
+    conn.executemany(
+        "insert into users values (?, ?, ?)",
+        [(i, f"user{i}@example.com", f"User ñ{i}") for i in range(2500)],
+    )
+    batch = RecipientBatch.from_cursor(
+        conn.execute("select * from users"), size=1000
+    )
+    assert len(batch) == 2500
+    assert [r.name for r in batch][-1] == "User ñ2499"
+    # strings plus offsets, far from an object graph per recipient:
+    assert batch.nbytes / len(batch) < 80
+
+
+def test_batch_extend_with_objects():
+    batch = RecipientBatch([
+        {"name": "Jesus", "account": {"address": "jlara@example.com"}},
+        ("Ana", None, "+34692810005"),
+        LiteRecipient("Carl", userid="U123"),
+    ])
+    assert [
+        (r.name, r.account.address, r.account.number, r.account.userid) for r in batch
+    ] == [
+        ("Jesus", "jlara@example.com", None, None),
+        ("Ana", None, "+34692810005", None),
+        ("Carl", None, None, "U123"),
+    ]
+
+
+def test_column_keeps_empty_strings_and_first_of_lists():
+    column = StringColumn()
+    for value in (None, "", ["a@example.com", "b@example.com"], []):
+        column.append(value)
+    assert [column[i] for i in range(4)] == [None, "", "a@example.com", None]
+    assert column.slice(0, 4) == [None, "", "a@example.com", None]
@@ -0,0 +1,107 @@
+"""Recipient normalization and de-duplication before fan-out."""
+from notify.models import Actor, Chat
+from notify.recipients import (
+    LiteRecipient,
+    as_actor,
+    normalize_email,
+    normalize_phone,
+    normalize_recipients,
+    recipient_key,
+)
+
+
+def test_normalize_email():
+    assert normalize_email("Jesus <jlara@Example.COM>") == "jlara@example.com"
+    assert normalize_email(" user@domain.org ") == "user@domain.org"
+    assert normalize_email("not-an-address") is None
+    assert normalize_email("user@localhost") is None
+
+
+def test_normalize_phone():
+    assert normalize_phone("+34 692 81 00 05") == "+34692810005"
+    assert normalize_phone("0034692810005") == "+34692810005"
+    assert normalize_phone("(212) 736-5000", country_code="1") == "+12127365000"
+    assert normalize_phone("12") is None
+    # without a country code national numbers are left as they are:
+    assert normalize_phone(" (212) 736-5000", country_code=None) == "(212) 736-5000"
+
+
+def test_email_recipients_are_deduplicated_and_grouped():
+    report = normalize_recipients(
+        [
+            {"name": "Jesus", "account": {"address": "jlara@Example.com"}},
+            {"name": "Lara", "account": {"address": "JLARA@example.com"}},
+            {"name": "Ana", "account": {"address": "ana@other.org"}},
+            {"name": "Nobody", "account": {"address": "nobody"}},
+            {"name": "Phone", "account": {"number": "+34692810005"}},
+            "garbage",
+        ],
+        kind="email",
+    )
+    assert [r.name for r in report.recipients] == ["Jesus", "Ana"]
+    assert all(isinstance(r, Actor) for r in report.recipients)
+    assert report.recipients[0].account.address == "jlara@example.com"
+    assert len(report.duplicates) == 1
+    assert len(report.invalid) == 3
+    assert report.dropped == 4
+    assert set(report.groups()) == {"example.com", "other.org"}
+
+
+def test_sms_recipients_use_e164_numbers():
+    report = normalize_recipients(
+        [
+            {"name": "A", "account": {"number": "+34 692 810 005"}},
+            {"name": "B", "account": {"number": "0034692810005"}},
+        ],
+        kind="sms",
+    )
+    assert len(report.recipients) == 1
+    assert report.recipients[0].account.number == "+34692810005"
+
+
+def test_entries_without_destination_are_all_kept():
+    report = normalize_recipients([{"name": "A"}, {"name": "B"}, {"name": "C"}])
+    assert [r.name for r in report.recipients] == ["A", "B", "C"]
+    assert not report.duplicates
+    # OneSignal players are de-duplicated by their player id:
+    assert recipient_key({"account": {"player_id": "p1"}}) == ("player:p1", "player")
+
+
+def test_models_and_chats_are_kept():
+    actor = Actor(name="Jesus", account={"address": "jlara@example.com"})
+    report = normalize_recipients(
+        [actor, {"chat_id": "123"}, {"chat_id": "123"}, actor]
+    )
+    assert report.recipients[0] is actor
+    assert isinstance(report.recipients[1], Chat)
+    assert len(report.duplicates) == 2
+
+
+def test_lite_recipients_are_built_and_promoted():
+    report = normalize_recipients(
+        [
+            {"name": "Jesus", "account": {"address": "jlara@Example.com"}},
+            {"name": "Jesus", "account": {"address": "jlara@example.com"}},
+        ],
+        kind="email",
+        lite=True,
+    )
+    (lite,) = report.recipients
+    assert isinstance(lite, LiteRecipient)
+    assert lite.account.address == "jlara@example.com"
+    actor = lite.to_actor()
+    assert isinstance(actor, Actor)
+    assert actor.account.address == "jlara@example.com"
+    assert lite.to_actor() is actor
+    assert as_actor(lite) is actor
+    assert lite.userid == actor.userid
+
+
+def test_lite_recipients_hash_like_they_compare():
+    ana = LiteRecipient("Ana", address=["ana@example.com"], userid="U1")
+    same = LiteRecipient("Ana", address=["ana@example.com"], userid="U1")
+    assert ana == same and len({ana, same}) == 1
+    assert ana != LiteRecipient("Ana", address=["ana@example.com"], userid="U2")
+    # the recipient id is the Actor one (a UUID), not the account userid:
+    assert ana.account.userid == "U1"
+    assert str(ana) == f"<Ana: {ana.userid}>"
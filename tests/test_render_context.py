@@ -0,0 +1,61 @@
+"""Concurrent ``send()`` calls on a single provider keep their own template."""
+import asyncio
+import contextvars
+from jinja2 import Environment, DictLoader
+import pytest
+from notify.providers.base import ProviderBase
+
+
+TEMPLATES = Environment(
+    loader=DictLoader({
+        "hello.txt": "Hello {{ recipient }}",
+        "bye.txt": "Bye {{ recipient }}",
+    }),
+    enable_async=True,
+)
+
+
+class _Stub(ProviderBase):
+    provider = "stub"
+    blocking = "asyncio"
+
+    async def connect(self, *args, **kwargs):
+        pass
+
+    async def close(self):
+        pass
+
+    async def _send_(self, to, message, subject=None, **kwargs):
+        # let the other send() run its _prepare_ in between:
+        await asyncio.sleep(0.01)
+        return await self._render_(to, message, subject=subject)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sends_do_not_share_template():
+    stub = _Stub(render_executor=None)
+    stub._tpl = TEMPLATES
+    hello, bye = await asyncio.gather(
+        stub.send(recipient=["ana", "bob"], message="", template="hello.txt"),
+        stub.send(recipient=["carl"], message="", template="bye.txt"),
+    )
+    assert sorted(hello) == ["Hello ana", "Hello bob"]
+    assert bye == ["Bye carl"]
+
+
+@pytest.mark.asyncio
+async def test_send_without_template_after_templated_send():
+    stub = _Stub(render_executor=None)
+    stub._tpl = TEMPLATES
+    await stub.send(recipient=["ana"], message="", template="hello.txt")
+    assert await stub.send(recipient=["ana"], message="plain") == ["plain"]
+
+
+@pytest.mark.asyncio
+async def test_providers_do_not_grow_the_task_context():
+    before = len(contextvars.copy_context())
+    for _ in range(100):
+        stub = _Stub(render_executor=None)
+        stub._tpl = TEMPLATES
+        await stub.send(recipient=["ana"], message="", template="hello.txt")
+    assert len(contextvars.copy_context()) - before <= 2
@@ -0,0 +1,59 @@
+"""Process-pool template rendering (:class:`notify.templates.RenderExecutor`)."""
+import asyncio
+import threading
+from pathlib import Path
+import pytest
+from jinja2 import Environment, FileSystemLoader
+from notify.templates import RenderExecutor
+
+
+@pytest.fixture
+def executor(tmp_path: Path):
+    tmp_path.joinpath("report.html").write_text(
+        "{% for row in rows %}{{ row }},{% endfor %}{{ name }}"
+    )
+    tmp_path.joinpath("broken.html").write_text("{{ missing.attr }}")
+    renderer = RenderExecutor(tmp_path, max_workers=2, batch_size=4)
+    yield renderer
+    renderer.close()
+
+
+@pytest.mark.asyncio
+async def test_render_many_keeps_order(executor: RenderExecutor):
+    contexts = [{"rows": range(3), "name": f"user{i}"} for i in range(10)]
+    results = await executor.render_many("report.html", contexts)
+    assert results == [f"0,1,2,user{i}" for i in range(10)]
+
+
+@pytest.mark.asyncio
+async def test_render_error_is_raised_per_call(executor: RenderExecutor):
+    with pytest.raises(RuntimeError):
+        await executor.render("broken.html", {})
+    assert await executor.render("report.html", {"rows": [], "name": "ok"}) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_unpicklable_contexts_render_in_process(executor: RenderExecutor, tmp_path: Path):
+    env = Environment(loader=FileSystemLoader(str(tmp_path)), enable_async=True)
+    template = env.get_template("report.html")
+    results = await asyncio.gather(
+        executor.render("report.html", {"rows": [1], "name": "a", "lock": threading.Lock()}, template=template),
+        executor.render("report.html", {"rows": [2], "name": "b"}, template=template),
+    )
+    assert results == ["1,a", "2,b"]
+    with pytest.raises(RuntimeError):
+        await executor.render("report.html", {"name": "c", "lock": threading.Lock()})
+
+
+def shout(value: str) -> str:
+    return f"{value.upper()}!"
+
+
+@pytest.mark.asyncio
+async def test_workers_register_the_parser_filters(tmp_path: Path):
+    tmp_path.joinpath("greet.html").write_text("{{ name | shout }}")
+    renderer = RenderExecutor(tmp_path, max_workers=1, filters={"shout": shout})
+    try:
+        assert await renderer.render("greet.html", {"name": "ana"}) == "ANA!"
+    finally:
+        renderer.close()
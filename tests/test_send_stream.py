@@ -0,0 +1,86 @@
+"""``send()`` consuming generators and async iterators lazily."""
+import asyncio
+import pytest
+from notify.providers.base import ProviderBase
+from notify.recipients import LiteRecipient
+
+
+class _Stub(ProviderBase):
+    provider = "stub"
+    blocking = "asyncio"
+    concurrency = 2
+
+    def __init__(self, *args, **kwargs):
+        self.in_flight = 0
+        self.peak = 0
+        self.done = 0
+        super().__init__(*args, **kwargs)
+
+    async def connect(self, *args, **kwargs):
+        pass
+
+    async def close(self):
+        pass
+
+    async def _send_(self, to, message, subject=None, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        self.done += 1
+        return await self._render_(to, message, subject=subject)
+
+
+@pytest.mark.asyncio
+async def test_async_iterator_is_pulled_under_backpressure():
+    stub = _Stub(render_executor=None)
+    pulled = []
+    ahead = []
+
+    async def rows():
+        for i in range(20):
+            pulled.append(i)
+            # recipients pulled but not sent yet: in the workers, in the
+            # queue (both ``concurrency``) and this one.
+            ahead.append(len(pulled) - stub.done)
+            yield {"name": f"user{i}", "address": f"user{i}@example.com"}
+
+    results = await stub.send(
+        recipient=rows(), message="Hi {recipient.account.address}"
+    )
+    assert sorted(results) == sorted(f"Hi user{i}@example.com" for i in range(20))
+    assert stub.peak <= stub.concurrency
+    assert max(ahead) <= 2 * stub.concurrency + 1
+    assert len(pulled) == 20
+
+
+@pytest.mark.asyncio
+async def test_stream_without_collecting_results():
+    stub = _Stub(render_executor=None)
+    sent = await stub.send(
+        recipient=(LiteRecipient(f"user{i}") for i in range(50)),
+        message="Hi {recipient.name}",
+        collect=False,
+    )
+    assert sent == 50 and stub.done == 50
+
+
+@pytest.mark.asyncio
+async def test_generator_of_recipients():
+    stub = _Stub(render_executor=None)
+    results = await stub.send(
+        recipient=(LiteRecipient(f"user{i}") for i in range(5)),
+        message="Hi {recipient.name}",
+    )
+    assert sorted(results) == [f"Hi user{i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_list_sends_are_bounded_by_concurrency():
+    stub = _Stub(render_executor=None)
+    results = await stub.send(
+        recipient=[LiteRecipient(f"user{i}") for i in range(10)],
+        message="Hi {recipient.name}",
+    )
+    assert len(results) == 10
+    assert stub.peak <= stub.concurrency
@@ -1,7 +1,10 @@
-from unittest.mock import AsyncMock, patch
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from notify.models import Actor
 from notify.providers.ses import Ses
+from notify.providers.ses.clients import close_clients
 from notify.tests.base import BaseTestCase
 
 
@@ -13,6 +16,20 @@ SENDER_EMAIL = "sender@example.com"
 RECIPIENT_EMAIL = "recipient@example.com"
 
 
+def _patch_session(client):
+    """Patch aiobotocore sessions to create *client*."""
+    session = MagicMock()
+    session.create_client.return_value = client
+    return patch("notify.providers.ses.ses.get_session", return_value=session), session
+
+
+@pytest.fixture(autouse=True)
+async def reset_ses_clients():
+    # clients are cached process-wide: don't leak mocks between tests.
+    yield
+    await close_clients()
+
+
 class TestSesComponent(BaseTestCase):
     component_class = Ses
     component_params = {
@@ -38,7 +55,8 @@ class TestSesComponent(BaseTestCase):
         mock_client.__aenter__.return_value.send_raw_email.return_value = {'MessageId': 'mock_message_id'}
 
         # Patch the 'create_client' to return the mock client
-        with patch.object(self.component.session, 'create_client', return_value=mock_client):
+        patched, session = _patch_session(mock_client)
+        with patched:
             # Send the email
             response = await self.component.send(
                 recipient=[recipient],
@@ -49,31 +67,85 @@ class TestSesComponent(BaseTestCase):
             mock_client.__aenter__.return_value.send_raw_email.assert_called_once()
             assert response[0]['MessageId'] == 'mock_message_id'
 
+            # the client is created once and reused by the next send:
+            await self.component.send(
+                recipient=[recipient],
+                message="Test email body",
+                subject="Test Subject"
+            )
+            session.create_client.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_send_templated_email(self):
         # Set the use_aws_template flag to True
         self.component.use_aws_template = True
-        recipient = Actor(account={"address": RECIPIENT_EMAIL})
+        recipients = [
+            Actor(name=f"User {i}", account={"address": f"user{i}@example.com"})
+            for i in range(120)
+        ]
 
-        # Mock the client and its method
         mock_client = AsyncMock()
-        # Set the async return value correctly using awaitable return value
-        mock_client.__aenter__.return_value.send_templated_email.return_value = {'MessageId': 'mock_message_id'}
+        client = mock_client.__aenter__.return_value
+        client.get_account.return_value = {"SendQuota": {"MaxSendRate": 1000.0}}
+        client.send_bulk_email.side_effect = lambda **kw: {
+            "BulkEmailEntryResults": [
+                {"Status": "SUCCESS", "MessageId": "mock_message_id"}
+                for _ in kw["BulkEmailEntries"]
+            ]
+        }
 
-        # Patch the 'create_client' to return the mock client
-        with patch.object(self.component.session, 'create_client', return_value=mock_client):
-            # Send the templated email
+        patched, _ = _patch_session(mock_client)
+        with patched:
             response = await self.component.send(
-                recipient=[recipient],
+                recipient=iter(recipients),
                 message=None,
                 subject=None,
                 template_name="AdvancedTemplate",
-                template_data='{"name": "John", "article_titles": "Python for Beginners, AWS SES Tips"}'
+                template_data='{"article_titles": "Python for Beginners, AWS SES Tips"}'
             )
-            mock_client.__aenter__.return_value.send_templated_email.assert_called_once_with(
-                Source=SENDER_EMAIL,
-                Destination={'ToAddresses': [RECIPIENT_EMAIL]},
-                Template="AdvancedTemplate",
-                TemplateData='{"name": "John", "article_titles": "Python for Beginners, AWS SES Tips"}'
-            )
-            assert response['MessageId'] == 'mock_message_id'
+        # 120 destinations -> 50 + 50 + 20, one destination per entry:
+        calls = client.send_bulk_email.call_args_list
+        assert [len(c.kwargs["BulkEmailEntries"]) for c in calls] == [50, 50, 20]
+        first = calls[0].kwargs
+        assert first["FromEmailAddress"] == SENDER_EMAIL
+        assert first["DefaultContent"]["Template"]["TemplateName"] == "AdvancedTemplate"
+        entry = first["BulkEmailEntries"][0]
+        assert entry["Destination"] == {"ToAddresses": ["user0@example.com"]}
+        data = json.loads(
+            entry["ReplacementEmailContent"]["ReplacementTemplate"]["ReplacementTemplateData"]
+        )
+        assert data == {"name": "User 0", "email": "user0@example.com"}
+        assert len(response) == 120
+        assert response[0]['MessageId'] == 'mock_message_id'
+
+    @pytest.mark.asyncio
+    async def test_sends_share_the_account_send_rate(self):
+        self.component.use_aws_template = True
+        mock_client = AsyncMock()
+        client = mock_client.__aenter__.return_value
+        client.get_account.return_value = {"SendQuota": {"MaxSendRate": 1000.0}}
+        client.send_bulk_email.side_effect = lambda **kw: {
+            "BulkEmailEntryResults": [{"Status": "SUCCESS"} for _ in kw["BulkEmailEntries"]]
+        }
+        other = Ses(**self.component_params)
+        patched, _ = _patch_session(mock_client)
+        with patched:
+            await asyncio.gather(*[
+                provider.send(
+                    recipient=[Actor(name="A", account={"address": "a@example.com"})],
+                    template_name="Report",
+                ) for provider in (self.component, other)
+            ])
+        # one quota read, one limiter for both sends:
+        client.get_account.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_send_rate_falls_back_when_quota_is_unreadable(self):
+        from notify.providers.ses import ses
+        client = AsyncMock()
+        client.get_account.side_effect = KeyError("SendQuota")
+        assert await self.component._send_rate_(client) == ses.SES_FALLBACK_SEND_RATE
+
+    def test_address_lists_are_flattened(self):
+        recipient = Actor(account={"address": ["a@example.com", "b@example.com"]})
+        assert self.component._addresses_(recipient) == ["a@example.com", "b@example.com"]
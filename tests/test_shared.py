@@ -0,0 +1,75 @@
+"""Process-wide provider resources (:mod:`notify.providers.shared`)."""
+import asyncio
+import pytest
+from notify.providers import shared
+from notify.providers.shared import (
+    LoopRegistry,
+    http_session,
+    on_shutdown,
+    shutdown_providers,
+)
+
+
+@pytest.fixture(autouse=True)
+def shutdown_hooks():
+    # tests register (or run) hooks: keep the process-wide list intact.
+    hooks = list(shared._shutdown_hooks)
+    yield
+    shared._shutdown_hooks[:] = hooks
+
+
+@pytest.mark.asyncio
+async def test_http_session_is_shared_and_closed_on_shutdown():
+    session = http_session()
+    assert http_session() is session
+    assert session.connector.limit_per_host > 0
+    await shutdown_providers()
+    assert session.closed
+    assert http_session() is not session
+    await shutdown_providers()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_hooks_run_even_if_one_fails():
+    calls = []
+
+    @on_shutdown
+    async def broken():
+        raise RuntimeError("boom")
+
+    @on_shutdown
+    async def ok():
+        calls.append("ok")
+
+    await shutdown_providers()
+    assert calls == ["ok"]
+
+
+@pytest.mark.asyncio
+async def test_registry_creates_a_value_once():
+    created = []
+
+    async def create():
+        created.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+    registry = LoopRegistry()
+    values = await asyncio.gather(*[registry.acquire("key", create) for _ in range(5)])
+    assert len(created) == 1 and len(set(map(id, values))) == 1
+
+
+def test_registry_values_are_bound_to_their_loop():
+    closed = []
+
+    async def close(value):
+        closed.append(value)
+    registry = LoopRegistry(close=close)
+
+    async def use():
+        return registry.setdefault("key", object)
+    first = asyncio.run(use())
+    second = asyncio.run(use())
+    assert first is not second
+    assert closed == [first]
+    asyncio.run(registry.close())
+    assert closed == [first, second] and not len(registry)
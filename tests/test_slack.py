@@ -0,0 +1,68 @@
+"""Slack channel and DM resolution (:mod:`notify.providers.slack`)."""
+import pytest
+from slack_sdk.errors import SlackApiError
+from notify.models import Actor
+from notify.providers.slack import Slack
+from notify.providers.slack import slack as slack_module
+
+
+class _Client:
+    def __init__(self, channels=None, error=None):
+        self.channels = channels or []
+        self.error = error
+        self.calls = {"list": 0, "open": 0}
+        self.posted = []
+
+    async def conversations_list(self, **kwargs):
+        self.calls["list"] += 1
+        if self.error:
+            raise SlackApiError(self.error, {"ok": False, "error": self.error})
+        return {"channels": self.channels, "response_metadata": {"next_cursor": ""}}
+
+    async def conversations_open(self, users):
+        self.calls["open"] += 1
+        return {"channel": {"id": f"D{users}"}}
+
+    async def chat_postMessage(self, **kwargs):
+        self.posted.append(kwargs)
+        return kwargs
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    slack_module._channel_ids.local.clear()
+    slack_module._dm_channels.local.clear()
+
+
+def _slack(client: _Client) -> Slack:
+    slack = Slack(token="xoxb-test", team_id="T1")
+    slack.client = client
+    return slack
+
+
+@pytest.mark.asyncio
+async def test_actors_get_a_cached_direct_message():
+    slack = _slack(_Client())
+    actor = Actor(name="Ana", account={"provider": "slack", "userid": "U0000001"})
+    await slack._send_(actor, "hello")
+    await slack._send_(actor, "again")
+    assert slack.client.calls["open"] == 1
+    assert [p["channel"] for p in slack.client.posted] == ["DU0000001"] * 2
+
+
+@pytest.mark.asyncio
+async def test_channel_names_are_listed_once():
+    slack = _slack(_Client(channels=[{"name": "general", "id": "C00000001"}]))
+    assert await slack.resolve_channel("#general") == "C00000001"
+    assert await slack.resolve_channel("general") == "C00000001"
+    assert await slack.resolve_channel("C00000002") == "C00000002"
+    assert slack.client.calls["list"] == 1
+
+
+@pytest.mark.asyncio
+async def test_channels_are_posted_by_name_without_list_scope():
+    slack = _slack(_Client(error="missing_scope"))
+    assert await slack.resolve_channel("#alerts") == "alerts"
+    assert await slack.resolve_channel("alerts") == "alerts"
+    assert slack.client.calls["list"] == 1
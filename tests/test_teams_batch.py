@@ -0,0 +1,104 @@
+"""Graph $batch coalescing for Teams (:mod:`notify.providers.teams.batch`)."""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+import pytest
+from notify.exceptions import MessageError
+from notify.providers.teams import batch as graph_batch
+from notify.providers.teams import teams as teams_module
+from notify.providers.teams.batch import GraphBatcher
+from notify.providers.teams.teams import Teams
+
+
+class _Credential:
+    key = "tenant:client"
+
+    async def get_token(self, *scopes, **kwargs):
+        return SimpleNamespace(token="token", expires_on=0)
+
+
+class _Response:
+    def __init__(self, status, body, headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    async def json(self, content_type=None):
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class _Graph:
+    """Fake $batch endpoint: throttles the requests listed in ``throttle`` once."""
+
+    def __init__(self, throttle=(), fail=()):
+        self.calls = []
+        self.throttle = set(throttle)
+        self.fail = set(fail)
+
+    def post(self, url, json=None, headers=None):
+        self.calls.append(json["requests"])
+        responses = []
+        for req in json["requests"]:
+            if req["url"] in self.throttle:
+                self.throttle.discard(req["url"])
+                responses.append({"id": req["id"], "status": 429, "headers": {"Retry-After": "0"}})
+            elif req["url"] in self.fail:
+                responses.append({"id": req["id"], "status": 404, "body": {"error": {"code": "NotFound"}}})
+            else:
+                responses.append({"id": req["id"], "status": 201, "body": {"url": req["url"]}})
+        return _Response(200, {"responses": responses})
+
+
+@pytest.mark.asyncio
+async def test_posts_are_coalesced_and_demultiplexed():
+    graph = _Graph()
+    batcher = GraphBatcher(_Credential(), window=0.01)
+    with patch.object(graph_batch, "http_session", return_value=graph):
+        results = await asyncio.gather(*[
+            batcher.submit("POST", f"/chats/{i}/messages", {"body": {}}) for i in range(45)
+        ])
+    assert [r["url"] for r in results] == [f"/chats/{i}/messages" for i in range(45)]
+    assert [len(call) for call in graph.calls] == [20, 20, 5]
+
+
+@pytest.mark.asyncio
+async def test_throttled_items_are_retried_and_errors_mapped():
+    graph = _Graph(throttle={"/chats/1/messages"}, fail={"/chats/2/messages"})
+    batcher = GraphBatcher(_Credential(), window=0.01)
+    with patch.object(graph_batch, "http_session", return_value=graph):
+        results = await asyncio.gather(*[
+            batcher.submit("POST", f"/chats/{i}/messages", {"body": {}}) for i in range(3)
+        ], return_exceptions=True)
+    assert results[0] == {"url": "/chats/0/messages"}
+    assert results[1] == {"url": "/chats/1/messages"}
+    assert isinstance(results[2], MessageError)
+    assert len(graph.calls) == 2 and len(graph.calls[1]) == 1
+
+
+@pytest.mark.asyncio
+async def test_batched_404_evicts_the_cached_chat():
+    graph = _Graph(fail={"/chats/gone/messages"})
+    teams = Teams(batch=True, tenant_id="T")
+    teams._client = _Credential()
+    teams._graph = MagicMock()
+    key = "T:oneOnOne:owner,user"
+    await teams_module._chat_ids.set(key, "gone")
+    with patch.object(graph_batch, "http_session", return_value=graph):
+        with pytest.raises(MessageError) as error:
+            await teams._post_to_chat(key, "gone", "hello")
+    assert error.value.code == 404
+    assert await teams_module._chat_ids.get(key) is None
+
+
+@pytest.mark.asyncio
+async def test_text_messages_are_personalized():
+    teams = Teams(tenant_id="T")
+    message = await teams._prepare_(message="Hi {recipient.name}")
+    payload = await teams._render_(SimpleNamespace(name="Ana"), message)
+    assert payload["text"] == "Hi Ana"
@@ -0,0 +1,41 @@
+"""TeamsCard serialization memoization."""
+import json
+from notify.models import TeamsCard
+
+
+def test_card_json_is_memoized_until_changed():
+    card = TeamsCard(title="Report", summary="Daily report")
+    section = card.addSection(activityTitle="Sales", text="ok")
+    section.addFacts([{"title": "Total", "value": "10"}])
+    first = card.to_json("adaptive")
+    assert card.to_json("adaptive") is first
+    assert card.to_bytes("adaptive") == first.encode("utf-8")
+    assert json.loads(first) == card.to_adaptative()
+    card.addAction("Action.OpenUrl", "Open", url="https://example.com")
+    second = card.to_json("adaptive")
+    assert second is not first
+    assert json.loads(second)["actions"][0]["title"] == "Open"
+    card.addInput("comment", "Comment")
+    assert "Input.Text" in card.to_json("adaptive")
+
+
+def test_section_facts_and_invalidate_are_serialized():
+    card = TeamsCard(title="Report", summary="Daily report")
+    section = card.addSection(activityTitle="Sales")
+    first = card.to_json("adaptive")
+    section.addFacts([{"title": "Total", "value": "10"}])
+    assert "Total" in card.to_json("adaptive")
+    # in-place changes need an explicit invalidate():
+    card.title = "Weekly"
+    card.invalidate()
+    assert json.loads(card.to_json("adaptive"))["body"][0]["text"] == "Weekly"
+    assert card.to_json("adaptive") is not first
+
+
+def test_message_card_json_excludes_the_cache():
+    card = TeamsCard(summary="Daily report")
+    card.to_json("adaptive")
+    data = json.loads(card.to_bytes("message"))
+    assert data["@type"] == "MessageCard"
+    assert not any("serialized" in key for key in data)
+    assert not any("serialized" in key for key in card.to_dict())
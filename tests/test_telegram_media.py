@@ -0,0 +1,61 @@
+"""Telegram media file_id cache (:mod:`notify.providers.telegram.media`)."""
+import asyncio
+from io import BytesIO
+from types import SimpleNamespace
+import pytest
+from notify.providers.telegram import Telegram
+from notify.providers.telegram import media as media_cache
+
+
+class _Bot:
+    def __init__(self):
+        self.sent = []
+
+    async def send_photo(self, chat_id, photo=None, **kwargs):
+        self.sent.append(photo)
+        await asyncio.sleep(0.01)
+        file_id = photo if isinstance(photo, str) else "file-1"
+        return SimpleNamespace(photo=[SimpleNamespace(file_id="thumb"), SimpleNamespace(file_id=file_id)])
+
+
+@pytest.mark.asyncio
+async def test_content_digest_of_paths_and_buffers(tmp_path):
+    image = tmp_path.joinpath("report.png")
+    image.write_bytes(b"png-data")
+    assert await media_cache.content_digest(image) == await media_cache.content_digest(BytesIO(b"png-data"))
+    assert await media_cache.content_digest(tmp_path.joinpath("missing.png")) is None
+    # the content behind a URL is unknown:
+    assert await media_cache.content_digest("https://example.com/report.png") is None
+
+
+@pytest.mark.asyncio
+async def test_media_is_uploaded_once(tmp_path):
+    image = tmp_path.joinpath("report.png")
+    image.write_bytes(b"report-image")
+    tg = Telegram(bot_token="123:abc")
+    tg._bot = _Bot()
+    results = await asyncio.gather(*[
+        tg._send_media_("photo", chat, image, tg.prepare_photo) for chat in range(10)
+    ])
+    uploads = [m for m in tg._bot.sent if not isinstance(m, str)]
+    assert len(uploads) == 1
+    assert tg._bot.sent.count("file-1") == 9
+    assert all(media_cache.file_id_of(r, "photo") == "file-1" for r in results)
+
+
+@pytest.mark.asyncio
+async def test_slow_cache_lookups_share_one_upload(tmp_path, monkeypatch):
+    # with Redis the lookup awaits: senders must still share the upload.
+    async def slow_get(key):
+        await asyncio.sleep(0.01)
+        return None
+    monkeypatch.setattr(media_cache._file_ids, "get", slow_get)
+    image = tmp_path.joinpath("chart.png")
+    image.write_bytes(b"chart-image")
+    tg = Telegram(bot_token="123:abc")
+    tg._bot = _Bot()
+    await asyncio.wait_for(asyncio.gather(*[
+        tg._send_media_("photo", chat, image, tg.prepare_photo) for chat in range(100, 110)
+    ]), timeout=1)
+    assert len([m for m in tg._bot.sent if not isinstance(m, str)]) == 1
+    assert not media_cache._uploads
@@ -0,0 +1,56 @@
+"""Telegram rate pacing (:mod:`notify.providers.telegram.pacing`)."""
+import asyncio
+import sys
+from types import SimpleNamespace
+import pytest
+from notify.providers.telegram.pacing import TelegramPacer, is_group
+
+
+def test_group_chats_are_detected():
+    assert is_group(-1001234) and is_group("@channel")
+    assert not is_group(123456)
+
+
+async def _send_times(pacer, chats):
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    times = {}
+
+    async def send(chat):
+        await pacer.acquire(chat)
+        times.setdefault(chat, []).append(loop.time() - start)
+    await asyncio.gather(*[send(chat) for chat in chats])
+    return times
+
+
+@pytest.mark.asyncio
+async def test_messages_to_a_chat_are_spaced_but_chats_are_not():
+    pacer = TelegramPacer(rate=1000, chat_rate=20, group_rate=600)
+    times = await _send_times(pacer, [1, 1, 1, 2, 3, -4, -4])
+    assert times[1][2] >= 0.09
+    assert times[2][0] < 0.05 and times[3][0] < 0.05
+    assert times[-4][1] >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_retry_after_holds_the_chat():
+    pacer = TelegramPacer(rate=1000, chat_rate=1000, group_rate=60000)
+    pacer.retry_after(1, 0.1)
+    times = await _send_times(pacer, [1, 2])
+    assert times[1][0] >= 0.09
+    assert times[2][0] < 0.05
+
+
+@pytest.mark.asyncio
+async def test_sticker_flood_control_is_raised_after_retries(monkeypatch):
+    from aiogram.exceptions import TelegramRetryAfter
+    from notify.exceptions import NotifyException
+    from notify.providers.telegram import Telegram
+    monkeypatch.setattr(sys.modules[Telegram.__module__], "TELEGRAM_MAX_RETRIES", 1)
+
+    async def send_sticker(chat_id, **kwargs):
+        raise TelegramRetryAfter(method=None, message="flood", retry_after=0.01)
+    tg = Telegram(bot_token="123:flood")
+    tg._bot = SimpleNamespace(send_sticker=send_sticker)
+    with pytest.raises(NotifyException):
+        await tg.send_sticker("CAACAgEAAx")
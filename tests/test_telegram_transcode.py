@@ -0,0 +1,57 @@
+"""webm -> mp4 conversion (:mod:`notify.providers.telegram.transcode`)."""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+import pytest
+from notify.providers.telegram import transcode
+from notify.providers.telegram.transcode import Transcoder
+
+
+def _fake_transcode(calls):
+    def convert(source, output, codec):
+        calls.append(source)
+        time.sleep(0.05)
+        with open(output, "wb") as fp:
+            fp.write(b"mp4")
+        return output
+    return convert
+
+
+@pytest.mark.asyncio
+async def test_conversions_are_cached_and_shared(tmp_path):
+    video = tmp_path.joinpath("clip.webm")
+    video.write_bytes(b"webm-1")
+    calls = []
+    transcoder = Transcoder(tmp_path.joinpath("out"), queue_size=1)
+    transcoder._pool = ThreadPoolExecutor(max_workers=2)
+    with patch.object(transcode, "_transcode", _fake_transcode(calls)):
+        outputs = await asyncio.gather(*[transcoder.to_mp4(video) for _ in range(5)])
+        assert len(calls) == 1 and len(set(outputs)) == 1
+        assert outputs[0].read_bytes() == b"mp4"
+        await transcoder.to_mp4(video)
+        assert len(calls) == 1
+        # a changed source is converted again
+        video.write_bytes(b"webm-2")
+        os.utime(video, ns=(time.time_ns(), time.time_ns() + 10**9))
+        assert await transcoder.to_mp4(video) != outputs[0]
+        assert len(calls) == 2
+    transcoder.close()
+
+
+@pytest.mark.asyncio
+async def test_unused_outputs_are_evicted(tmp_path):
+    out = tmp_path.joinpath("out")
+    out.mkdir()
+    stale = out.joinpath("stale.mp4")
+    stale.write_bytes(b"mp4")
+    os.utime(stale, (time.time() - 3600, time.time() - 3600))
+    video = tmp_path.joinpath("clip.webm")
+    video.write_bytes(b"webm")
+    transcoder = Transcoder(out, max_age=60)
+    transcoder._pool = ThreadPoolExecutor(max_workers=1)
+    with patch.object(transcode, "_transcode", _fake_transcode([])):
+        output = await transcoder.to_mp4(video)
+    assert output.exists() and not stale.exists()
+    transcoder.close()
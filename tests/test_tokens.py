@@ -0,0 +1,69 @@
+"""OAuth token cache (:mod:`notify.providers.tokens`)."""
+import asyncio
+import time
+import pytest
+from notify.providers.cache import TTLCache
+from notify.providers.tokens import TokenCache, token_key
+
+
+def make_fetch(expires_in: int = 3600, delay: float = 0.01):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return {"access_token": f"token-{len(calls)}", "expires_in": expires_in}
+    return fetch, calls
+
+
+def test_token_key_ignores_scope_order():
+    assert token_key("msgraph", "t", "c", ["b", "a"]) == token_key("msgraph", "t", "c", ["a", "b"])
+    assert token_key("msgraph", "t", "c", "a", subject="u") != token_key("msgraph", "t", "c", "a")
+
+
+def test_ttl_cache_expires_and_evicts():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "b" not in cache and cache.get("a") == 1
+    cache.set("d", 4, ttl=-1)
+    assert cache.get("d") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_gets_request_one_token():
+    cache = TokenCache(margin=60)
+    fetch, calls = make_fetch()
+    tokens = await asyncio.gather(*[cache.get("k", fetch) for _ in range(20)])
+    assert len(calls) == 1
+    assert {t["access_token"] for t in tokens} == {"token-1"}
+    assert (await cache.get("k", fetch))["access_token"] == "token-1"
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_token_is_refreshed_before_expiry():
+    cache = TokenCache(margin=60)
+    fetch, calls = make_fetch(expires_in=30)
+    first = await cache.get("k", fetch)
+    # within the margin: the current token is served, a refresh starts.
+    assert (await cache.get("k", fetch)) is first
+    await asyncio.sleep(0.05)
+    assert len(calls) == 2
+    assert cache.peek("k")["access_token"] == "token-2"
+    assert cache.peek("k")["expires_at"] <= time.time() + 30
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached_and_invalidate():
+    cache = TokenCache(margin=60)
+
+    async def failing():
+        return {"error": "invalid_client"}
+    assert (await cache.get("k", failing)) == {"error": "invalid_client"}
+    fetch, calls = make_fetch()
+    await cache.get("k", fetch)
+    await cache.invalidate("k")
+    assert (await cache.get("k", fetch))["access_token"] == "token-2"
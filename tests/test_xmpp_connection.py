@@ -0,0 +1,137 @@
+"""Persistent XMPP stream (:mod:`notify.providers.xmpp.connection`)."""
+import asyncio
+import itertools
+from types import SimpleNamespace
+import pytest
+from notify.exceptions import NotifyAuthError, NotifyTimeout
+from notify.providers.xmpp.connection import XmppConnection
+
+
+class _Message(dict):
+    def __init__(self, client, **kwargs):
+        super().__init__(**kwargs)
+        self.client = client
+
+    def send(self):
+        self.client.sent.append(self)
+
+
+class _Client:
+    """slixmpp stand-in: acks with xep_0198 when ``sm`` is set."""
+
+    def __init__(self, sm: bool = True, auth: bool = True):
+        self.sm = sm
+        self.auth = auth
+        self.boundjid = SimpleNamespace(bare="bot@example.com")
+        self.handlers = {}
+        self.sent = []
+        self.connects = 0
+        self._ids = itertools.count()
+
+    def add_event_handler(self, name, handler):
+        self.handlers[name] = handler
+
+    def event(self, name, data=None):
+        self.handlers[name](data)
+
+    def connect(self):
+        self.connects += 1
+        loop = asyncio.get_running_loop()
+        if not self.auth:
+            loop.call_soon(self.event, "failed_auth")
+            return
+        if self.sm:
+            loop.call_soon(self.event, "sm_enabled")
+        loop.call_soon(self.event, "session_start")
+
+    def disconnect(self, wait=2.0):
+        pass
+
+    def new_id(self):
+        return f"m{next(self._ids)}"
+
+    def make_message(self, mto, mbody, mtype):
+        return _Message(self, to=mto, body=mbody, type=mtype)
+
+    def ack_all(self):
+        for msg in self.sent:
+            self.event("stanza_acked", msg)
+
+
+@pytest.mark.asyncio
+async def test_send_completes_on_ack():
+    client = _Client()
+    conn = XmppConnection(client, queue_size=4, ack_timeout=1)
+    await conn.start(timeout=1)
+    task = asyncio.ensure_future(conn.send("alice@example.com", "hi"))
+    await asyncio.sleep(0.01)
+    assert not task.done() and len(client.sent) == 1
+    client.ack_all()
+    await task
+    await conn.close()
+
+
+@pytest.mark.asyncio
+async def test_unacked_messages_are_resent_on_a_new_session(monkeypatch):
+    client = _Client()
+    conn = XmppConnection(client, queue_size=4, ack_timeout=1)
+    monkeypatch.setattr(conn, "backoff", lambda: 0.01)
+    await conn.start(timeout=1)
+    task = asyncio.ensure_future(conn.send("alice@example.com", "hi"))
+    await asyncio.sleep(0.01)
+    client.sent.clear()
+    client.event("disconnected")
+    await asyncio.sleep(0.05)
+    assert client.connects == 2 and len(client.sent) == 1
+    client.ack_all()
+    await task
+    await conn.close()
+
+
+@pytest.mark.asyncio
+async def test_unacked_send_times_out_and_frees_its_slot():
+    client = _Client()
+    conn = XmppConnection(client, queue_size=1, ack_timeout=0.05)
+    await conn.start(timeout=1)
+    with pytest.raises(NotifyTimeout):
+        await conn.send("alice@example.com", "hi")
+    task = asyncio.ensure_future(conn.send("alice@example.com", "again"))
+    await asyncio.sleep(0.01)
+    assert len(client.sent) == 2
+    client.ack_all()
+    await task
+    await conn.close()
+
+
+@pytest.mark.asyncio
+async def test_without_stream_management_send_completes_when_written():
+    client = _Client(sm=False)
+    conn = XmppConnection(client, queue_size=2, ack_timeout=0.05)
+    await conn.start(timeout=1)
+    await asyncio.gather(*[conn.send("alice@example.com", str(i)) for i in range(5)])
+    assert len(client.sent) == 5
+    await conn.close()
+
+
+@pytest.mark.asyncio
+async def test_queued_and_unacked_messages_share_the_queue_size():
+    client = _Client()
+    conn = XmppConnection(client, queue_size=2, ack_timeout=1)
+    await conn.start(timeout=1)
+    tasks = [asyncio.ensure_future(conn.send("alice@example.com", str(i))) for i in range(4)]
+    await asyncio.sleep(0.01)
+    assert len(client.sent) == 2 and conn._queue.qsize() == 0
+    client.ack_all()
+    await asyncio.sleep(0.01)
+    assert len(client.sent) == 4
+    client.ack_all()
+    await asyncio.gather(*tasks)
+    await conn.close()
+
+
+@pytest.mark.asyncio
+async def test_rejected_login_closes_the_connection():
+    conn = XmppConnection(_Client(auth=False), queue_size=2, ack_timeout=1)
+    with pytest.raises(NotifyAuthError):
+        await conn.start(timeout=1)
+    assert conn.closed